@@ -0,0 +1,32 @@
+"""Add history pagination indexes to url_analyses
+
+Revision ID: 9a4c2d7e1f06
+Revises: 3d8f6a2e9b41
+Create Date: 2026-10-17 13:47:52.226193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c2d7e1f06'
+down_revision = '3d8f6a2e9b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_url_analyses_user_id_analyzed_at_id', 'url_analyses',
+        ['user_id', sa.text('analyzed_at DESC'), 'id'], unique=False
+    )
+    op.create_index(
+        'ix_url_analyses_analyzed_at_id', 'url_analyses',
+        [sa.text('analyzed_at DESC'), 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_url_analyses_analyzed_at_id', table_name='url_analyses')
+    op.drop_index('ix_url_analyses_user_id_analyzed_at_id', table_name='url_analyses')
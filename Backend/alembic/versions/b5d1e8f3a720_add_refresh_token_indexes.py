@@ -0,0 +1,29 @@
+"""Add revocation and expiry indexes to refresh_tokens
+
+Revision ID: b5d1e8f3a720
+Revises: 9a4c2d7e1f06
+Create Date: 2026-10-17 15:12:08.514273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d1e8f3a720'
+down_revision = '9a4c2d7e1f06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_refresh_tokens_user_id_is_revoked', 'refresh_tokens',
+        ['user_id', 'is_revoked'], unique=False
+    )
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_expires_at', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_user_id_is_revoked', table_name='refresh_tokens')
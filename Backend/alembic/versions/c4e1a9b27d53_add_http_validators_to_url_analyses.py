@@ -0,0 +1,28 @@
+"""Add HTTP validators to url_analyses
+
+Revision ID: c4e1a9b27d53
+Revises: 6f17bf3dda45
+Create Date: 2026-10-16 09:12:44.305117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1a9b27d53'
+down_revision = '6f17bf3dda45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('url_analyses', sa.Column('etag', sa.String(length=255), nullable=True))
+    op.add_column('url_analyses', sa.Column('last_modified', sa.String(length=64), nullable=True))
+    op.create_index('ix_url_analyses_url', 'url_analyses', ['url'], unique=False, postgresql_using='hash')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_url_analyses_url', table_name='url_analyses')
+    op.drop_column('url_analyses', 'last_modified')
+    op.drop_column('url_analyses', 'etag')
@@ -0,0 +1,77 @@
+"""Add analysis_words table and backfill it from url_analyses.top_words
+
+Revision ID: c8a3e5f1d294
+Revises: b5d1e8f3a720
+Create Date: 2026-10-17 16:40:31.208716
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8a3e5f1d294'
+down_revision = 'b5d1e8f3a720'
+branch_labels = None
+depends_on = None
+
+# Analyses converted per committed batch
+BACKFILL_BATCH_SIZE = 1000
+
+url_analyses = sa.table(
+    'url_analyses',
+    sa.column('id', sa.Integer),
+    sa.column('top_words', sa.JSON),
+)
+analysis_words = sa.table(
+    'analysis_words',
+    sa.column('analysis_id', sa.Integer),
+    sa.column('word', sa.Text),
+    sa.column('count', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    # The table may exist already when a previous run was interrupted during the backfill
+    if context.is_offline_mode() or not sa.inspect(op.get_bind()).has_table('analysis_words'):
+        op.create_table('analysis_words',
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('word', sa.Text(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['analysis_id'], ['url_analyses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('analysis_id', 'word')
+        )
+        op.create_index('ix_analysis_words_word', 'analysis_words', ['word'], unique=False)
+
+    if context.is_offline_mode():
+        # Rows can't be read when only generating SQL; run the upgrade online to backfill
+        return
+
+    # Each batch commits on its own, and analyses that already have words
+    # are skipped, so an interrupted backfill resumes where it stopped
+    with context.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = 0
+        while True:
+            has_words = sa.exists().where(analysis_words.c.analysis_id == url_analyses.c.id)
+            rows = bind.execute(
+                sa.select(url_analyses.c.id, url_analyses.c.top_words)
+                .where(url_analyses.c.id > last_id, ~has_words)
+                .order_by(url_analyses.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            values = [
+                {'analysis_id': analysis_id, 'word': item['word'], 'count': item['count']}
+                for analysis_id, top_words in rows
+                for item in top_words or []
+            ]
+            if values:
+                bind.execute(analysis_words.insert(), values)
+            last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analysis_words_word', table_name='analysis_words')
+    op.drop_table('analysis_words')
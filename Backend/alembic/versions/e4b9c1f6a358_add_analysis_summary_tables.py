@@ -0,0 +1,54 @@
+"""Add per-user and per-day analysis summary tables
+
+Revision ID: e4b9c1f6a358
+Revises: c8a3e5f1d294
+Create Date: 2026-10-17 19:22:17.046385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c1f6a358'
+down_revision = 'c8a3e5f1d294'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('user_analysis_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('analysis_count', sa.Integer(), nullable=False),
+    sa.Column('last_analyzed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('daily_analysis_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('analysis_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_index('ix_daily_analysis_stats_day', 'daily_analysis_stats', ['day'], unique=False)
+
+    # Backfill from the existing analyses; days are UTC like the application's
+    if op.get_context().dialect.name == 'postgresql':
+        day = "CAST(analyzed_at AT TIME ZONE 'UTC' AS DATE)"
+    else:
+        day = "DATE(analyzed_at)"
+    op.execute(
+        "INSERT INTO user_analysis_stats (user_id, analysis_count, last_analyzed_at) "
+        "SELECT user_id, COUNT(*), MAX(analyzed_at) FROM url_analyses GROUP BY user_id"
+    )
+    op.execute(
+        "INSERT INTO daily_analysis_stats (user_id, day, analysis_count) "
+        f"SELECT user_id, {day}, COUNT(*) FROM url_analyses GROUP BY user_id, {day}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_analysis_stats_day', table_name='daily_analysis_stats')
+    op.drop_table('daily_analysis_stats')
+    op.drop_table('user_analysis_stats')
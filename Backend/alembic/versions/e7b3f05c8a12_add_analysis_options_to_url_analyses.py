@@ -0,0 +1,26 @@
+"""Add analysis options and n-grams to url_analyses
+
+Revision ID: e7b3f05c8a12
+Revises: c4e1a9b27d53
+Create Date: 2026-10-17 10:03:21.518630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3f05c8a12'
+down_revision = 'c4e1a9b27d53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('url_analyses', sa.Column('top_ngrams', sa.JSON(), nullable=True))
+    op.add_column('url_analyses', sa.Column('analysis_options', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('url_analyses', 'analysis_options')
+    op.drop_column('url_analyses', 'top_ngrams')
@@ -25,6 +25,11 @@ class Settings:
     
     # Database Settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() in ("true", "1", "yes")
     
     # API Settings
     API_VERSION: str = os.getenv("API_VERSION", "v1")
@@ -32,6 +37,11 @@ class Settings:
     
     # Security Settings
     BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # concurrent bcrypt computations
+    LOGIN_RATE_LIMIT: int = int(os.getenv("LOGIN_RATE_LIMIT", "10"))  # attempts per client IP, 0 disables
+    LOGIN_RATE_LIMIT_WINDOW: int = int(os.getenv("LOGIN_RATE_LIMIT_WINDOW", "60"))  # seconds
+    REFRESH_TOKEN_PURGE_INTERVAL: int = int(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL", "3600"))  # seconds, 0 disables
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "1000"))
     
     # Server Settings
     SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
@@ -45,6 +55,55 @@ class Settings:
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "8192"))  # 8KB default for streaming content
     USER_AGENT: str = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
     
+    # HTTP Client Pool Settings
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+    
+    # Analysis Pipeline Settings
+    ANALYSIS_PIPELINE: str = os.getenv("ANALYSIS_PIPELINE", "buffered").lower()  # "buffered" or "streaming"
+    HTML_EXTRACTOR: str = os.getenv("HTML_EXTRACTOR", "auto").lower()  # "auto", "selectolax", "lxml" or "html.parser"
+    
+    # Analysis Worker Pool Settings
+    ANALYSIS_EXECUTION_MODE: str = os.getenv("ANALYSIS_EXECUTION_MODE", "process").lower()  # "process" or "inline"
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
+    ANALYSIS_MAX_PENDING: int = int(os.getenv("ANALYSIS_MAX_PENDING", "64"))
+    
+    # Analysis Result Cache Settings
+    ANALYSIS_CACHE_BACKEND: str = os.getenv("ANALYSIS_CACHE_BACKEND", "memory").lower()  # "memory", "redis" or "none"
+    ANALYSIS_CACHE_TTL: int = int(os.getenv("ANALYSIS_CACHE_TTL", "300"))
+    ANALYSIS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024"))
+    ANALYSIS_CACHE_REDIS_URL: str = os.getenv("ANALYSIS_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    
+    # Per-request Analysis Option Limits
+    ANALYSIS_MAX_TOP_N: int = int(os.getenv("ANALYSIS_MAX_TOP_N", "100"))
+    ANALYSIS_MAX_NGRAM_SIZE: int = int(os.getenv("ANALYSIS_MAX_NGRAM_SIZE", "3"))
+    
+    # Batch Analysis Settings
+    BATCH_MAX_URLS: int = int(os.getenv("BATCH_MAX_URLS", "100"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "20"))
+    
+    # Background Analysis Job Settings
+    ANALYSIS_JOB_WORKERS: int = int(os.getenv("ANALYSIS_JOB_WORKERS", "4"))
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "3"))
+    ANALYSIS_JOB_RETRY_BACKOFF: float = float(os.getenv("ANALYSIS_JOB_RETRY_BACKOFF", "2"))  # seconds, doubled per retry
+    ANALYSIS_JOB_LEASE_TIMEOUT: int = int(os.getenv("ANALYSIS_JOB_LEASE_TIMEOUT", "300"))  # seconds a running job is held by its worker; attempts are aborted before it expires
+    
+    # Progress Streaming Settings
+    ANALYSIS_STREAM_SNAPSHOT_TOKENS: int = int(os.getenv("ANALYSIS_STREAM_SNAPSHOT_TOKENS", "5000"))
+    
+    # History Search Settings
+    SEARCH_MAX_TERMS: int = int(os.getenv("SEARCH_MAX_TERMS", "10"))
+    
+    # History Export Settings
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    
+    # Authentication Cache Settings
+    AUTH_PRINCIPAL_CACHE_TTL: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "60"))  # 0 loads the user on every request
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    ACCESS_TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("ACCESS_TOKEN_CACHE_MAX_ENTRIES", "10000"))  # 0 disables
+    
     def __init__(self):
         """Initialize and validate environment variables."""
         self.validate_required_settings()
@@ -71,6 +130,118 @@ class Settings:
             raise EnvironmentError(
                 "REFRESH_TOKEN_EXPIRE_DAYS must be a positive integer."
             )
+        
+        if self.PASSWORD_HASH_WORKERS <= 0:
+            raise EnvironmentError(
+                "PASSWORD_HASH_WORKERS must be a positive integer."
+            )
+        
+        if self.LOGIN_RATE_LIMIT < 0 or self.LOGIN_RATE_LIMIT_WINDOW <= 0:
+            raise EnvironmentError(
+                "LOGIN_RATE_LIMIT must not be negative and LOGIN_RATE_LIMIT_WINDOW must be a positive integer."
+            )
+        
+        if self.REFRESH_TOKEN_PURGE_INTERVAL < 0 or self.REFRESH_TOKEN_PURGE_BATCH_SIZE <= 0:
+            raise EnvironmentError(
+                "REFRESH_TOKEN_PURGE_INTERVAL must not be negative and REFRESH_TOKEN_PURGE_BATCH_SIZE must be a positive integer."
+            )
+        
+        if self.DB_POOL_SIZE <= 0 or self.DB_MAX_OVERFLOW < 0:
+            raise EnvironmentError(
+                "DB_POOL_SIZE must be a positive integer and DB_MAX_OVERFLOW must not be negative."
+            )
+        
+        if self.HTTP_MAX_CONNECTIONS_PER_HOST <= 0:
+            raise EnvironmentError(
+                "HTTP_MAX_CONNECTIONS_PER_HOST must be a positive integer."
+            )
+        
+        if self.ANALYSIS_PIPELINE not in ("buffered", "streaming"):
+            raise EnvironmentError(
+                "ANALYSIS_PIPELINE must be either 'buffered' or 'streaming'."
+            )
+        
+        if self.HTML_EXTRACTOR not in ("auto", "selectolax", "lxml", "html.parser"):
+            raise EnvironmentError(
+                "HTML_EXTRACTOR must be one of 'auto', 'selectolax', 'lxml' or 'html.parser'."
+            )
+        
+        if self.ANALYSIS_EXECUTION_MODE not in ("process", "inline"):
+            raise EnvironmentError(
+                "ANALYSIS_EXECUTION_MODE must be either 'process' or 'inline'."
+            )
+        
+        if self.ANALYSIS_WORKERS <= 0 or self.ANALYSIS_MAX_PENDING <= 0:
+            raise EnvironmentError(
+                "ANALYSIS_WORKERS and ANALYSIS_MAX_PENDING must be positive integers."
+            )
+        
+        if self.ANALYSIS_CACHE_BACKEND not in ("memory", "redis", "none"):
+            raise EnvironmentError(
+                "ANALYSIS_CACHE_BACKEND must be one of 'memory', 'redis' or 'none'."
+            )
+        
+        if self.ANALYSIS_CACHE_TTL <= 0 or self.ANALYSIS_CACHE_MAX_ENTRIES <= 0:
+            raise EnvironmentError(
+                "ANALYSIS_CACHE_TTL and ANALYSIS_CACHE_MAX_ENTRIES must be positive integers."
+            )
+        
+        if self.ANALYSIS_MAX_TOP_N <= 0 or self.ANALYSIS_MAX_NGRAM_SIZE <= 0:
+            raise EnvironmentError(
+                "ANALYSIS_MAX_TOP_N and ANALYSIS_MAX_NGRAM_SIZE must be positive integers."
+            )
+        
+        if self.BATCH_MAX_URLS <= 0 or self.BATCH_MAX_CONCURRENCY <= 0:
+            raise EnvironmentError(
+                "BATCH_MAX_URLS and BATCH_MAX_CONCURRENCY must be positive integers."
+            )
+        
+        if self.ANALYSIS_JOB_WORKERS <= 0 or self.ANALYSIS_JOB_MAX_ATTEMPTS <= 0:
+            raise EnvironmentError(
+                "ANALYSIS_JOB_WORKERS and ANALYSIS_JOB_MAX_ATTEMPTS must be positive integers."
+            )
+        
+        if self.ANALYSIS_JOB_RETRY_BACKOFF < 0:
+            raise EnvironmentError(
+                "ANALYSIS_JOB_RETRY_BACKOFF must not be negative."
+            )
+        
+        if self.ANALYSIS_JOB_LEASE_TIMEOUT <= self.REQUEST_TIMEOUT:
+            raise EnvironmentError(
+                "ANALYSIS_JOB_LEASE_TIMEOUT must be longer than REQUEST_TIMEOUT: job attempts are "
+                "aborted before their lease expires, so a shorter lease would cut off fetches still "
+                "within REQUEST_TIMEOUT."
+            )
+        
+        if self.ANALYSIS_STREAM_SNAPSHOT_TOKENS <= 0:
+            raise EnvironmentError(
+                "ANALYSIS_STREAM_SNAPSHOT_TOKENS must be a positive integer."
+            )
+        
+        if self.SEARCH_MAX_TERMS <= 0:
+            raise EnvironmentError(
+                "SEARCH_MAX_TERMS must be a positive integer."
+            )
+        
+        if self.EXPORT_BATCH_SIZE <= 0:
+            raise EnvironmentError(
+                "EXPORT_BATCH_SIZE must be a positive integer."
+            )
+        
+        if self.AUTH_PRINCIPAL_CACHE_TTL < 0:
+            raise EnvironmentError(
+                "AUTH_PRINCIPAL_CACHE_TTL must not be negative."
+            )
+        
+        if self.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES <= 0:
+            raise EnvironmentError(
+                "AUTH_PRINCIPAL_CACHE_MAX_ENTRIES must be a positive integer."
+            )
+        
+        if self.ACCESS_TOKEN_CACHE_MAX_ENTRIES < 0:
+            raise EnvironmentError(
+                "ACCESS_TOKEN_CACHE_MAX_ENTRIES must not be negative."
+            )
 
 # Create a global settings instance
 settings = Settings()
@@ -81,8 +252,18 @@ ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 DATABASE_URL = settings.DATABASE_URL
+DB_POOL_SIZE = settings.DB_POOL_SIZE
+DB_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW
+DB_POOL_TIMEOUT = settings.DB_POOL_TIMEOUT
+DB_POOL_RECYCLE = settings.DB_POOL_RECYCLE
+DB_POOL_PRE_PING = settings.DB_POOL_PRE_PING
 DEBUG = settings.DEBUG
 BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+PASSWORD_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS
+LOGIN_RATE_LIMIT = settings.LOGIN_RATE_LIMIT
+LOGIN_RATE_LIMIT_WINDOW = settings.LOGIN_RATE_LIMIT_WINDOW
+REFRESH_TOKEN_PURGE_INTERVAL = settings.REFRESH_TOKEN_PURGE_INTERVAL
+REFRESH_TOKEN_PURGE_BATCH_SIZE = settings.REFRESH_TOKEN_PURGE_BATCH_SIZE
 SERVER_HOST = settings.SERVER_HOST
 SERVER_PORT = settings.SERVER_PORT
 SERVER_RELOAD = settings.SERVER_RELOAD
@@ -91,6 +272,33 @@ REQUEST_TIMEOUT = settings.REQUEST_TIMEOUT
 MAX_CONTENT_SIZE = settings.MAX_CONTENT_SIZE
 CHUNK_SIZE = settings.CHUNK_SIZE
 USER_AGENT = settings.USER_AGENT
+HTTP_MAX_CONNECTIONS = settings.HTTP_MAX_CONNECTIONS
+HTTP_MAX_KEEPALIVE_CONNECTIONS = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+HTTP_KEEPALIVE_EXPIRY = settings.HTTP_KEEPALIVE_EXPIRY
+HTTP_MAX_CONNECTIONS_PER_HOST = settings.HTTP_MAX_CONNECTIONS_PER_HOST
+ANALYSIS_PIPELINE = settings.ANALYSIS_PIPELINE
+HTML_EXTRACTOR = settings.HTML_EXTRACTOR
+ANALYSIS_EXECUTION_MODE = settings.ANALYSIS_EXECUTION_MODE
+ANALYSIS_WORKERS = settings.ANALYSIS_WORKERS
+ANALYSIS_MAX_PENDING = settings.ANALYSIS_MAX_PENDING
+ANALYSIS_CACHE_BACKEND = settings.ANALYSIS_CACHE_BACKEND
+ANALYSIS_CACHE_TTL = settings.ANALYSIS_CACHE_TTL
+ANALYSIS_CACHE_MAX_ENTRIES = settings.ANALYSIS_CACHE_MAX_ENTRIES
+ANALYSIS_CACHE_REDIS_URL = settings.ANALYSIS_CACHE_REDIS_URL
+ANALYSIS_MAX_TOP_N = settings.ANALYSIS_MAX_TOP_N
+ANALYSIS_MAX_NGRAM_SIZE = settings.ANALYSIS_MAX_NGRAM_SIZE
+BATCH_MAX_URLS = settings.BATCH_MAX_URLS
+BATCH_MAX_CONCURRENCY = settings.BATCH_MAX_CONCURRENCY
+ANALYSIS_JOB_WORKERS = settings.ANALYSIS_JOB_WORKERS
+ANALYSIS_JOB_MAX_ATTEMPTS = settings.ANALYSIS_JOB_MAX_ATTEMPTS
+ANALYSIS_JOB_RETRY_BACKOFF = settings.ANALYSIS_JOB_RETRY_BACKOFF
+ANALYSIS_JOB_LEASE_TIMEOUT = settings.ANALYSIS_JOB_LEASE_TIMEOUT
+ANALYSIS_STREAM_SNAPSHOT_TOKENS = settings.ANALYSIS_STREAM_SNAPSHOT_TOKENS
+SEARCH_MAX_TERMS = settings.SEARCH_MAX_TERMS
+EXPORT_BATCH_SIZE = settings.EXPORT_BATCH_SIZE
+AUTH_PRINCIPAL_CACHE_TTL = settings.AUTH_PRINCIPAL_CACHE_TTL
+AUTH_PRINCIPAL_CACHE_MAX_ENTRIES = settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES
+ACCESS_TOKEN_CACHE_MAX_ENTRIES = settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES
 
 __all__ = [
     "settings",
@@ -99,8 +307,18 @@ __all__ = [
     "ACCESS_TOKEN_EXPIRE_MINUTES",
     "REFRESH_TOKEN_EXPIRE_DAYS",
     "DATABASE_URL",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
+    "DB_POOL_RECYCLE",
+    "DB_POOL_PRE_PING",
     "DEBUG",
     "BCRYPT_ROUNDS",
+    "PASSWORD_HASH_WORKERS",
+    "LOGIN_RATE_LIMIT",
+    "LOGIN_RATE_LIMIT_WINDOW",
+    "REFRESH_TOKEN_PURGE_INTERVAL",
+    "REFRESH_TOKEN_PURGE_BATCH_SIZE",
     "SERVER_HOST",
     "SERVER_PORT", 
     "SERVER_RELOAD",
@@ -109,5 +327,32 @@ __all__ = [
     "MAX_CONTENT_SIZE",
     "CHUNK_SIZE", 
     "USER_AGENT",
+    "HTTP_MAX_CONNECTIONS",
+    "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    "HTTP_KEEPALIVE_EXPIRY",
+    "HTTP_MAX_CONNECTIONS_PER_HOST",
+    "ANALYSIS_PIPELINE",
+    "HTML_EXTRACTOR",
+    "ANALYSIS_EXECUTION_MODE",
+    "ANALYSIS_WORKERS",
+    "ANALYSIS_MAX_PENDING",
+    "ANALYSIS_CACHE_BACKEND",
+    "ANALYSIS_CACHE_TTL",
+    "ANALYSIS_CACHE_MAX_ENTRIES",
+    "ANALYSIS_CACHE_REDIS_URL",
+    "ANALYSIS_MAX_TOP_N",
+    "ANALYSIS_MAX_NGRAM_SIZE",
+    "BATCH_MAX_URLS",
+    "BATCH_MAX_CONCURRENCY",
+    "ANALYSIS_JOB_WORKERS",
+    "ANALYSIS_JOB_MAX_ATTEMPTS",
+    "ANALYSIS_JOB_RETRY_BACKOFF",
+    "ANALYSIS_JOB_LEASE_TIMEOUT",
+    "ANALYSIS_STREAM_SNAPSHOT_TOKENS",
+    "SEARCH_MAX_TERMS",
+    "EXPORT_BATCH_SIZE",
+    "AUTH_PRINCIPAL_CACHE_TTL",
+    "AUTH_PRINCIPAL_CACHE_MAX_ENTRIES",
+    "ACCESS_TOKEN_CACHE_MAX_ENTRIES",
     "EnvironmentError"
 ]
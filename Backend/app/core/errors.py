@@ -3,6 +3,7 @@ Centralized error handling module.
 This module provides custom exceptions and error handlers for the application.
 """
 
+import math
 from fastapi import HTTPException, status
 from typing import Optional, Any, Dict
 
@@ -13,6 +14,10 @@ class AppError(Exception):
         self.message = message
         self.error_code = error_code
         super().__init__(self.message)
+    
+    def __reduce__(self):
+        # Keep error_code when errors cross process boundaries
+        return (self.__class__, (self.message, self.error_code))
 
 class AuthenticationError(AppError):
     """Authentication related errors."""
@@ -34,6 +39,10 @@ class ExternalServiceError(AppError):
     """External service integration errors."""
     pass
 
+class ServiceUnavailableError(AppError):
+    """Errors raised when the service is temporarily overloaded."""
+    pass
+
 # HTTP Exception factories for common errors
 def credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
     """Create HTTP exception for invalid credentials."""
@@ -78,6 +87,21 @@ def bad_request_exception(detail: str = "Bad request") -> HTTPException:
         detail=detail,
     )
 
+def service_unavailable_exception(detail: str = "Service temporarily unavailable") -> HTTPException:
+    """Create HTTP exception for temporarily overloaded services."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+    )
+
+def too_many_requests_exception(retry_after: float, detail: str = "Too many requests") -> HTTPException:
+    """Create HTTP exception for rate limited clients."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
 # Common error responses
 COMMON_RESPONSES: Dict[int, Dict[str, Any]] = {
     400: {"description": "Bad Request"},
@@ -85,7 +109,9 @@ COMMON_RESPONSES: Dict[int, Dict[str, Any]] = {
     403: {"description": "Forbidden"},
     404: {"description": "Not Found"},
     422: {"description": "Validation Error"},
+    429: {"description": "Too Many Requests"},
     500: {"description": "Internal Server Error"},
+    503: {"description": "Service Unavailable"},
 }
 
 __all__ = [
@@ -95,11 +121,14 @@ __all__ = [
     "ValidationError",
     "DatabaseError",
     "ExternalServiceError",
+    "ServiceUnavailableError",
     "credentials_exception",
     "forbidden_exception",
     "not_found_exception",
     "validation_exception",
     "internal_server_exception",
     "bad_request_exception",
+    "service_unavailable_exception",
+    "too_many_requests_exception",
     "COMMON_RESPONSES"
 ]
@@ -0,0 +1,28 @@
+"""
+Keyset pagination helpers.
+A cursor is an opaque, URL-safe token holding the sort key of the last row
+of a page; the next page starts strictly after it, so deep pages cost the
+same as the first one.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from app.core.errors import ValidationError
+
+def encode_cursor(sorted_at: datetime, row_id: int) -> str:
+    """Build the cursor pointing just past the row with this ``(timestamp, id)`` key."""
+    payload = json.dumps({"t": sorted_at.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the ``(timestamp, id)`` key stored in a cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
+
+__all__ = ["encode_cursor", "decode_cursor"]
@@ -0,0 +1,53 @@
+"""
+In-process rate limiting.
+This module provides a thread-safe sliding-window limiter keyed on an
+arbitrary client identifier, bounded in the number of tracked clients.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Hashable
+
+class SlidingWindowRateLimiter:
+    """Allow at most ``max_attempts`` attempts per key within ``window`` seconds."""
+
+    def __init__(self, max_attempts: int, window: float, max_keys: int = 10000):
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer")
+        self.max_attempts = max_attempts
+        self.window = window
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[Hashable, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def hit(self, key: Hashable) -> float:
+        """Record an attempt for ``key``.
+
+        Returns 0 if it is allowed, otherwise the seconds until the oldest
+        attempt in the window expires; rejected attempts are not recorded.
+        """
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque()
+            self._attempts.move_to_end(key)
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            if len(attempts) >= self.max_attempts:
+                self.rejected += 1
+                return attempts[0] + self.window - now
+            attempts.append(now)
+            # Forget the least recently seen clients beyond the bound
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+            return 0.0
+
+    def reset(self, key: Hashable) -> None:
+        """Forget the attempts of ``key``."""
+        with self._lock:
+            self._attempts.pop(key, None)
+
+__all__ = ["SlidingWindowRateLimiter"]
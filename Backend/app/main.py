@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import api_router
+from app.routers.v1.urls import url_analyzer, analysis_jobs
+from app.services.auth.token_purge import RefreshTokenPurger
+
+refresh_token_purger = RefreshTokenPurger()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pre-warm the analysis worker pool before serving requests
+    url_analyzer.start()
+    # Resume queued analysis jobs in the background
+    await analysis_jobs.start()
+    # Delete revoked and expired refresh tokens periodically
+    refresh_token_purger.start()
+    yield
+    await refresh_token_purger.aclose()
+    await analysis_jobs.aclose()
+    # Release pooled outbound connections on shutdown
+    await url_analyzer.aclose()
 
 app = FastAPI(
     title="URL Content Analyzer API",
     description="API for analyzing URL content and finding top frequent words",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Boolean
+from datetime import datetime, timezone
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime, ForeignKey, Text, JSON, Boolean, Index, PrimaryKeyConstraint
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # Server defaults (created_at, ...) are read back on INSERT, since async sessions can't lazy-load them
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
@@ -14,10 +19,12 @@ class User(Base):
     
     # Relationships
     url_analyses = relationship("UrlAnalysis", back_populates="user")
+    analysis_jobs = relationship("AnalysisJob", back_populates="user")
     refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     token = Column(String(255), unique=True, index=True, nullable=False)
@@ -28,15 +35,102 @@ class RefreshToken(Base):
     
     # Relationship
     user = relationship("User", back_populates="refresh_tokens")
+    
+    __table_args__ = (
+        # Revoking a user's active tokens on every login and refresh
+        Index("ix_refresh_tokens_user_id_is_revoked", "user_id", "is_revoked"),
+        # Purging expired tokens
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
 
 class UrlAnalysis(Base):
     __tablename__ = "url_analyses"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(Text, nullable=False)
     top_words = Column(JSON, nullable=False)  # Store as JSON: [{"word": "example", "count": 5}, ...]
+    top_ngrams = Column(JSON, nullable=True)  # Same shape as top_words, only when n-grams were requested
+    analysis_options = Column(JSON, nullable=True)  # {"top_n": 5, "ngram_size": 1, "min_word_length": 3}
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    analyzed_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python so every backend stores full precision: SQLite's CURRENT_TIMESTAMP
+    # has no fractional seconds and would not compare equal to history cursors
+    analyzed_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now()
+    )
+    # HTTP cache validators of the fetched page, used for conditional re-fetches
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
     
     # Relationship
     user = relationship("User", back_populates="url_analyses")
+    
+    __table_args__ = (
+        # Hash index: equality lookups only, and no length limit on long URLs
+        Index("ix_url_analyses_url", "url", postgresql_using="hash"),
+        # Keyset pagination of history, newest first, per user and across users
+        Index("ix_url_analyses_user_id_analyzed_at_id", "user_id", analyzed_at.desc(), "id"),
+        Index("ix_url_analyses_analyzed_at_id", analyzed_at.desc(), "id"),
+    )
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(Text, nullable=False)
+    analysis_options = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    analysis_id = Column(Integer, ForeignKey("url_analyses.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    user = relationship("User", back_populates="analysis_jobs")
+    analysis = relationship("UrlAnalysis")
+    
+    __table_args__ = (
+        # Unfinished jobs are looked up on startup to resume them
+        Index("ix_analysis_jobs_status", "status"),
+    )
+
+class AnalysisWord(Base):
+    """One row per entry of ``UrlAnalysis.top_words``, for aggregate queries in SQL."""
+    __tablename__ = "analysis_words"
+
+    analysis_id = Column(Integer, ForeignKey("url_analyses.id", ondelete="CASCADE"), nullable=False)
+    word = Column(Text, nullable=False)
+    count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint("analysis_id", "word"),
+        # Inverted index for aggregating and searching by word
+        Index("ix_analysis_words_word", "word"),
+    )
+
+class UserAnalysisStats(Base):
+    """Running totals of a user's analyses, updated in the transaction storing each analysis."""
+    __tablename__ = "user_analysis_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    analysis_count = Column(Integer, nullable=False, default=0)
+    last_analyzed_at = Column(DateTime(timezone=True), nullable=True)
+
+class DailyAnalysisStats(Base):
+    """Number of analyses a user made per UTC day, maintained like ``UserAnalysisStats``."""
+    __tablename__ = "daily_analysis_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    analysis_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "day"),
+        # Totals per day across all users
+        Index("ix_daily_analysis_stats_day", "day"),
+    )
@@ -1,32 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.environment import LOGIN_RATE_LIMIT, LOGIN_RATE_LIMIT_WINDOW
+from app.core.errors import too_many_requests_exception
+from app.core.rate_limit import SlidingWindowRateLimiter
 from app.models import User
-from app.schemas import UserCreate, UserResponse, Token, RefreshTokenRequest, LoginResponse, UserLogin
+from app.schemas import UserCreate, UserResponse, Token, RefreshTokenRequest, LoginResponse, UserLogin, AuthCacheStatsResponse
 from app.services.auth.auth import (
-    get_password_hash, 
+    hash_password, 
     authenticate_user, 
     create_token_pair,
-    verify_refresh_token,
+    rotate_refresh_token,
     revoke_refresh_token,
     get_user_by_username, 
-    get_user_by_email
+    get_user_by_email,
+    verified_token_cache_stats
 )
+from app.services.auth.dependencies import get_current_user
+from app.services.auth.principals import Principal, principal_cache_stats
 
 
 router = APIRouter()
+# Login attempts per client IP; each one costs a bcrypt verification
+login_rate_limiter = SlidingWindowRateLimiter(LOGIN_RATE_LIMIT, LOGIN_RATE_LIMIT_WINDOW) if LOGIN_RATE_LIMIT else None
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
-    db_user = get_user_by_username(db, username=user.username)
+    db_user = await get_user_by_username(db, username=user.username)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -34,21 +42,25 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     
     return UserResponse.model_validate(db_user)
 
 @router.post("/login", response_model=LoginResponse)
-async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, login_data.username, login_data.password)
+async def login_user(login_data: UserLogin, request: Request, db: AsyncSession = Depends(get_db)):
+    if login_rate_limiter is not None:
+        retry_after = login_rate_limiter.hit(request.client.host if request.client else None)
+        if retry_after:
+            raise too_many_requests_exception(retry_after, "Too many login attempts, please try again later")
+    
+    user = await authenticate_user(db, login_data.username, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,7 +68,7 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token, refresh_token = create_token_pair(db, user)
+    access_token, refresh_token = await create_token_pair(db, user)
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -67,21 +79,17 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
 @router.post("/refresh", response_model=Token)
 async def refresh_access_token(
     refresh_request: RefreshTokenRequest, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = verify_refresh_token(db, refresh_request.refresh_token)
-    if not user:
+    # Verify, issue the new pair and revoke the old token in one transaction
+    rotated = await rotate_refresh_token(db, refresh_request.refresh_token)
+    if not rotated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Create new token pair
-    access_token, new_refresh_token = create_token_pair(db, user)
-    
-    # Optionally revoke the old refresh token for security
-    revoke_refresh_token(db, refresh_request.refresh_token)
+    _, access_token, new_refresh_token = rotated
     
     return {
         "access_token": access_token,
@@ -92,12 +100,17 @@ async def refresh_access_token(
 @router.post("/logout")
 async def logout_user(
     refresh_request: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    revoked = revoke_refresh_token(db, refresh_request.refresh_token)
+    revoked = await revoke_refresh_token(db, refresh_request.refresh_token)
     if not revoked:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid refresh token"
         )
     return {"message": "Successfully logged out"}
+
+@router.get("/cache/stats", response_model=AuthCacheStatsResponse)
+async def get_auth_cache_stats(current_user: Principal = Depends(get_current_user)):
+    """Get hit/miss counters of the authenticated user and access token caches."""
+    return {"principals": principal_cache_stats(), "access_tokens": verified_token_cache_stats()}
@@ -1,64 +1,265 @@
+import json
 import math
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+import re
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import desc, insert, or_, and_, func, select
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from app.core.database import get_db
-from app.models import User, UrlAnalysis
-from app.schemas import UrlAnalysisCreate, UrlAnalysisResponse, PaginatedUrlAnalysisResponse
+from app.core.environment import SEARCH_MAX_TERMS
+from app.core.errors import (
+    AppError, ServiceUnavailableError, ValidationError,
+    service_unavailable_exception, not_found_exception, bad_request_exception
+)
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models import UrlAnalysis, AnalysisJob
+from app.schemas import (
+    AnalysisOptionsBase, UrlAnalysisCreate, UrlAnalysisResponse, UrlBatchAnalysisCreate, UrlBatchAnalysisResponse,
+    BatchAnalysisItem, AnalysisJobResponse, PaginatedUrlAnalysisResponse, AnalyzerStatsResponse, UserResponse,
+    WordAggregateResponse, AnalysisStatsResponse
+)
 from app.services.auth.dependencies import get_current_user
+from app.services.auth.principals import Principal
 from app.services.url_analyzer import UrlAnalyzerService
+from app.services.analysis_cache import create_analysis_cache
+from app.services.analysis_export import EXPORT_FORMATS, accepts_gzip, export_analyses, export_query
+from app.services.analysis_jobs import AnalysisJobQueue
+from app.services.analysis_store import (
+    analysis_values, aggregate_top_words, analysis_stats, find_previous_analysis, find_previous_analyses,
+    matching_analysis_ids, record_analyses, count_analyses
+)
+from app.services.word_counter import AnalysisOptions
 
 router = APIRouter()
-url_analyzer = UrlAnalyzerService()
+url_analyzer = UrlAnalyzerService(cache=create_analysis_cache())
+analysis_jobs = AnalysisJobQueue(url_analyzer)
 
-@router.post("/analyze", response_model=UrlAnalysisResponse, status_code=status.HTTP_201_CREATED)
+def _analysis_options(data: AnalysisOptionsBase) -> AnalysisOptions:
+    return AnalysisOptions(top_n=data.top_n, ngram_size=data.ngram_size, min_word_length=data.min_word_length)
+
+def _analysis_response(analysis: UrlAnalysis, owner: Principal) -> UrlAnalysisResponse:
+    """Serialize a newly stored analysis of ``owner`` without loading its user row."""
+    return UrlAnalysisResponse(
+        id=analysis.id,
+        url=analysis.url,
+        top_words=analysis.top_words,
+        top_ngrams=analysis.top_ngrams,
+        analyzed_at=analysis.analyzed_at,
+        user=UserResponse.model_validate(owner)
+    )
+
+@router.post(
+    "/analyze",
+    response_model=Union[UrlAnalysisResponse, AnalysisJobResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": AnalysisJobResponse, "description": "Analysis job queued (mode=async)"}}
+)
 async def analyze_url(
     url_data: UrlAnalysisCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    mode: str = Query("sync", pattern="^(sync|async)$", description="async: queue the analysis and return a job"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
+    url = str(url_data.url)
+    
+    if mode == "async":
+        job = AnalysisJob(
+            url=url,
+            analysis_options=asdict(_analysis_options(url_data)),
+            status="queued",
+            attempts=0,
+            user_id=current_user.id
+        )
+        db.add(job)
+        await db.commit()
+        try:
+            analysis_jobs.submit(job.id)
+        except ServiceUnavailableError as e:
+            raise service_unavailable_exception(e.message)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return AnalysisJobResponse.model_validate(job)
+    
+    async def load_previous_analysis():
+        # Latest stored result with validators, used for conditional re-fetching
+        return await find_previous_analysis(db, url, options_dict)
+    
     try:
+        options = _analysis_options(url_data)
+        options_dict = asdict(options)
+        
         # Analyze the URL
-        top_words = url_analyzer.analyze_url(str(url_data.url))
+        result = await url_analyzer.analyze_url(url, options, load_previous=load_previous_analysis)
         
         # Save to database
-        db_analysis = UrlAnalysis(
-            url=str(url_data.url),
-            top_words=top_words,
-            user_id=current_user.id
-        )
+        db_analysis = UrlAnalysis(**analysis_values(url, current_user.id, result, options_dict))
         db.add(db_analysis)
-        db.commit()
-        db.refresh(db_analysis)
+        await db.flush()
+        await record_analyses(db, [db_analysis])
+        await db.commit()
         
-        return db_analysis
+        return _analysis_response(db_analysis, current_user)
+    except ServiceUnavailableError as e:
+        raise service_unavailable_exception(e.message)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to analyze URL: {str(e)}"
         )
 
-@router.get("/history", response_model=PaginatedUrlAnalysisResponse)
-async def get_analysis_history(
-    page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Page size"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    payload = data if isinstance(data, str) else json.dumps(data)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+@router.post(
+    "/analyze/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Progress events, then the stored analysis"}}
+)
+async def analyze_url_stream(
+    url_data: UrlAnalysisCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * size
+    """Analyze a URL, streaming progress as server-sent events.
     
-    # Get total count
-    total = db.query(UrlAnalysis).filter(UrlAnalysis.user_id == current_user.id).count()
+    Emits ``download``, ``parsed`` and ``snapshot`` events while the page is
+    processed, then ``result`` with the stored analysis, or ``error``.
+    """
+    url = str(url_data.url)
+    options = _analysis_options(url_data)
+    options_dict = asdict(options)
+    user_id = current_user.id
     
-    # Get paginated results
-    analyses = db.query(UrlAnalysis)\
-        .filter(UrlAnalysis.user_id == current_user.id)\
-        .order_by(desc(UrlAnalysis.analyzed_at))\
-        .offset(offset)\
-        .limit(size)\
-        .all()
+    async def load_previous_analysis():
+        return await find_previous_analysis(db, url, options_dict)
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in url_analyzer.analyze_url_events(url, options, load_previous_analysis):
+                if event != "result":
+                    yield _sse(event, data)
+                    continue
+                db_analysis = UrlAnalysis(**analysis_values(url, user_id, data, options_dict))
+                db.add(db_analysis)
+                await db.flush()
+                await record_analyses(db, [db_analysis])
+                await db.commit()
+                yield _sse("result", _analysis_response(db_analysis, current_user).model_dump_json())
+        except AppError as e:
+            yield _sse("error", {"detail": f"Failed to analyze URL: {e.message}"})
+        except Exception as e:
+            yield _sse("error", {"detail": f"Failed to analyze URL: {str(e)}"})
+    
+    # Disable proxy buffering so events reach the client as they are produced
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/analyze/batch", response_model=UrlBatchAnalysisResponse)
+async def analyze_urls_batch(
+    batch_data: UrlBatchAnalysisCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Analyze a list of URLs concurrently and store all results in one transaction."""
+    # Duplicates are analyzed and stored once
+    urls = list(dict.fromkeys(str(url) for url in batch_data.urls))
+    options = _analysis_options(batch_data)
+    options_dict = asdict(options)
+    
+    # Revalidation candidates for every URL in a single query
+    previous = await find_previous_analyses(db, urls, options_dict)
+    
+    results = await url_analyzer.analyze_urls(urls, options, previous)
+    
+    succeeded = [(url, result) for url, result in zip(urls, results) if not isinstance(result, Exception)]
+    items: Dict[str, BatchAnalysisItem] = {
+        url: BatchAnalysisItem(url=url, error=str(result))
+        for url, result in zip(urls, results) if isinstance(result, Exception)
+    }
+    if succeeded:
+        # One multi-row INSERT ... RETURNING instead of an add/commit/refresh per URL
+        analyses = (await db.scalars(
+            insert(UrlAnalysis).returning(UrlAnalysis, sort_by_parameter_order=True),
+            [analysis_values(url, current_user.id, result, options_dict) for url, result in succeeded]
+        )).all()
+        await record_analyses(db, analyses)
+        for analysis in analyses:
+            items[analysis.url] = BatchAnalysisItem(url=analysis.url, analysis=_analysis_response(analysis, current_user))
+        await db.commit()
+    
+    return UrlBatchAnalysisResponse(
+        items=[items[url] for url in urls],
+        succeeded=len(succeeded),
+        failed=len(urls) - len(succeeded)
+    )
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the status of an analysis job, and its result once it has succeeded."""
+    job = await db.scalar(
+        select(AnalysisJob)
+        .options(joinedload(AnalysisJob.analysis).joinedload(UrlAnalysis.user))
+        .where(AnalysisJob.id == job_id, AnalysisJob.user_id == current_user.id)
+    )
+    if job is None:
+        raise not_found_exception("Analysis job not found")
+    return job
+
+def _after_cursor(query, cursor: str):
+    """Restrict a newest-first query to the rows after the one ``cursor`` points to."""
+    try:
+        analyzed_at, last_id = decode_cursor(cursor)
+    except ValidationError as e:
+        raise bad_request_exception(e.message)
+    return query.where(or_(
+        UrlAnalysis.analyzed_at < analyzed_at,
+        and_(UrlAnalysis.analyzed_at == analyzed_at, UrlAnalysis.id > last_id)
+    ))
+
+async def _paginate(
+    query,
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    total: int,
+    db: AsyncSession
+) -> PaginatedUrlAnalysisResponse:
+    """Return one page of the analyses selected by ``query``, newest first.
+    
+    With a ``cursor`` the page starts right after the row it points to
+    (keyset pagination on ``(analyzed_at, id)``) instead of at an offset, and
+    ``page`` is ignored and returned as None. ``total`` is the number of rows
+    ``query`` selects.
+    """
+    # Same order as the (analyzed_at DESC, id) indexes; users are joined in
+    # rather than lazy-loaded once per serialized row
+    query = query\
+        .options(joinedload(UrlAnalysis.user))\
+        .order_by(desc(UrlAnalysis.analyzed_at), UrlAnalysis.id)
+    if cursor:
+        query = _after_cursor(query, cursor)
+    else:
+        query = query.offset((page - 1) * size)
+    
+    # One extra row tells whether there is a next page
+    analyses = (await db.scalars(query.limit(size + 1))).all()
+    next_cursor = None
+    if len(analyses) > size:
+        analyses = analyses[:size]
+        next_cursor = encode_cursor(analyses[-1].analyzed_at, analyses[-1].id)
     
     # Calculate total pages
     pages = math.ceil(total / size) if total > 0 else 1
@@ -66,38 +267,152 @@ async def get_analysis_history(
     return PaginatedUrlAnalysisResponse(
         items=analyses,
         total=total,
-        page=page,
+        page=None if cursor else page,
         size=size,
-        pages=pages
+        pages=pages,
+        next_cursor=next_cursor
     )
 
+@router.get("/history", response_model=PaginatedUrlAnalysisResponse)
+async def get_analysis_history(
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides page"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    query = select(UrlAnalysis).where(UrlAnalysis.user_id == current_user.id)
+    # Read from the summary table rather than counted on every page
+    total = await count_analyses(db, current_user.id)
+    return await _paginate(query, page, size, cursor, total, db)
+
 @router.get("/history/all", response_model=PaginatedUrlAnalysisResponse)
 async def get_all_analyses(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all URL analyses from all users (admin functionality)."""
-    # Calculate offset
-    offset = (page - 1) * size
-    
-    # Get total count
-    total = db.query(UrlAnalysis).count()
-    
-    # Get paginated results with user information
-    analyses = db.query(UrlAnalysis)\
-        .order_by(desc(UrlAnalysis.analyzed_at))\
-        .offset(offset)\
-        .limit(size)\
-        .all()
+    total = await count_analyses(db)
+    return await _paginate(select(UrlAnalysis), page, size, cursor, total, db)
+
+@router.get(
+    "/history/export",
+    response_class=StreamingResponse,
+    responses={200: {
+        "content": {media_type: {} for media_type in EXPORT_FORMATS.values()},
+        "description": "One record per analysis, newest first"
+    }}
+)
+async def export_analysis_history(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format"),
+    mine: bool = Query(False, description="Only export the current user's analyses"),
+    cursor: Optional[str] = Query(None, description="cursor of the last record received; the export resumes after it"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream the analysis history in one response instead of page by page.
     
-    # Calculate total pages
-    pages = math.ceil(total / size) if total > 0 else 1
+    Every record carries a ``cursor`` that resumes an interrupted export, or
+    pages history, from that record on. The response is gzip-compressed when
+    the client accepts it.
+    """
+    query = export_query(current_user.id if mine else None)
+    if cursor:
+        query = _after_cursor(query, cursor)
+    compress = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "Content-Disposition": f'attachment; filename="analyses.{format}"',
+        "Vary": "Accept-Encoding",
+        "X-Accel-Buffering": "no"
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_analyses(db, query, format, compress),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers
+    )
+
+_SEARCH_TERM_SEPARATORS = re.compile(r"[,\s]+")
+
+def _search_terms(words: List[str]) -> List[str]:
+    """Normalize ``word`` query values, which may also hold comma-separated terms."""
+    terms = list(dict.fromkeys(
+        term.lower() for value in words for term in _SEARCH_TERM_SEPARATORS.split(value) if term
+    ))
+    if not terms:
+        raise bad_request_exception("At least one search word is required")
+    if len(terms) > SEARCH_MAX_TERMS:
+        raise bad_request_exception(f"At most {SEARCH_MAX_TERMS} search words are allowed")
+    # Stored words are lowercase ASCII letters, which prefix matching relies on
+    if not all(term.isascii() and term.isalpha() for term in terms):
+        raise bad_request_exception("Search words may only contain letters")
+    return terms
+
+@router.get("/search", response_model=PaginatedUrlAnalysisResponse)
+async def search_analyses(
+    word: List[str] = Query(..., description="Words to look for; repeat the parameter or separate with commas"),
+    match: str = Query("all", pattern="^(all|any)$", description="all: every word must match; any: at least one"),
+    prefix: bool = Query(False, description="Match top words starting with each word"),
+    mine: bool = Query(False, description="Only search the current user's analyses"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides page"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find analyses whose top words include the given words, newest first.
     
-    return PaginatedUrlAnalysisResponse(
-        items=analyses,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
+    Matches are looked up in the ``analysis_words`` index rather than by
+    scanning the stored JSON, so cost grows with the number of matches.
+    """
+    terms = _search_terms(word)
+    query = select(UrlAnalysis).where(UrlAnalysis.id.in_(matching_analysis_ids(terms, match == "all", prefix)))
+    if mine:
+        query = query.where(UrlAnalysis.user_id == current_user.id)
+    total = await db.scalar(select(func.count()).select_from(query.with_only_columns(UrlAnalysis.id).subquery()))
+    return await _paginate(query, page, size, cursor, total, db)
+
+@router.get("/words/top", response_model=WordAggregateResponse)
+async def get_top_words(
+    limit: int = Query(20, ge=1, le=100, description="Number of words"),
+    since: Optional[datetime] = Query(None, description="Only analyses made at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only analyses made before this time"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the most frequent words across the current user's analyses."""
+    items = await aggregate_top_words(db, limit, current_user.id, since, until)
+    return WordAggregateResponse(items=items, since=since, until=until)
+
+@router.get("/words/top/all", response_model=WordAggregateResponse)
+async def get_top_words_all(
+    limit: int = Query(20, ge=1, le=100, description="Number of words"),
+    since: Optional[datetime] = Query(None, description="Only analyses made at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only analyses made before this time"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the most frequent words across all users' analyses (admin functionality)."""
+    items = await aggregate_top_words(db, limit, None, since, until)
+    return WordAggregateResponse(items=items, since=since, until=until)
+
+@router.get("/stats", response_model=AnalysisStatsResponse)
+async def get_analysis_stats(
+    days: int = Query(30, ge=1, le=366, description="Number of UTC days of daily counts, including today"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get analysis totals and daily counts of the current user and of all users."""
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    return AnalysisStatsResponse(
+        user=await analysis_stats(db, since, current_user.id),
+        all_users=await analysis_stats(db, since)
     )
+
+@router.get("/analyzer/stats", response_model=AnalyzerStatsResponse)
+async def get_analyzer_stats(current_user: Principal = Depends(get_current_user)):
+    """Get runtime statistics of the URL analyzer, such as cache hit rates."""
+    return url_analyzer.get_stats()
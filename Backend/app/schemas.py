@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, HttpUrl
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, HttpUrl, Field
+from datetime import date, datetime
 from typing import List, Optional
+from app.core.environment import ANALYSIS_MAX_TOP_N, ANALYSIS_MAX_NGRAM_SIZE, BATCH_MAX_URLS
 
 # User schemas
 class UserBase(BaseModel):
@@ -40,9 +41,17 @@ class LoginResponse(BaseModel):
     user: UserResponse
 
 # URL Analysis schemas
-class UrlAnalysisCreate(BaseModel):
+class AnalysisOptionsBase(BaseModel):
+    top_n: int = Field(5, ge=1, le=ANALYSIS_MAX_TOP_N, description="Number of top words to return")
+    ngram_size: int = Field(1, ge=1, le=ANALYSIS_MAX_NGRAM_SIZE, description="Also count phrases of this many words")
+    min_word_length: int = Field(3, ge=1, le=20, description="Shortest word counted")
+
+class UrlAnalysisCreate(AnalysisOptionsBase):
     url: HttpUrl
 
+class UrlBatchAnalysisCreate(AnalysisOptionsBase):
+    urls: List[HttpUrl] = Field(..., min_length=1, max_length=BATCH_MAX_URLS)
+
 class WordCount(BaseModel):
     word: str
     count: int
@@ -51,15 +60,90 @@ class UrlAnalysisResponse(BaseModel):
     id: int
     url: str
     top_words: List[WordCount]
+    top_ngrams: Optional[List[WordCount]] = None
     analyzed_at: datetime
     user: UserResponse
     
     class Config:
         from_attributes = True
 
+class AnalysisJobResponse(BaseModel):
+    id: int
+    url: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    analysis: Optional[UrlAnalysisResponse] = None
+    
+    class Config:
+        from_attributes = True
+
+class BatchAnalysisItem(BaseModel):
+    url: str
+    analysis: Optional[UrlAnalysisResponse] = None
+    error: Optional[str] = None
+
+class UrlBatchAnalysisResponse(BaseModel):
+    items: List[BatchAnalysisItem]
+    succeeded: int
+    failed: int
+
 class PaginatedUrlAnalysisResponse(BaseModel):
     items: List[UrlAnalysisResponse]
     total: int
-    page: int
+    # None for pages reached by cursor, which have no page number
+    page: Optional[int]
     size: int
     pages: int
+    next_cursor: Optional[str] = None
+
+class WordAggregate(BaseModel):
+    word: str
+    count: int
+    analyses: int
+
+class WordAggregateResponse(BaseModel):
+    items: List[WordAggregate]
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+class DailyAnalysisCount(BaseModel):
+    day: date
+    count: int
+
+class AnalysisStats(BaseModel):
+    analyses: int
+    last_analyzed_at: Optional[datetime] = None
+    daily: List[DailyAnalysisCount]
+
+class AnalysisStatsResponse(BaseModel):
+    user: AnalysisStats
+    all_users: AnalysisStats
+
+class CacheStats(BaseModel):
+    backend: str
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    evictions: Optional[int] = None
+    size: Optional[int] = None
+    max_entries: Optional[int] = None
+
+class FetchStats(BaseModel):
+    requests: int
+    not_modified: int
+    bytes_downloaded: int
+
+class SingleFlightStats(BaseModel):
+    coalesced: int
+    in_flight: int
+
+class AuthCacheStatsResponse(BaseModel):
+    principals: CacheStats
+    access_tokens: CacheStats
+
+class AnalyzerStatsResponse(BaseModel):
+    cache: CacheStats
+    fetch: FetchStats
+    single_flight: SingleFlightStats
@@ -0,0 +1,102 @@
+"""
+Result cache for URL analyses.
+Results are keyed on the normalized URL so that trivially different
+spellings of the same address share a single entry.
+"""
+
+import json
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from app.core.cache import TTLCache
+from app.core.environment import (
+    ANALYSIS_CACHE_BACKEND, ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_REDIS_URL
+)
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis is only required for the shared backend
+    redis = None
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL: lowercase scheme and host, sort the query string, drop the fragment."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+class AnalysisCache:
+    """Interface for analysis result cache backends."""
+
+    name = "none"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    async def aclose(self) -> None:
+        return None
+
+class InMemoryAnalysisCache(AnalysisCache):
+    """Per-process LRU cache with TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, ttl: float = ANALYSIS_CACHE_TTL):
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(max_entries, ttl)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        self._cache.set(key, result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self._cache.stats()}
+
+class RedisAnalysisCache(AnalysisCache):
+    """Cache shared between server processes, backed by Redis.
+
+    Eviction is delegated to Redis (configure ``maxmemory-policy allkeys-lru``).
+    """
+
+    name = "redis"
+    key_prefix = "url-analysis:"
+
+    def __init__(self, redis_url: str = ANALYSIS_CACHE_REDIS_URL, ttl: float = ANALYSIS_CACHE_TTL, client: Any = None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The redis package is required for ANALYSIS_CACHE_BACKEND=redis")
+            client = redis.from_url(redis_url)
+        self._client = client
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(self.key_prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        await self._client.set(self.key_prefix + key, json.dumps(result), ex=int(self.ttl))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "hits": self.hits, "misses": self.misses}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+def create_analysis_cache(backend: str = ANALYSIS_CACHE_BACKEND) -> AnalysisCache:
+    """Build the cache backend selected by ``ANALYSIS_CACHE_BACKEND``."""
+    if backend == "memory":
+        return InMemoryAnalysisCache()
+    if backend == "redis":
+        return RedisAnalysisCache()
+    return AnalysisCache()
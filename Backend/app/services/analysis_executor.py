@@ -0,0 +1,98 @@
+"""
+Worker pool for CPU-bound analysis steps.
+Parsing and word counting are run in separate processes so that large
+pages do not block the event loop serving other requests. A pool whose
+worker died is replaced, so one crash doesn't fail every later request.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+from app.core.errors import ExternalServiceError, ServiceUnavailableError
+
+def _warm_up() -> None:
+    """No-op task used to force worker processes to start."""
+    return None
+
+class AnalysisExecutor:
+    """Process pool with a bounded number of pending tasks.
+
+    Requests beyond ``max_pending`` are rejected with a
+    ``ServiceUnavailableError`` instead of queueing indefinitely.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = ()
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks currently queued or running."""
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # Spawned workers do not inherit the server's threads or sockets
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+                initargs=self._initargs
+            )
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        # Tasks failing on the same broken pool must not discard its replacement
+        if self._pool is pool:
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Start all worker processes so the first requests don't pay for it."""
+        pool = self._get_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_warm_up)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on a worker process and await its result.
+
+        A task interrupted by a dying worker is retried once on a new pool;
+        if that worker dies as well, the task itself is assumed to kill it.
+        """
+        if self._pending >= self.max_pending:
+            raise ServiceUnavailableError(
+                f"Analysis queue is full ({self.max_pending} pending), please retry later",
+                "QUEUE_FULL"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            for _ in range(2):
+                pool = self._get_pool()
+                try:
+                    return await loop.run_in_executor(pool, fn, *args)
+                except BrokenProcessPool:
+                    # A worker exited abruptly, e.g. killed by the OOM killer
+                    self._discard_pool(pool)
+            raise ExternalServiceError("Analysis worker crashed while processing the content", "WORKER_CRASHED")
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
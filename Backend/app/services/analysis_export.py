@@ -0,0 +1,112 @@
+"""
+Streaming export of stored analyses.
+Rows are read through a server-side cursor ``EXPORT_BATCH_SIZE`` at a time and
+encoded batch by batch, so an export holds a bounded number of rows in memory
+whatever the size of the history.
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+from sqlalchemy import desc, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.environment import EXPORT_BATCH_SIZE
+from app.core.pagination import encode_cursor
+from app.models import UrlAnalysis, User
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Fields of each exported record; ``cursor`` resumes an export right after the record
+EXPORT_FIELDS = ["id", "url", "analyzed_at", "user_id", "username", "top_words", "top_ngrams", "cursor"]
+
+def export_query(user_id: Optional[int] = None):
+    """Select the exported columns of all analyses, or of one user, newest first.
+
+    Plain columns instead of ORM entities keep rows out of the session's
+    identity map; the order matches history pages so their cursors are shared.
+    """
+    query = select(
+        UrlAnalysis.id,
+        UrlAnalysis.url,
+        UrlAnalysis.analyzed_at,
+        UrlAnalysis.user_id,
+        User.username,
+        UrlAnalysis.top_words,
+        UrlAnalysis.top_ngrams
+    ).join(User, User.id == UrlAnalysis.user_id)
+    if user_id is not None:
+        query = query.where(UrlAnalysis.user_id == user_id)
+    return query.order_by(desc(UrlAnalysis.analyzed_at), UrlAnalysis.id)
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an ``Accept-Encoding`` header value allows a gzip response."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip().lower()
+        return not (quality.startswith("q=") and quality[2:].strip("0. ") == "")
+    return False
+
+def _record(row: Row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "url": row.url,
+        "analyzed_at": row.analyzed_at.isoformat(),
+        "user_id": row.user_id,
+        "username": row.username,
+        "top_words": row.top_words,
+        "top_ngrams": row.top_ngrams,
+        "cursor": encode_cursor(row.analyzed_at, row.id)
+    }
+
+def _ndjson_chunk(rows: Sequence[Row]) -> str:
+    return "".join(json.dumps(_record(row), separators=(",", ":")) + "\n" for row in rows)
+
+def _csv_chunk(rows: Sequence[Row], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        record = _record(row)
+        # Word lists are written as JSON in a single cell
+        for field in ("top_words", "top_ngrams"):
+            if record[field] is not None:
+                record[field] = json.dumps(record[field], separators=(",", ":"))
+        writer.writerow(record[field] for field in EXPORT_FIELDS)
+    return buffer.getvalue()
+
+async def export_analyses(
+    db: AsyncSession,
+    query,
+    format: str = "ndjson",
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """Stream the rows of an ``export_query`` as NDJSON or CSV, one chunk per batch.
+
+    With ``compress`` the chunks form a single gzip stream, flushed after
+    every batch so the client can decode rows as they arrive.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    if format == "csv":
+        yield encode(_csv_chunk([], header=True))
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    try:
+        async for rows in result.partitions():
+            yield encode(_ndjson_chunk(rows) if format == "ndjson" else _csv_chunk(rows))
+    finally:
+        await result.close()
+    if compressor is not None:
+        yield compressor.flush()
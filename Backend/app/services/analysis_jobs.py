@@ -0,0 +1,218 @@
+"""
+Background URL analysis jobs.
+Jobs are persisted in the ``analysis_jobs`` table and run by a fixed number
+of asyncio workers, so long fetches don't hold client connections open.
+Fetch timeouts are retried with exponential backoff.
+
+Every server process runs its own queue, so a worker claims a job with a
+conditional UPDATE before running it and only one process ever runs an
+attempt. A job left running by a process that died is taken over once its
+lease (``ANALYSIS_JOB_LEASE_TIMEOUT``) has expired. Attempts are aborted
+before their lease runs out, so a live worker's job is never taken over.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.core.environment import (
+    ANALYSIS_JOB_WORKERS, ANALYSIS_JOB_MAX_ATTEMPTS, ANALYSIS_JOB_RETRY_BACKOFF, ANALYSIS_JOB_LEASE_TIMEOUT
+)
+from app.core.errors import ExternalServiceError, ServiceUnavailableError
+from app.models import AnalysisJob, UrlAnalysis
+from app.services.analysis_store import (
+    analysis_values, find_previous_analysis, record_analyses
+)
+from app.services.url_analyzer import AnalysisResult, UrlAnalyzerService
+from app.services.word_counter import AnalysisOptions
+
+logger = logging.getLogger(__name__)
+
+# Failures worth another attempt: the page may well load next time
+RETRYABLE_ERROR_CODES = frozenset(["TIMEOUT_ERROR"])
+
+# Share of the lease an attempt may run for; the rest is left for recording its outcome
+ATTEMPT_LEASE_SHARE = 0.9
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class AnalysisJobQueue:
+    """In-process queue of analysis job ids served by a bounded worker pool."""
+
+    def __init__(
+        self,
+        analyzer: UrlAnalyzerService,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        workers: int = ANALYSIS_JOB_WORKERS,
+        max_attempts: int = ANALYSIS_JOB_MAX_ATTEMPTS,
+        retry_backoff: float = ANALYSIS_JOB_RETRY_BACKOFF,
+        lease_timeout: float = ANALYSIS_JOB_LEASE_TIMEOUT
+    ):
+        self.analyzer = analyzer
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease_timeout = lease_timeout
+        self.attempt_timeout = lease_timeout * ATTEMPT_LEASE_SHARE
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the workers and queue the jobs no live worker is running."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        await self._requeue(self._claimable())
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover()))
+
+    async def aclose(self) -> None:
+        """Stop the workers; interrupted jobs are resumed once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job_id: int) -> None:
+        """Queue a job that has already been committed to the database."""
+        if self._queue is None:
+            raise ServiceUnavailableError("Analysis job queue is not running")
+        self._queue.put_nowait(job_id)
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _lease_cutoff(self) -> datetime:
+        return _utcnow() - timedelta(seconds=self.lease_timeout)
+
+    def _claimable(self):
+        """Jobs waiting for a worker, or still running after their lease expired."""
+        return or_(
+            AnalysisJob.status == "queued",
+            and_(AnalysisJob.status == "running", AnalysisJob.updated_at < self._lease_cutoff())
+        )
+
+    async def _requeue(self, condition) -> None:
+        async with self.session_factory() as db:
+            job_ids = await db.scalars(select(AnalysisJob.id).where(condition).order_by(AnalysisJob.id))
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+
+    async def _recover(self) -> None:
+        """Periodically queue jobs abandoned by workers of other, dead processes.
+
+        Jobs queued by a live process are claimed by one worker only, so
+        queueing them here as well is harmless.
+        """
+        while True:
+            await asyncio.sleep(self.lease_timeout)
+            try:
+                await self._requeue(and_(
+                    AnalysisJob.status.in_(("queued", "running")),
+                    AnalysisJob.updated_at < self._lease_cutoff()
+                ))
+            except Exception:
+                logger.exception("Recovering abandoned analysis jobs failed")
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception:
+                logger.exception("Analysis job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _claim(self, db: AsyncSession, job_id: int) -> Optional[AnalysisJob]:
+        """Mark a job running for this worker, or return None if it isn't claimable.
+
+        The status check and update are one statement, so of several workers
+        claiming the same job exactly one succeeds.
+        """
+        claimed = await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, self._claimable())
+            .values(status="running", attempts=AnalysisJob.attempts + 1, updated_at=_utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return None
+        return await db.get(AnalysisJob, job_id)
+
+    async def _finish(self, db: AsyncSession, job_id: int, attempt: int, **values) -> bool:
+        """Record the outcome of an attempt together with any pending changes.
+
+        Nothing is written if the job was taken over after its lease expired.
+        """
+        finished = await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == "running", AnalysisJob.attempts == attempt)
+            .values(updated_at=_utcnow(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        if finished.rowcount != 1:
+            await db.rollback()
+            logger.warning("Analysis job %s attempt %s lost its lease; outcome discarded", job_id, attempt)
+            return False
+        await db.commit()
+        return True
+
+    async def run_job(self, job_id: int) -> None:
+        """Run one attempt of a job and record its outcome."""
+        async with self.session_factory() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                return
+            url, user_id, attempt, options_dict = job.url, job.user_id, job.attempts, job.analysis_options
+
+            async def load_previous():
+                # A separate session: an aborted attempt's shared analysis may still be running
+                async with self.session_factory() as previous_db:
+                    return await find_previous_analysis(previous_db, url, options_dict)
+
+            try:
+                options = AnalysisOptions(**options_dict)
+                result = await self._analyze(url, options, load_previous)
+            except (ExternalServiceError, ServiceUnavailableError) as e:
+                retryable = isinstance(e, ServiceUnavailableError) or e.error_code in RETRYABLE_ERROR_CODES
+                if retryable and attempt < self.max_attempts:
+                    if await self._finish(db, job_id, attempt, status="queued", error=e.message):
+                        self._retry_later(job_id, self.retry_backoff * 2 ** (attempt - 1))
+                else:
+                    await self._finish(db, job_id, attempt, status="failed", error=e.message)
+                return
+            except Exception as e:
+                await self._finish(db, job_id, attempt, status="failed", error=str(e))
+                return
+
+            # The result and the job update are committed together
+            analysis = UrlAnalysis(**analysis_values(url, user_id, result, options_dict))
+            db.add(analysis)
+            await db.flush()
+            await record_analyses(db, [analysis])
+            await self._finish(db, job_id, attempt, status="succeeded", error=None, analysis_id=analysis.id)
+
+    async def _analyze(self, url: str, options: AnalysisOptions, load_previous) -> AnalysisResult:
+        """Analyze a job's URL, giving up once the attempt has used its share of the lease.
+
+        httpx timeouts apply to each network operation, so a page trickling in
+        slowly enough never times out on its own.
+        """
+        try:
+            async with asyncio.timeout(self.attempt_timeout):
+                return await self.analyzer.analyze_url(url, options, load_previous=load_previous)
+        except TimeoutError:
+            raise ExternalServiceError(
+                f"Analysis did not finish within {self.attempt_timeout:g} seconds", "TIMEOUT_ERROR"
+            )
+
+    def _retry_later(self, job_id: int, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job_id)
@@ -0,0 +1,231 @@
+"""
+Persistence helpers for URL analyses.
+Shared by the request handlers and the background job workers so both
+store results and pick revalidation candidates the same way.
+"""
+
+from collections import Counter
+from dataclasses import asdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, desc, insert, intersect, or_, func, select, union
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import UrlAnalysis, AnalysisWord, UserAnalysisStats, DailyAnalysisStats
+from app.services.url_analyzer import AnalysisResult
+from app.services.word_counter import AnalysisOptions
+
+# INSERT constructs supporting ON CONFLICT DO UPDATE, per database backend
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def has_validators():
+    """Filter for stored analyses that can be revalidated with a conditional request."""
+    return or_(UrlAnalysis.etag.isnot(None), UrlAnalysis.last_modified.isnot(None))
+
+def same_options(options_dict: Dict[str, Any]):
+    """Filter for stored analyses computed with the given options."""
+    matches = and_(*(
+        UrlAnalysis.analysis_options[name].as_integer() == value
+        for name, value in options_dict.items()
+    ))
+    # Rows without options predate them and were computed with the defaults
+    if options_dict == asdict(AnalysisOptions()):
+        matches = or_(matches, UrlAnalysis.analysis_options.is_(None))
+    return matches
+
+def previous_result(row: UrlAnalysis) -> AnalysisResult:
+    """Turn a stored analysis into a revalidation candidate."""
+    return AnalysisResult(row.top_words, row.etag, row.last_modified, top_ngrams=row.top_ngrams)
+
+async def find_previous_analysis(db: AsyncSession, url: str, options_dict: Dict[str, Any]) -> Optional[AnalysisResult]:
+    """Return the latest stored result for ``url`` and these options usable for conditional re-fetching."""
+    previous = await db.scalar(
+        select(UrlAnalysis)
+        .where(UrlAnalysis.url == url, has_validators(), same_options(options_dict))
+        .order_by(desc(UrlAnalysis.analyzed_at), desc(UrlAnalysis.id))
+        .limit(1)
+    )
+    return previous_result(previous) if previous is not None else None
+
+async def find_previous_analyses(
+    db: AsyncSession, urls: List[str], options_dict: Dict[str, Any]
+) -> Dict[str, AnalysisResult]:
+    """``find_previous_analysis`` for several URLs in one query, keyed by URL.
+
+    Only the newest matching row of each URL is selected, however often
+    the URL was analyzed before.
+    """
+    ranked = select(
+        UrlAnalysis.id,
+        func.row_number().over(
+            partition_by=UrlAnalysis.url,
+            order_by=(desc(UrlAnalysis.analyzed_at), desc(UrlAnalysis.id))
+        ).label("rank")
+    ).where(UrlAnalysis.url.in_(urls), has_validators(), same_options(options_dict)).subquery()
+    rows = await db.scalars(
+        select(UrlAnalysis).join(ranked, ranked.c.id == UrlAnalysis.id).where(ranked.c.rank == 1)
+    )
+    return {row.url: previous_result(row) for row in rows}
+
+def analysis_values(url: str, user_id: int, result: AnalysisResult, options_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of the ``url_analyses`` row storing ``result``."""
+    return {
+        "url": url,
+        "top_words": result.top_words,
+        "top_ngrams": result.top_ngrams,
+        "analysis_options": options_dict,
+        "user_id": user_id,
+        "etag": result.etag,
+        "last_modified": result.last_modified
+    }
+
+def analysis_word_rows(analysis_id: int, top_words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Column values of the ``analysis_words`` rows of one analysis."""
+    return [{"analysis_id": analysis_id, "word": item["word"], "count": item["count"]} for item in top_words]
+
+async def add_analysis_words(db: AsyncSession, analyses: Iterable[UrlAnalysis]) -> None:
+    """Insert the word rows of flushed analyses in a single executemany, without committing."""
+    rows = [row for analysis in analyses for row in analysis_word_rows(analysis.id, analysis.top_words)]
+    if rows:
+        await db.execute(insert(AnalysisWord), rows)
+
+def _utc_day(moment: datetime) -> date:
+    # SQLite returns naive datetimes, which are UTC there
+    return moment.astimezone(timezone.utc).date() if moment.tzinfo else moment.date()
+
+async def update_analysis_stats(db: AsyncSession, analyses: Iterable[UrlAnalysis]) -> None:
+    """Add flushed analyses to the per-user and per-day summary tables, without committing.
+
+    Counters are incremented with upserts, so concurrent transactions
+    never overwrite each other's counts.
+    """
+    users: Dict[int, Tuple[int, datetime]] = {}
+    days: Counter = Counter()
+    for analysis in analyses:
+        count, last = users.get(analysis.user_id, (0, analysis.analyzed_at))
+        users[analysis.user_id] = (count + 1, max(last, analysis.analyzed_at))
+        days[(analysis.user_id, _utc_day(analysis.analyzed_at))] += 1
+    if not users:
+        return
+    
+    upsert = _UPSERT_INSERTS[db.get_bind().dialect.name]
+    # Rows are written in key order so concurrent batches lock them in the same order
+    stmt = upsert(UserAnalysisStats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserAnalysisStats.user_id],
+        set_={
+            "analysis_count": UserAnalysisStats.analysis_count + stmt.excluded.analysis_count,
+            "last_analyzed_at": case(
+                (or_(
+                    UserAnalysisStats.last_analyzed_at.is_(None),
+                    stmt.excluded.last_analyzed_at > UserAnalysisStats.last_analyzed_at
+                ), stmt.excluded.last_analyzed_at),
+                else_=UserAnalysisStats.last_analyzed_at
+            )
+        }
+    )
+    await db.execute(stmt, [
+        {"user_id": user_id, "analysis_count": count, "last_analyzed_at": last}
+        for user_id, (count, last) in sorted(users.items())
+    ])
+    stmt = upsert(DailyAnalysisStats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyAnalysisStats.user_id, DailyAnalysisStats.day],
+        set_={"analysis_count": DailyAnalysisStats.analysis_count + stmt.excluded.analysis_count}
+    )
+    await db.execute(stmt, [
+        {"user_id": user_id, "day": day, "analysis_count": count}
+        for (user_id, day), count in sorted(days.items())
+    ])
+
+async def record_analyses(db: AsyncSession, analyses: Iterable[UrlAnalysis]) -> None:
+    """Update the word index and summary tables for newly flushed analyses.
+
+    Runs in the caller's transaction, which commits them together with the analyses.
+    """
+    analyses = list(analyses)
+    await add_analysis_words(db, analyses)
+    await update_analysis_stats(db, analyses)
+
+async def aggregate_top_words(
+    db: AsyncSession,
+    limit: int,
+    user_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Most frequent words summed over stored analyses, optionally of one user and time range.
+
+    Each item has the total ``count`` and the number of ``analyses`` the word is a top word of.
+    """
+    total = func.sum(AnalysisWord.count).label("count")
+    query = select(AnalysisWord.word, total, func.count().label("analyses"))
+    if user_id is not None or since is not None or until is not None:
+        query = query.join(UrlAnalysis, UrlAnalysis.id == AnalysisWord.analysis_id)
+        if user_id is not None:
+            query = query.where(UrlAnalysis.user_id == user_id)
+        if since is not None:
+            query = query.where(UrlAnalysis.analyzed_at >= since)
+        if until is not None:
+            query = query.where(UrlAnalysis.analyzed_at < until)
+    query = query.group_by(AnalysisWord.word).order_by(desc(total), AnalysisWord.word).limit(limit)
+    return [row._asdict() for row in await db.execute(query)]
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest lowercase word greater than every word starting with ``prefix``."""
+    stripped = prefix.rstrip("z")
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+def _word_condition(term: str, prefix: bool):
+    if not prefix:
+        return AnalysisWord.word == term
+    # Stored words are lowercase ASCII letters, so a prefix is a plain range
+    # that any B-tree index on word serves, unlike LIKE under most collations
+    upper = _prefix_upper_bound(term)
+    if upper is None:
+        return AnalysisWord.word >= term
+    return and_(AnalysisWord.word >= term, AnalysisWord.word < upper)
+
+def matching_analysis_ids(terms: List[str], match_all: bool = True, prefix: bool = False):
+    """Select the ids of analyses whose top words include all, or any, of ``terms``.
+
+    With ``prefix`` a term matches every top word starting with it. Terms
+    must be lowercase letters, like the stored words.
+    """
+    selects = [select(AnalysisWord.analysis_id).where(_word_condition(term, prefix)) for term in terms]
+    if len(selects) == 1:
+        return selects[0]
+    return intersect(*selects) if match_all else union(*selects)
+
+async def count_analyses(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """Number of stored analyses of a user, or of all users, read from the summary table."""
+    query = select(func.coalesce(func.sum(UserAnalysisStats.analysis_count), 0))
+    if user_id is not None:
+        query = query.where(UserAnalysisStats.user_id == user_id)
+    return await db.scalar(query)
+
+async def analysis_stats(db: AsyncSession, since: date, user_id: Optional[int] = None) -> Dict[str, Any]:
+    """Analysis count, last analysis time and per-day counts from ``since`` on.
+
+    Covers one user, or all users when ``user_id`` is ``None``. Days without
+    analyses are left out.
+    """
+    totals = select(
+        func.coalesce(func.sum(UserAnalysisStats.analysis_count), 0),
+        func.max(UserAnalysisStats.last_analyzed_at)
+    )
+    daily = select(DailyAnalysisStats.day, func.sum(DailyAnalysisStats.analysis_count))\
+        .where(DailyAnalysisStats.day >= since)\
+        .group_by(DailyAnalysisStats.day)\
+        .order_by(DailyAnalysisStats.day)
+    if user_id is not None:
+        totals = totals.where(UserAnalysisStats.user_id == user_id)
+        daily = daily.where(DailyAnalysisStats.user_id == user_id)
+    analyses, last_analyzed_at = (await db.execute(totals)).one()
+    return {
+        "analyses": analyses,
+        "last_analyzed_at": last_analyzed_at,
+        "daily": [{"day": day, "count": count} for day, count in await db.execute(daily)]
+    }
@@ -1,17 +1,42 @@
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
+import asyncio
+import hmac
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 import secrets
 from app.models import User, RefreshToken
 from app.schemas import TokenData
-from app.core.environment import SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS, REFRESH_TOKEN_EXPIRE_DAYS
+from app.core.cache import TTLCache
+from app.core.environment import (
+    SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS, REFRESH_TOKEN_EXPIRE_DAYS, PASSWORD_HASH_WORKERS,
+    ACCESS_TOKEN_CACHE_MAX_ENTRIES
+)
+from app.services.auth.principals import invalidate_principal
 
+# Hashes with any other cost are flagged for an update, so changing
+# BCRYPT_ROUNDS migrates existing passwords as users log in
 pwd_context = CryptContext(
     schemes=["bcrypt"], 
     deprecated="auto",
-    bcrypt__rounds=BCRYPT_ROUNDS
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a few threads keep it off the event loop;
+# the pool size caps how many hashes run at once
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+# Access tokens that passed verification, keyed on their signature and kept
+# until they expire; the entry holds the whole token, which must match too
+_verified_tokens: Optional[TTLCache[Tuple[str, TokenData]]] = (
+    TTLCache(max_entries=ACCESS_TOKEN_CACHE_MAX_ENTRIES, ttl=0) if ACCESS_TOKEN_CACHE_MAX_ENTRIES else None
 )
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,12 +45,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    """Hash ``password`` on the password hashing pool."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify ``plain_password`` on the password hashing pool.
+
+    Returns whether it matched and, if the stored hash uses outdated
+    settings, a replacement hash.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now() + timedelta(minutes=15)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -34,15 +73,16 @@ def create_refresh_token() -> str:
     """Create a secure refresh token."""
     return secrets.token_urlsafe(32)
 
-def store_refresh_token(db: Session, user_id: int, refresh_token: str) -> RefreshToken:
-    """Store refresh token in database."""
-    expires_at = datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+async def store_refresh_token(db: AsyncSession, user_id: int, refresh_token: str, commit: bool = True) -> RefreshToken:
+    """Store refresh token in database; with ``commit=False`` the caller commits."""
+    expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     
     # Revoke existing refresh tokens for the user (optional security measure)
-    db.query(RefreshToken).filter(
-        RefreshToken.user_id == user_id,
-        RefreshToken.is_revoked == False
-    ).update({"is_revoked": True})
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked == False)
+        .values(is_revoked=True)
+    )
     
     # Create new refresh token
     db_refresh_token = RefreshToken(
@@ -51,36 +91,70 @@ def store_refresh_token(db: Session, user_id: int, refresh_token: str) -> Refres
         expires_at=expires_at
     )
     db.add(db_refresh_token)
-    db.commit()
-    db.refresh(db_refresh_token)
+    if commit:
+        await db.commit()
     return db_refresh_token
 
-def verify_refresh_token(db: Session, refresh_token: str) -> Optional[User]:
-    """Verify refresh token and return associated user."""
-    db_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token,
-        RefreshToken.is_revoked == False,
-        RefreshToken.expires_at > datetime.now()
-    ).first()
-    
-    if not db_token:
-        return None
-    
-    return db_token.user
-
-def revoke_refresh_token(db: Session, refresh_token: str) -> bool:
+async def revoke_refresh_token(db: AsyncSession, refresh_token: str) -> bool:
     """Revoke a refresh token."""
-    db_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token
-    ).first()
+    db_token = await db.scalar(
+        select(RefreshToken)
+        .options(joinedload(RefreshToken.user))
+        .where(RefreshToken.token == refresh_token)
+    )
     
     if db_token:
         db_token.is_revoked = True
-        db.commit()
+        await db.commit()
+        invalidate_principal(db_token.user.username)
         return True
     return False
 
-def create_token_pair(db: Session, user: User) -> Tuple[str, str]:
+async def rotate_refresh_token(db: AsyncSession, refresh_token: str) -> Optional[Tuple[User, str, str]]:
+    """Exchange a valid refresh token for a new token pair in a single transaction.
+
+    Returns the user with the new access and refresh tokens, or ``None`` if
+    the token is unknown, revoked or expired.
+    """
+    # The row lock makes concurrent refreshes with the same token wait, then
+    # see it revoked
+    db_token = await db.scalar(
+        select(RefreshToken)
+        .options(joinedload(RefreshToken.user, innerjoin=True))
+        .where(
+            RefreshToken.token == refresh_token,
+            RefreshToken.is_revoked == False,
+            RefreshToken.expires_at > datetime.now(timezone.utc)
+        )
+        .with_for_update(of=RefreshToken)
+    )
+    
+    if not db_token:
+        return None
+    
+    # Storing the new token revokes the presented one with the user's others
+    user = db_token.user
+    access_token, new_refresh_token = await create_token_pair(db, user, commit=False)
+    await db.commit()
+    return user, access_token, new_refresh_token
+
+async def purge_refresh_tokens(db: AsyncSession, batch_size: int) -> int:
+    """Delete up to ``batch_size`` revoked or expired refresh tokens.
+
+    Returns the number of rows deleted.
+    """
+    batch = (
+        select(RefreshToken.id)
+        .where(or_(RefreshToken.is_revoked == True, RefreshToken.expires_at <= datetime.now(timezone.utc)))
+        .limit(batch_size)
+    )
+    result = await db.execute(
+        delete(RefreshToken).where(RefreshToken.id.in_(batch)).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+async def create_token_pair(db: AsyncSession, user: User, commit: bool = True) -> Tuple[str, str]:
     """Create both access and refresh tokens for a user."""
     # Create access token
     access_token_expires = timedelta(minutes=15)  # Short-lived
@@ -91,7 +165,9 @@ def create_token_pair(db: Session, user: User) -> Tuple[str, str]:
     
     # Create and store refresh token
     refresh_token = create_refresh_token()
-    store_refresh_token(db, user.id, refresh_token)
+    await store_refresh_token(db, user.id, refresh_token, commit=commit)
+    # Storing revoked the user's other refresh tokens
+    invalidate_principal(user.username)
     
     return access_token, refresh_token
 
@@ -100,6 +176,13 @@ def verify_token(token: str, credentials_exception=None):
         from app.core.errors import credentials_exception as default_creds_exception
         credentials_exception = default_creds_exception()
     
+    # Repeated bearer tokens skip signature checking and JSON decoding
+    signature = token.rpartition(".")[2]
+    if _verified_tokens is not None:
+        cached = _verified_tokens.get(signature)
+        if cached is not None and hmac.compare_digest(cached[0], token):
+            return cached[1]
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -108,18 +191,36 @@ def verify_token(token: str, credentials_exception=None):
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
+    
+    # Tokens without an expiry are never cached
+    expires_at = payload.get("exp")
+    if _verified_tokens is not None and isinstance(expires_at, (int, float)):
+        ttl = expires_at - time.time()
+        if ttl > 0:
+            _verified_tokens.set(signature, (token, token_data), ttl=ttl)
     return token_data
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
+def verified_token_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size of the verified access token cache."""
+    if _verified_tokens is None:
+        return {"backend": "none"}
+    return {"backend": "memory", **_verified_tokens.stats()}
+
+async def get_user_by_username(db: AsyncSession, username: str):
+    return await db.scalar(select(User).where(User.username == username))
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(User).where(User.email == email))
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user_by_username(db, username)
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return False
+    if new_hash is not None:
+        # Rehash transparently when BCRYPT_ROUNDS has changed
+        user.hashed_password = new_hash
+        await db.commit()
     return user
@@ -1,15 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.auth.auth import verify_token, get_user_by_username
+from app.services.auth.principals import Principal, get_cached_principal, cache_principal
 
 security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -17,8 +18,11 @@ async def get_current_user(
     )
     token = credentials.credentials
     token_data = verify_token(token, credentials_exception)
-    user = get_user_by_username(db, username=token_data.username)
+    principal = get_cached_principal(token_data.username)
+    if principal is not None:
+        return principal
+    user = await get_user_by_username(db, username=token_data.username)
     if user is None:
         raise credentials_exception
-    return user
+    return cache_principal(user)
 
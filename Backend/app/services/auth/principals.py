@@ -0,0 +1,55 @@
+"""
+Cache of authenticated principals.
+Access tokens are resolved to a user through a short-lived in-process cache
+keyed on the token subject, so authenticated requests normally need no
+database query. Entries are dropped when the user's refresh tokens are
+revoked or rotated.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.cache import TTLCache
+from app.core.environment import AUTH_PRINCIPAL_CACHE_TTL, AUTH_PRINCIPAL_CACHE_MAX_ENTRIES
+from app.models import User
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user, detached from any database session.
+
+    Carries the attributes of ``UserResponse`` so it serializes the same way.
+    """
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, username=user.username, email=user.email, created_at=user.created_at)
+
+_principals: TTLCache[Principal] = TTLCache(
+    max_entries=AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=AUTH_PRINCIPAL_CACHE_TTL
+)
+
+def get_cached_principal(username: str) -> Optional[Principal]:
+    """Return the cached principal for a token subject, if still fresh."""
+    if not AUTH_PRINCIPAL_CACHE_TTL:
+        return None
+    return _principals.get(username)
+
+def cache_principal(user: User) -> Principal:
+    """Build the principal of ``user`` and cache it under its username."""
+    principal = Principal.from_user(user)
+    if AUTH_PRINCIPAL_CACHE_TTL:
+        _principals.set(user.username, principal)
+    return principal
+
+def invalidate_principal(username: str) -> None:
+    """Drop the cached principal of ``username``."""
+    _principals.pop(username)
+
+def principal_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size of the principal cache."""
+    return {"backend": "memory", **_principals.stats()}
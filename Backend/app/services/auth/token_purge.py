@@ -0,0 +1,63 @@
+"""
+Periodic clean-up of refresh tokens.
+Every login and refresh revokes the user's previous tokens, so revoked and
+expired rows pile up; a background task deletes them in bounded batches so
+no single statement holds locks on a large part of the table.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.core.environment import REFRESH_TOKEN_PURGE_INTERVAL, REFRESH_TOKEN_PURGE_BATCH_SIZE
+from app.services.auth.auth import purge_refresh_tokens
+
+logger = logging.getLogger(__name__)
+
+class RefreshTokenPurger:
+    """Background task deleting revoked and expired refresh tokens."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        interval: float = REFRESH_TOKEN_PURGE_INTERVAL,
+        batch_size: int = REFRESH_TOKEN_PURGE_BATCH_SIZE
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start purging every ``interval`` seconds; an interval of 0 disables it."""
+        if self._task is None and self.interval:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def purge(self) -> int:
+        """Delete all purgeable tokens, one committed batch at a time."""
+        total = 0
+        async with self.session_factory() as db:
+            while True:
+                deleted = await purge_refresh_tokens(db, self.batch_size)
+                total += deleted
+                if deleted < self.batch_size:
+                    return total
+                # Let request handlers in between batches
+                await asyncio.sleep(0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                deleted = await self.purge()
+                if deleted:
+                    logger.info("Purged %d revoked or expired refresh tokens", deleted)
+            except Exception:
+                logger.exception("Refresh token purge failed")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,112 @@
+"""
+Incremental HTML text extraction and word counting.
+HTML is fed in chunks as it is downloaded and visible text is counted on
+the fly, so memory stays bounded by the chunk size instead of the page size.
+"""
+
+from html.parser import HTMLParser
+from typing import List, Set
+from bs4.dammit import EntitySubstitution
+from app.services.text_extractors import NON_TEXT_TAGS, REMOVED_TAGS
+from app.services.word_counter import WordCounter, DEFAULT_MIN_WORD_LENGTH
+
+# Tags whose content is dropped, the same ones the text extractors drop
+HIDDEN_TAGS = frozenset(REMOVED_TAGS + NON_TEXT_TAGS)
+
+# Elements that never have content or a closing tag
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer'
+])
+
+def _trailing_word_start(text: str) -> int:
+    """Return the index where the trailing run of word characters starts."""
+    i = len(text)
+    while i and (text[i - 1].isalnum() or text[i - 1] == '_'):
+        i -= 1
+    return i
+
+class StreamingWordCounter(HTMLParser):
+    """HTML tokenizer that pushes visible text straight into a word counter.
+
+    Tag nesting follows BeautifulSoup's html.parser tree builder: an end tag
+    closes every element opened after the matching start tag, and stray end
+    tags are ignored. A word split across chunks or inline tags is held back
+    until it is complete, so counts match the buffered pipeline.
+    """
+
+    def __init__(self, stop_words: Set[str], min_word_length: int = DEFAULT_MIN_WORD_LENGTH, ngram_size: int = 1):
+        # Character references are resolved below, the same way BeautifulSoup does
+        super().__init__(convert_charrefs=False)
+        self.words = WordCounter(stop_words, min_word_length, ngram_size)
+        self.has_text = False
+        self._open_tags: List[str] = []
+        self._skip_depth = 0
+        self._tail = ""
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in VOID_ELEMENTS:
+            return
+        self._open_tags.append(tag)
+        if tag in HIDDEN_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in VOID_ELEMENTS:
+            return
+        for index in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[index] == tag:
+                for closed in self._open_tags[index:]:
+                    if closed in HIDDEN_TAGS:
+                        self._skip_depth -= 1
+                del self._open_tags[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._push_text(data)
+
+    def handle_entityref(self, name: str) -> None:
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else "&%s" % name)
+
+    def handle_charref(self, name: str) -> None:
+        if name[:1] in ('x', 'X'):
+            code_point = int(name.lstrip('xX'), 16)
+        else:
+            code_point = int(name)
+        data = None
+        if code_point < 256:
+            # Low references are often meant as windows-1252 code points
+            try:
+                data = bytes([code_point]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code_point)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def unknown_decl(self, data: str) -> None:
+        # CDATA sections are part of the document text
+        if data.startswith('CDATA[') and not self._skip_depth:
+            self._push_text(data[6:])
+
+    def _push_text(self, text: str) -> None:
+        if not self.has_text and text.strip():
+            self.has_text = True
+        if self._tail:
+            text = self._tail + text
+        split = _trailing_word_start(text)
+        self._tail = text[split:]
+        if split:
+            self.words.update(text[:split])
+
+    def close(self) -> None:
+        super().close()
+        if self._tail:
+            self.words.update(self._tail)
+            self._tail = ""
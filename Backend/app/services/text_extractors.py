@@ -0,0 +1,104 @@
+"""
+HTML text extraction backends.
+BeautifulSoup's pure-Python html.parser is always available; C-backed
+parsers (selectolax, lxml) are used when installed because they extract
+text several times faster. The backends count the same words on real pages;
+CDATA sections are the known exception (see tests/test_text_extractors.py).
+"""
+
+from typing import Dict, Type
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml is an optional speed-up
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is an optional speed-up
+    LexborHTMLParser = None
+
+# Tags whose content never counts as page text
+REMOVED_TAGS = ['script', 'style', 'meta', 'link', 'noscript', 'header', 'footer', 'nav']
+
+# Tags BeautifulSoup keeps out of get_text(); dropped by the other backends for parity
+NON_TEXT_TAGS = ['template', 'rt', 'rp']
+
+class TextExtractor:
+    """Interface for HTML text extraction backends."""
+
+    name = ""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def extract(self, html_content: str) -> str:
+        """Return the raw visible text of an HTML document."""
+        raise NotImplementedError
+
+class HtmlParserExtractor(TextExtractor):
+    """BeautifulSoup with the standard library html.parser."""
+
+    name = "html.parser"
+
+    def extract(self, html_content: str) -> str:
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        # Remove script, style, meta, and other non-content tags
+        for tag in soup(REMOVED_TAGS):
+            tag.decompose()
+
+        return soup.get_text()
+
+class LxmlExtractor(TextExtractor):
+    """libxml2's HTML parser through lxml."""
+
+    name = "lxml"
+
+    def __init__(self):
+        # Parse from UTF-8 bytes: lxml rejects str input that carries an encoding declaration
+        self._parser = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return lxml is not None
+
+    def extract(self, html_content: str) -> str:
+        root = lxml.html.document_fromstring(html_content.encode('utf-8', 'surrogatepass'), parser=self._parser)
+        lxml.etree.strip_elements(root, *REMOVED_TAGS, *NON_TEXT_TAGS, with_tail=False)
+        return root.text_content()
+
+class SelectolaxExtractor(TextExtractor):
+    """Lexbor HTML5 parser through selectolax."""
+
+    name = "selectolax"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return LexborHTMLParser is not None
+
+    def extract(self, html_content: str) -> str:
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(REMOVED_TAGS + NON_TEXT_TAGS)
+        return tree.root.text(deep=True) if tree.root is not None else ""
+
+EXTRACTORS: Dict[str, Type[TextExtractor]] = {
+    extractor.name: extractor
+    for extractor in (SelectolaxExtractor, LxmlExtractor, HtmlParserExtractor)
+}
+
+def create_text_extractor(name: str = "auto") -> TextExtractor:
+    """Build the named extractor, or the fastest installed one for ``"auto"``.
+
+    Falls back to html.parser when the requested backend is not installed.
+    """
+    if name == "auto":
+        for extractor in EXTRACTORS.values():
+            if extractor.is_available():
+                return extractor()
+    extractor = EXTRACTORS.get(name, HtmlParserExtractor)
+    if not extractor.is_available():
+        extractor = HtmlParserExtractor
+    return extractor()
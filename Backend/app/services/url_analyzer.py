@@ -1,13 +1,26 @@
-import requests
-from bs4 import BeautifulSoup
-from collections import Counter
-from typing import List, Dict
+import asyncio
+import codecs
+import httpx
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Dict, Optional, AsyncIterator, Iterable, Callable, Awaitable, Union, Tuple
+from urllib.parse import urlsplit
 import re
 import nltk
 from nltk.corpus import stopwords
 import ssl
-from app.core.errors import ExternalServiceError, ValidationError
-from app.core.environment import REQUEST_TIMEOUT, MAX_CONTENT_SIZE, CHUNK_SIZE, USER_AGENT
+from app.core.errors import ExternalServiceError, ValidationError, ServiceUnavailableError
+from app.core.environment import (
+    REQUEST_TIMEOUT, MAX_CONTENT_SIZE, CHUNK_SIZE, USER_AGENT,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS_PER_HOST, ANALYSIS_EXECUTION_MODE, ANALYSIS_WORKERS, ANALYSIS_MAX_PENDING,
+    ANALYSIS_PIPELINE, HTML_EXTRACTOR, BATCH_MAX_CONCURRENCY, ANALYSIS_STREAM_SNAPSHOT_TOKENS
+)
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.analysis_cache import AnalysisCache, normalize_url
+from app.services.streaming_analyzer import StreamingWordCounter
+from app.services.text_extractors import TextExtractor, create_text_extractor
+from app.services.word_counter import AnalysisOptions, iter_text_chunks
 
 # Download NLTK data (run once)
 try:
@@ -27,14 +40,187 @@ except LookupError:
     # Download stopwords if not found
     nltk.download('stopwords')
 
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+def detect_charset(body: bytes, header_charset: Optional[str] = None) -> str:
+    """Pick the charset of an HTML body: BOM, then HTTP header, then <meta>, then UTF-8."""
+    candidates = [encoding for bom, encoding in _BOMS if body.startswith(bom)]
+    candidates.append(header_charset)
+    match = _META_CHARSET_RE.search(body, 0, 1024)
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+    for candidate in candidates:
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+    return 'utf-8'
+
+def decode_body(body: bytes, header_charset: Optional[str] = None) -> str:
+    """Decode a response body in a single pass."""
+    return body.decode(detect_charset(body, header_charset), errors='replace')
+
+@dataclass
+class FetchResult:
+    """Body and cache validators of a fetched page.
+    
+    ``content`` is ``None`` when the server answered ``304 Not Modified``.
+    """
+    content: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+@dataclass
+class AnalysisResult:
+    """Top words of a page together with the validators it was fetched with.
+    
+    ``top_ngrams`` is only set when n-grams were requested.
+    """
+    top_words: List[Dict[str, any]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    revalidated: bool = False
+    top_ngrams: Optional[List[Dict[str, any]]] = None
+
+class HostConcurrencyLimiter:
+    """Caps the number of concurrent requests sent to a single host.
+    
+    Semaphores are created on demand and dropped again once no request for
+    the host is in flight, so the registry stays bounded by active hosts.
+    """
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._users: Dict[str, int] = {}
+    
+    @asynccontextmanager
+    async def acquire(self, host: str) -> AsyncIterator[None]:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.limit)
+        self._users[host] = self._users.get(host, 0) + 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self._users[host] -= 1
+            if not self._users[host]:
+                del self._users[host]
+                del self._semaphores[host]
+
+# Analyzer instance owned by each worker process of the analysis pool
+_worker_analyzer: Optional["UrlAnalyzerService"] = None
+
+def _init_worker(stop_words: List[str]) -> None:
+    """Pre-warm a worker process with the parent's stopword set."""
+    global _worker_analyzer
+    _worker_analyzer = UrlAnalyzerService(stop_words=stop_words, execution_mode="inline")
+
+def _analyze_in_worker(html_content: str, options: AnalysisOptions) -> Dict[str, any]:
+    return _worker_analyzer.analyze_content(html_content, options)
+
+def _parse_in_worker(html_content: str) -> str:
+    return _worker_analyzer.parse_content(html_content)
+
+# Bytes downloaded between two progress events
+PROGRESS_BYTES = 64 * 1024
+
+# Characters counted between checks for a snapshot
+SNAPSHOT_SCAN_CHARS = 16 * 1024
+
 class UrlAnalyzerService:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        # Add common web-specific stop words
-        self.stop_words.update(['com', 'www', 'http', 'https', 'html', 'php', 'asp', 'htm'])
+    def __init__(
+        self,
+        stop_words: Optional[Iterable[str]] = None,
+        execution_mode: str = ANALYSIS_EXECUTION_MODE,
+        cache: Optional[AnalysisCache] = None,
+        pipeline: str = ANALYSIS_PIPELINE,
+        extractor: Optional[TextExtractor] = None
+    ):
+        if stop_words is not None:
+            self.stop_words = set(stop_words)
+        else:
+            self.stop_words = set(stopwords.words('english'))
+            # Add common web-specific stop words
+            self.stop_words.update(['com', 'www', 'http', 'https', 'html', 'php', 'asp', 'htm'])
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limiter = HostConcurrencyLimiter(HTTP_MAX_CONNECTIONS_PER_HOST)
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.pipeline = pipeline
+        self.extractor = extractor if extractor is not None else create_text_extractor(HTML_EXTRACTOR)
+        self._fetch_stats = {"requests": 0, "not_modified": 0, "bytes_downloaded": 0}
+        # Analyses currently running, keyed like the cache, for request coalescing
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._single_flight_stats = {"coalesced": 0}
+        # Caps URLs fetched at once across all batch requests, on top of the per-host limit
+        self._batch_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+        self._executor: Optional[AnalysisExecutor] = None
+        if execution_mode == "process" and pipeline == "buffered":
+            self._executor = AnalysisExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                max_pending=ANALYSIS_MAX_PENDING,
+                initializer=_init_worker,
+                initargs=(sorted(self.stop_words),)
+            )
+    
+    def start(self) -> None:
+        """Start the analysis worker pool, if one is configured."""
+        if self._executor is not None:
+            self._executor.start()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating its connection pool on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                timeout=httpx.Timeout(REQUEST_TIMEOUT),
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and stop the analysis worker pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown()
+        await self.cache.aclose()
+    
+    def get_stats(self) -> Dict[str, any]:
+        """Return runtime counters for the analyzer."""
+        return {
+            "cache": self.cache.stats(),
+            "fetch": dict(self._fetch_stats),
+            "single_flight": {**self._single_flight_stats, "in_flight": len(self._in_flight)}
+        }
     
-    def fetch_url_content(self, url: str) -> str:
-        """Fetch content from URL with proper error handling."""
+    @asynccontextmanager
+    async def open_url(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streamed GET request to ``url`` with proper error handling.
+        
+        When validators from a previous fetch are given, the request is made
+        conditional and a ``304 Not Modified`` response is yielded as is.
+        Network errors raised while the body is read are translated as well.
+        """
         if not url or not url.strip():
             raise ValidationError("URL cannot be empty")
         
@@ -42,58 +228,129 @@ class UrlAnalyzerService:
         if not url.startswith(('http://', 'https://')):
             raise ValidationError("URL must start with http:// or https://")
         
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        client = self._get_client()
         try:
-            headers = {
-                'User-Agent': USER_AGENT
-            }
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=REQUEST_TIMEOUT, 
-                allow_redirects=True,
-                stream=True  # Use streaming to check content size
-            )
-            response.raise_for_status()
-            
-            # Check content size to prevent memory issues
-            content_length = response.headers.get('content-length')
-            if content_length and int(content_length) > MAX_CONTENT_SIZE:
-                raise ValidationError(f"Content size ({content_length} bytes) exceeds maximum allowed size ({MAX_CONTENT_SIZE} bytes)")
-            
-            # Read content with size limit
-            content = ""
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True):
-                if chunk:
-                    downloaded += len(chunk.encode('utf-8'))
-                    if downloaded > MAX_CONTENT_SIZE:
-                        raise ValidationError(f"Content size exceeds maximum allowed size ({MAX_CONTENT_SIZE} bytes)")
-                    content += chunk
-            
-            return content
-        except requests.exceptions.Timeout:
+            async with self._host_limiter.acquire(urlsplit(url).netloc.lower()):
+                async with client.stream('GET', url, headers=headers) as response:
+                    self._fetch_stats["requests"] += 1
+                    if response.status_code == 304 and headers:
+                        self._fetch_stats["not_modified"] += 1
+                        yield response
+                        return
+                    response.raise_for_status()
+                    
+                    # Check content size to prevent memory issues
+                    content_length = response.headers.get('content-length')
+                    if content_length and int(content_length) > MAX_CONTENT_SIZE:
+                        raise ValidationError(f"Content size ({content_length} bytes) exceeds maximum allowed size ({MAX_CONTENT_SIZE} bytes)")
+                    
+                    yield response
+                    self._fetch_stats["bytes_downloaded"] += response.num_bytes_downloaded
+        except httpx.TimeoutException:
             raise ExternalServiceError(f"Request timeout while fetching URL: {url}", "TIMEOUT_ERROR")
-        except requests.exceptions.ConnectionError:
+        except httpx.NetworkError:
             raise ExternalServiceError(f"Connection error while fetching URL: {url}", "CONNECTION_ERROR")
-        except requests.exceptions.HTTPError as e:
-            raise ExternalServiceError(f"HTTP error {response.status_code} while fetching URL: {url}", "HTTP_ERROR")
-        except requests.RequestException as e:
+        except httpx.HTTPStatusError as e:
+            raise ExternalServiceError(f"HTTP error {e.response.status_code} while fetching URL: {url}", "HTTP_ERROR")
+        except httpx.HTTPError as e:
             raise ExternalServiceError(f"Failed to fetch URL content: {str(e)}", "REQUEST_ERROR")
     
+    async def _iter_body(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        """Yield raw body chunks, enforcing the maximum content size."""
+        downloaded = 0
+        async for chunk in response.aiter_bytes(chunk_size=CHUNK_SIZE):
+            downloaded += len(chunk)
+            if downloaded > MAX_CONTENT_SIZE:
+                raise ValidationError(f"Content size exceeds maximum allowed size ({MAX_CONTENT_SIZE} bytes)")
+            yield chunk
+    
+    @staticmethod
+    def _body_buffer(response: httpx.Response) -> bytearray:
+        """Buffer for a response body, preallocated when the size is known."""
+        content_length = response.headers.get('content-length')
+        return bytearray(int(content_length) if content_length else 0)
+    
+    async def _read_body(self, response: httpx.Response, buffer: bytearray) -> AsyncIterator[int]:
+        """Read the body into ``buffer``, yielding the byte count after each chunk."""
+        downloaded = 0
+        async for chunk in self._iter_body(response):
+            end = downloaded + len(chunk)
+            # Writes in place, growing the buffer only past the preallocated size
+            buffer[downloaded:end] = chunk
+            downloaded = end
+            yield downloaded
+        del buffer[downloaded:]
+    
+    async def fetch_url_content(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> FetchResult:
+        """Fetch content from URL with proper error handling.
+        
+        When validators from a previous fetch are given, the request is made
+        conditional and a ``304 Not Modified`` answer yields no content.
+        """
+        async with self.open_url(url, etag, last_modified) as response:
+            if response.status_code == 304:
+                return FetchResult(
+                    content=None,
+                    etag=response.headers.get('etag', etag),
+                    last_modified=response.headers.get('last-modified', last_modified),
+                    not_modified=True
+                )
+            
+            buffer = self._body_buffer(response)
+            async for _ in self._read_body(response, buffer):
+                pass
+            
+            return FetchResult(
+                content=decode_body(buffer, response.charset_encoding),
+                etag=response.headers.get('etag'),
+                last_modified=response.headers.get('last-modified')
+            )
+    
+    async def stream_analysis(self, response: httpx.Response, options: AnalysisOptions) -> Dict[str, any]:
+        """Count the top words and n-grams of a response while its body is downloaded."""
+        counter = StreamingWordCounter(self.stop_words, options.min_word_length, options.ngram_size)
+        decoder = None
+        try:
+            async for chunk in self._iter_body(response):
+                if decoder is None:
+                    charset = detect_charset(chunk, response.charset_encoding)
+                    decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+                counter.feed(decoder.decode(chunk))
+            if decoder is not None:
+                counter.feed(decoder.decode(b'', final=True))
+            counter.close()
+        except (ValidationError, ExternalServiceError):
+            raise
+        except httpx.HTTPError:
+            raise  # Translated by open_url
+        except Exception as e:
+            raise ExternalServiceError(f"Failed to parse HTML content: {str(e)}", "PARSING_ERROR")
+        
+        if not counter.has_text:
+            raise ValidationError("No readable text content found in the webpage")
+        if not counter.words.has_words():
+            raise ValidationError("No meaningful words found for analysis after filtering")
+        return options.summarize(counter.words)
+    
     def parse_content(self, html_content: str) -> str:
         """Parse HTML content and extract text, ignoring scripts, styles, and meta tags."""
         if not html_content or not html_content.strip():
             raise ValidationError("HTML content cannot be empty")
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script, style, meta, and other non-content tags
-            for tag in soup(['script', 'style', 'meta', 'link', 'noscript', 'header', 'footer', 'nav']):
-                tag.decompose()
-            
-            # Extract text
-            text = soup.get_text()
+            # Extract text, ignoring script, style, meta, and other non-content tags
+            text = self.extractor.extract(html_content)
             
             # Clean up text
             lines = (line.strip() for line in text.splitlines())
@@ -109,44 +366,227 @@ class UrlAnalyzerService:
         except Exception as e:
             raise ExternalServiceError(f"Failed to parse HTML content: {str(e)}", "PARSING_ERROR")
     
-    def get_top_words(self, text: str, top_n: int = 5) -> List[Dict[str, any]]:
-        """Extract top N most frequent words, excluding stop words."""
+    def count_words(self, text: str, options: AnalysisOptions) -> Dict[str, any]:
+        """Count words and n-grams of ``text`` in one pass and return the top ones."""
         if not text or not text.strip():
             raise ValidationError("Text content cannot be empty for word analysis")
-
-        if top_n <= 0:
-            raise ValidationError("top_n must be a positive integer")
         
         try:
-            # Convert to lowercase and extract words
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-            
-            # Filter out stop words and short words
-            filtered_words = [word for word in words if word not in self.stop_words and len(word) > 2]
+            # Count words of at least min_word_length letters, skipping stop words
+            counter = options.create_counter(self.stop_words)
+            counter.update(text)
             
-            if not filtered_words:
+            if not counter.has_words():
                 raise ValidationError("No meaningful words found for analysis after filtering")
             
-            # Count word frequencies
-            word_counts = Counter(filtered_words)
-            
-            # Get top N words
-            top_words = word_counts.most_common(top_n)
-            
-            return [{"word": word, "count": count} for word, count in top_words]
+            return options.summarize(counter)
         except ValidationError:
             raise  # Re-raise validation errors
         except Exception as e:
             raise ExternalServiceError(f"Failed to analyze word frequency: {str(e)}", "ANALYSIS_ERROR")
     
-    def analyze_url(self, url: str, top_n: int = 5) -> List[Dict[str, any]]:
-        """Complete URL analysis pipeline."""
+    def get_top_words(self, text: str, top_n: int = 5) -> List[Dict[str, any]]:
+        """Extract top N most frequent words, excluding stop words."""
+        if top_n <= 0:
+            raise ValidationError("top_n must be a positive integer")
+        return self.count_words(text, AnalysisOptions(top_n=top_n))["top_words"]
+    
+    def analyze_content(self, html_content: str, options: Optional[AnalysisOptions] = None) -> Dict[str, any]:
+        """Parse HTML content and return its top words and n-grams."""
+        text_content = self.parse_content(html_content)
+        return self.count_words(text_content, options or AnalysisOptions())
+    
+    async def analyze_url(
+        self,
+        url: str,
+        options: Optional[AnalysisOptions] = None,
+        load_previous: Optional[Callable[[], Awaitable[Optional[AnalysisResult]]]] = None
+    ) -> AnalysisResult:
+        """Complete URL analysis pipeline.
+        
+        ``load_previous`` is called on a cache miss to find an earlier result
+        for the same URL and options; its validators are used to revalidate
+        the page and its top words are reused if the page has not changed.
+        
+        Concurrent calls for the same normalized URL and options share a
+        single fetch/parse/count run.
+        """
         try:
-            html_content = self.fetch_url_content(url)
-            text_content = self.parse_content(html_content)
-            top_words = self.get_top_words(text_content, top_n)
-            return top_words
-        except (ValidationError, ExternalServiceError):
+            options = options or AnalysisOptions()
+            cache_key = self._cache_key(url, options)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return AnalysisResult(**cached)
+            
+            task = self._in_flight.get(cache_key)
+            if task is not None:
+                self._single_flight_stats["coalesced"] += 1
+            else:
+                task = asyncio.ensure_future(self._analyze_uncached(url, options, cache_key, load_previous))
+                self._in_flight[cache_key] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+            # Shield the shared run so one cancelled caller doesn't cancel it for the others
+            return await asyncio.shield(task)
+        except (ValidationError, ExternalServiceError, ServiceUnavailableError):
             raise  # Re-raise our custom errors
         except Exception as e:
             raise ExternalServiceError(f"Unexpected error during URL analysis: {str(e)}", "ANALYSIS_PIPELINE_ERROR")
+    
+    async def _analyze_uncached(
+        self,
+        url: str,
+        options: AnalysisOptions,
+        cache_key: str,
+        load_previous: Optional[Callable[[], Awaitable[Optional[AnalysisResult]]]]
+    ) -> AnalysisResult:
+        """Fetch, parse and count a URL and store the result in the cache."""
+        previous = await load_previous() if load_previous is not None else None
+        etag = previous.etag if previous is not None else None
+        last_modified = previous.last_modified if previous is not None else None
+        
+        if self.pipeline == "streaming":
+            async with self.open_url(url, etag, last_modified) as response:
+                if response.status_code == 304:
+                    result = AnalysisResult(
+                        previous.top_words,
+                        response.headers.get('etag', etag),
+                        response.headers.get('last-modified', last_modified),
+                        revalidated=True,
+                        top_ngrams=previous.top_ngrams
+                    )
+                else:
+                    # Count words as chunks arrive instead of buffering the page
+                    counts = await self.stream_analysis(response, options)
+                    result = AnalysisResult(
+                        etag=response.headers.get('etag'),
+                        last_modified=response.headers.get('last-modified'),
+                        **counts
+                    )
+        else:
+            fetched = await self.fetch_url_content(url, etag, last_modified)
+            if fetched.not_modified:
+                result = AnalysisResult(
+                    previous.top_words,
+                    fetched.etag,
+                    fetched.last_modified,
+                    revalidated=True,
+                    top_ngrams=previous.top_ngrams
+                )
+            else:
+                if self._executor is not None:
+                    # Parse and count on a worker process to keep the event loop free
+                    counts = await self._executor.run(_analyze_in_worker, fetched.content, options)
+                else:
+                    counts = self.analyze_content(fetched.content, options)
+                result = AnalysisResult(etag=fetched.etag, last_modified=fetched.last_modified, **counts)
+        await self._cache_result(cache_key, result)
+        return result
+    
+    @staticmethod
+    def _cache_key(url: str, options: AnalysisOptions) -> str:
+        return f"{normalize_url(url)}|{options.cache_key()}"
+    
+    async def _cache_result(self, cache_key: str, result: AnalysisResult) -> None:
+        await self.cache.set(cache_key, {
+            "top_words": result.top_words,
+            "top_ngrams": result.top_ngrams,
+            "etag": result.etag,
+            "last_modified": result.last_modified
+        })
+    
+    async def analyze_urls(
+        self,
+        urls: List[str],
+        options: Optional[AnalysisOptions] = None,
+        previous: Optional[Dict[str, AnalysisResult]] = None
+    ) -> List[Union[AnalysisResult, Exception]]:
+        """Analyze several URLs concurrently.
+        
+        ``previous`` maps URLs to earlier results used for revalidation. The
+        result list follows the order of ``urls``; a URL that fails yields its
+        exception instead of aborting the others.
+        """
+        previous = previous or {}
+        
+        async def analyze_one(url: str) -> AnalysisResult:
+            async def load_previous() -> Optional[AnalysisResult]:
+                return previous.get(url)
+            
+            async with self._batch_semaphore:
+                return await self.analyze_url(url, options, load_previous=load_previous)
+        
+        return await asyncio.gather(*(analyze_one(url) for url in urls), return_exceptions=True)
+    
+    async def analyze_url_events(
+        self,
+        url: str,
+        options: Optional[AnalysisOptions] = None,
+        load_previous: Optional[Callable[[], Awaitable[Optional[AnalysisResult]]]] = None,
+        snapshot_tokens: int = ANALYSIS_STREAM_SNAPSHOT_TOKENS
+    ) -> AsyncIterator[Tuple[str, any]]:
+        """Analyze a URL, yielding ``(event, data)`` pairs as the analysis progresses.
+        
+        Events are ``download`` (bytes downloaded so far, the expected total
+        and whether the body is complete), ``parsed`` (characters of text extracted), ``snapshot`` (top
+        words after every ``snapshot_tokens`` tokens) and finally ``result``
+        with the ``AnalysisResult``. Cached results are yielded right away.
+        """
+        options = options or AnalysisOptions()
+        cache_key = self._cache_key(url, options)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            yield "result", AnalysisResult(**cached)
+            return
+        
+        previous = await load_previous() if load_previous is not None else None
+        etag = previous.etag if previous is not None else None
+        last_modified = previous.last_modified if previous is not None else None
+        
+        async with self.open_url(url, etag, last_modified) as response:
+            if response.status_code == 304:
+                result = AnalysisResult(
+                    previous.top_words,
+                    response.headers.get('etag', etag),
+                    response.headers.get('last-modified', last_modified),
+                    revalidated=True,
+                    top_ngrams=previous.top_ngrams
+                )
+                await self._cache_result(cache_key, result)
+                yield "result", result
+                return
+            
+            content_length = response.headers.get('content-length')
+            total = int(content_length) if content_length else None
+            buffer = self._body_buffer(response)
+            reported = 0
+            async for downloaded in self._read_body(response, buffer):
+                if downloaded - reported >= PROGRESS_BYTES:
+                    reported = downloaded
+                    yield "download", {"bytes": downloaded, "total": total, "complete": False}
+            yield "download", {"bytes": len(buffer), "total": total, "complete": True}
+            html_content = decode_body(buffer, response.charset_encoding)
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+        del buffer
+        
+        if self._executor is not None:
+            text = await self._executor.run(_parse_in_worker, html_content)
+        else:
+            text = self.parse_content(html_content)
+        del html_content
+        yield "parsed", {"characters": len(text)}
+        
+        # Count in small pieces so snapshots can be sent between them
+        counter = options.create_counter(self.stop_words)
+        next_snapshot = snapshot_tokens
+        for piece in iter_text_chunks(text, SNAPSHOT_SCAN_CHARS):
+            counter.update(piece)
+            if counter.tokens >= next_snapshot:
+                next_snapshot = counter.tokens + snapshot_tokens
+                yield "snapshot", {"tokens": counter.tokens, "top_words": counter.top_words(options.top_n)}
+        if not counter.has_words():
+            raise ValidationError("No meaningful words found for analysis after filtering")
+        
+        result = AnalysisResult(etag=etag, last_modified=last_modified, **options.summarize(counter))
+        await self._cache_result(cache_key, result)
+        yield "result", result
@@ -0,0 +1,135 @@
+"""
+Word frequency counting engine.
+Text is scanned in bounded chunks and counted without building full-text
+word lists; stop words are dropped before counting, so they never enter the
+counter, and the top N are selected with a bounded heap. Unigrams and
+n-grams are counted from the same token scan.
+"""
+
+import heapq
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import filterfalse
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Pattern, Set, Tuple
+from app.core.errors import ValidationError
+
+DEFAULT_MIN_WORD_LENGTH = 3
+
+@lru_cache(maxsize=None)
+def word_pattern(min_word_length: int = DEFAULT_MIN_WORD_LENGTH) -> Pattern[str]:
+    """Compiled pattern matching whole ASCII words of at least ``min_word_length`` letters."""
+    return re.compile(r'\b[a-zA-Z]{%d,}\b' % min_word_length)
+
+WORD_PATTERN = word_pattern()
+_WHITESPACE = re.compile(r'\s')
+
+# Characters scanned per step; bounds the size of the temporary word list
+SCAN_CHUNK_CHARS = 64 * 1024
+
+def iter_text_chunks(text: str, size: int = SCAN_CHUNK_CHARS) -> Iterator[str]:
+    """Split ``text`` into pieces of about ``size`` characters, only at whitespace."""
+    length = len(text)
+    start = 0
+    while start < length:
+        end = start + size
+        if end < length:
+            # Whitespace is never part of a word, so it is a safe place to split
+            match = _WHITESPACE.search(text, end)
+            end = match.start() if match else length
+        yield text[start:end]
+        start = end
+
+class WordCounter:
+    """Running count of words, and optionally n-grams, over one or more pieces of text.
+
+    N-grams are runs of ``ngram_size`` consecutive tokens, none of which is a
+    stop word; they continue across ``update`` calls.
+    """
+
+    def __init__(self, stop_words: Set[str], min_word_length: int = DEFAULT_MIN_WORD_LENGTH, ngram_size: int = 1):
+        self.stop_words = stop_words
+        self.ngram_size = ngram_size
+        self.counts: Counter = Counter()
+        self.ngram_counts: Counter = Counter()
+        self.tokens = 0
+        self._pattern = word_pattern(min_word_length)
+        # Last ngram_size - 1 tokens, so n-grams span chunk boundaries
+        self._previous: List[str] = []
+
+    def update(self, text: str) -> None:
+        """Count the words of ``text``.
+
+        Callers feeding a document in pieces must split it between words.
+        """
+        for chunk in iter_text_chunks(text):
+            words = self._pattern.findall(chunk.lower())
+            self.tokens += len(words)
+            # Counter.update counts an iterable in C; stop words are filtered on the way in
+            self.counts.update(filterfalse(self.stop_words.__contains__, words))
+            if self.ngram_size > 1 and words:
+                self._count_ngrams(words)
+
+    def _count_ngrams(self, words: List[str]) -> None:
+        size = self.ngram_size
+        stop_words = self.stop_words
+        tokens = self._previous + words
+        self.ngram_counts.update(
+            " ".join(gram)
+            for gram in zip(*(tokens[i:] for i in range(size)))
+            if not any(word in stop_words for word in gram)
+        )
+        self._previous = tokens[-(size - 1):]
+
+    def most_common(self, top_n: int) -> List[Tuple[str, int]]:
+        """Return the ``top_n`` most frequent ``(word, count)`` pairs.
+
+        Ties keep first-seen order, like ``Counter.most_common``.
+        """
+        return heapq.nlargest(top_n, self.counts.items(), key=itemgetter(1))
+
+    def has_words(self) -> bool:
+        """Whether any non-stopword has been counted."""
+        return bool(self.counts)
+
+    def top_words(self, top_n: int) -> List[Dict[str, any]]:
+        """Return the ``top_n`` most frequent words as ``{"word", "count"}`` dicts."""
+        return [{"word": word, "count": count} for word, count in self.most_common(top_n)]
+
+    def top_ngrams(self, top_n: int) -> List[Dict[str, any]]:
+        """Return the ``top_n`` most frequent n-grams as ``{"word", "count"}`` dicts."""
+        return [
+            {"word": gram, "count": count}
+            for gram, count in heapq.nlargest(top_n, self.ngram_counts.items(), key=itemgetter(1))
+        ]
+
+@dataclass(frozen=True)
+class AnalysisOptions:
+    """Per-request options controlling what is counted and how much is returned."""
+    top_n: int = 5
+    ngram_size: int = 1
+    min_word_length: int = DEFAULT_MIN_WORD_LENGTH
+
+    def __post_init__(self):
+        if self.top_n <= 0:
+            raise ValidationError("top_n must be a positive integer")
+        if self.ngram_size <= 0:
+            raise ValidationError("ngram_size must be a positive integer")
+        if self.min_word_length <= 0:
+            raise ValidationError("min_word_length must be a positive integer")
+
+    def cache_key(self) -> str:
+        """Stable string identifying these options, for result cache keys."""
+        return f"top_n={self.top_n}|ngram={self.ngram_size}|min_len={self.min_word_length}"
+
+    def create_counter(self, stop_words: Set[str]) -> WordCounter:
+        return WordCounter(stop_words, self.min_word_length, self.ngram_size)
+
+    def summarize(self, counter: WordCounter) -> Dict[str, Optional[List[Dict[str, any]]]]:
+        """Return the top words, and top n-grams when requested, of a filled counter."""
+        return {
+            "top_words": counter.top_words(self.top_n),
+            "top_ngrams": counter.top_ngrams(self.top_n) if self.ngram_size > 1 else None
+        }
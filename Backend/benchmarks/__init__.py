@@ -0,0 +1,40 @@
+"""
+Benchmarks of the analysis pipeline and API, run from the Backend directory:
+
+    python -m benchmarks.bench_extractors
+
+Everything runs locally; see benchmarks/README.md for what each one measures.
+"""
+
+import asyncio
+import os
+import socket
+import time
+from typing import Iterable
+import httpx
+
+# Settings are validated when the app is imported; a benchmark needs no real secret
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-of-at-least-32-characters")
+
+def percentile(samples: Iterable[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``, e.g. ``fraction=0.99`` for p99."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+def free_port() -> int:
+    """A local TCP port nothing listens on, for an API server started by a benchmark."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    """Wait until the API behind ``client`` answers requests."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
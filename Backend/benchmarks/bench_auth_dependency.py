@@ -0,0 +1,64 @@
+"""
+Measure the per-request cost of the authentication dependency.
+
+Calls ``verify_token`` and ``get_current_user`` with the same bearer token
+for a user already in the principal cache, with the verified token cache
+enabled and disabled (``ACCESS_TOKEN_CACHE_MAX_ENTRIES=0`` behaviour). No
+database is touched, so the numbers are the CPU cost of authenticating a
+request.
+
+    python -m benchmarks.bench_auth_dependency
+    python -m benchmarks.bench_auth_dependency --calls 100000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.cache import TTLCache
+from app.services.auth import auth, principals
+from app.services.auth.dependencies import get_current_user
+
+USERNAME = "bench"
+
+async def per_call(call: Callable[[], Awaitable[object]], calls: int) -> float:
+    for _ in range(min(calls, 100)):
+        await call()
+    started = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return (time.perf_counter() - started) / calls
+
+async def run(calls: int) -> None:
+    token = auth.create_access_token({"sub": USERNAME}, timedelta(minutes=15))
+    principals._principals.set(USERNAME, principals.Principal(1, USERNAME, "bench@example.com", datetime.now(timezone.utc)))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def verify() -> object:
+        return auth.verify_token(token)
+
+    async def dependency() -> object:
+        # A cached principal means the session is never used
+        return await get_current_user(credentials, None)
+
+    token_cache = auth._verified_tokens or TTLCache(max_entries=1000, ttl=0)
+    print(f"{'call':<20}{'token cache':>13}{'us/call':>10}")
+    for name, call in (("verify_token", verify), ("get_current_user", dependency)):
+        for cached in (False, True):
+            auth._verified_tokens = token_cache if cached else None
+            token_cache.clear()
+            seconds = await per_call(call, calls)
+            print(f"{name:<20}{'on' if cached else 'off':>13}{seconds * 1e6:10.1f}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="Timed calls per case (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    asyncio.run(run(args.calls))
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,84 @@
+"""
+Measure reading response bodies of 100 KB, 1 MB and 5 MB from a local server.
+
+Compares the service's reader, which collects raw bytes into a buffer
+preallocated from Content-Length and decodes once, with the previous
+approach of concatenating decoded text chunks and re-encoding each one to
+count bytes. Bodies are served with and without a Content-Length. Reports
+the best time of several reads and the peak memory allocated by one read.
+
+    python -m benchmarks.bench_body_reader
+    python -m benchmarks.bench_body_reader --sizes 102400 10485760 --repeat 10
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List, Optional
+from app.core.environment import CHUNK_SIZE, MAX_CONTENT_SIZE
+from app.core.errors import ValidationError
+from app.services.url_analyzer import UrlAnalyzerService
+from benchmarks.stub_server import StubServer, html_page
+
+DEFAULT_SIZES = [100 * 1024, 1024 * 1024, 5 * 1024 * 1024]
+
+async def read_buffered(analyzer: UrlAnalyzerService, url: str) -> str:
+    return (await analyzer.fetch_url_content(url)).content
+
+async def read_concatenated(analyzer: UrlAnalyzerService, url: str) -> str:
+    # The previous reader: decoded chunks appended to a str, each re-encoded to count its bytes
+    async with analyzer.open_url(url) as response:
+        content = ""
+        downloaded = 0
+        async for chunk in response.aiter_text(chunk_size=CHUNK_SIZE):
+            downloaded += len(chunk.encode("utf-8"))
+            if downloaded > MAX_CONTENT_SIZE:
+                raise ValidationError("Content size exceeds maximum allowed size")
+            content += chunk
+        return content
+
+READERS = {"buffer": read_buffered, "concatenate": read_concatenated}
+
+async def measure(read: Callable[[UrlAnalyzerService, str], Awaitable[str]], url: str, repeat: int):
+    analyzer = UrlAnalyzerService(execution_mode="inline")
+    try:
+        # The first read opens the pooled connection
+        expected = len(await read(analyzer, url))
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await read(analyzer, url)
+            best = min(best, time.perf_counter() - started)
+        tracemalloc.start()
+        content = await read(analyzer, url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(content) == expected
+        return best, peak
+    finally:
+        await analyzer.aclose()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Body sizes in bytes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed reads per case, best is reported (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    if max(args.sizes) > MAX_CONTENT_SIZE:
+        print(f"note: bodies over MAX_CONTENT_SIZE ({MAX_CONTENT_SIZE} bytes) are rejected")
+    print(f"{'size':>10}{'length':>9}{'reader':>13}{'ms':>9}{'peak MB':>9}{'peak/body':>11}")
+    for size in args.sizes:
+        body = html_page(size)
+        for content_length in (True, False):
+            with StubServer(body=body, content_length=content_length) as stub:
+                for name, read in READERS.items():
+                    best, peak = asyncio.run(measure(read, stub.url(), args.repeat))
+                    print(
+                        f"{len(body) / 1024:>8.0f}KB{'yes' if content_length else 'no':>9}{name:>13}"
+                        f"{best * 1000:9.1f}{peak / 2**20:9.1f}{peak / len(body):10.1f}x"
+                    )
+
+if __name__ == "__main__":
+    main(parse_args())
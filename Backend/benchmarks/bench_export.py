@@ -0,0 +1,154 @@
+"""
+Measure streaming history exports of large synthetic histories.
+
+Fills a temporary SQLite database with N analyses, starts the API under
+uvicorn and downloads GET /urls/history/export as NDJSON, gzip-compressed
+NDJSON and CSV, then resumes an NDJSON export from the cursor of the
+middle record. Every case runs against a fresh server process, so the
+peak RSS (VmHWM) reported for it is that export's alone; it should not
+grow with the row count. Peak RSS needs Linux's /proc.
+
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --rows 100000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+import httpx
+from sqlalchemy import create_engine
+from app.core.database import Base
+from app.core.pagination import encode_cursor
+from app.services.auth.auth import create_access_token
+from benchmarks import free_port, wait_until_up
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+EXPORT = "/api/v1/urls/history/export"
+USERS = 10
+STARTED = datetime(2026, 1, 1)
+BATCH_SIZE = 50000
+
+def analyzed_at(analysis_id: int) -> datetime:
+    return STARTED + timedelta(seconds=analysis_id)
+
+def build_database(path: str, rows: int, seed: int) -> None:
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    rnd = random.Random(seed)
+    vocabulary = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9))) for _ in range(5000)]
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        "INSERT INTO users (id, username, email, hashed_password) VALUES (?, ?, ?, '')",
+        [(user_id, f"user{user_id}", f"user{user_id}@example.com") for user_id in range(1, USERS + 1)]
+    )
+    for start in range(1, rows + 1, BATCH_SIZE):
+        analyses = []
+        for analysis_id in range(start, min(rows, start + BATCH_SIZE - 1) + 1):
+            top_words = [{"word": word, "count": 10 - rank} for rank, word in enumerate(rnd.sample(vocabulary, 10))]
+            analyses.append((
+                analysis_id,
+                f"https://example.com/articles/{analysis_id}",
+                json.dumps(top_words),
+                analysis_id % USERS + 1,
+                analyzed_at(analysis_id).isoformat(" ", "microseconds")
+            ))
+        connection.executemany("INSERT INTO url_analyses (id, url, top_words, user_id, analyzed_at) VALUES (?, ?, ?, ?, ?)", analyses)
+        connection.commit()
+    connection.close()
+
+def start_api(path: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", ANALYSIS_EXECUTION_MODE="inline")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+def peak_rss(pid: int) -> Optional[float]:
+    """Peak resident set size of a process in MB, or ``None`` without /proc."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+async def download(client: httpx.AsyncClient, params: dict, compress: bool) -> Tuple[int, int]:
+    """Stream one export and return the bytes received and the records in it."""
+    headers = {"Accept-Encoding": "gzip" if compress else "identity"}
+    decompressor = zlib.decompressobj(wbits=31) if compress else None
+    received = lines = 0
+    async with client.stream("GET", EXPORT, params=params, headers=headers) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            received += len(chunk)
+            lines += (decompressor.decompress(chunk) if decompressor else chunk).count(b"\n")
+    # A CSV export starts with a header line
+    return received, lines - (params.get("format") == "csv")
+
+async def export(server: subprocess.Popen, port: int, params: dict, compress: bool) -> Tuple[int, int, float, Optional[float]]:
+    """Download one export; returns bytes, records, seconds and the peak RSS before it started."""
+    token = create_access_token({"sub": "user1"})
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", timeout=None, headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        await wait_until_up(client)
+        startup_rss = peak_rss(server.pid)
+        started = time.perf_counter()
+        received, records = await download(client, params, compress)
+        return received, records, time.perf_counter() - started, startup_rss
+
+def run_case(path: str, params: dict, compress: bool) -> Tuple[int, int, float, Optional[float], Optional[float]]:
+    port = free_port()
+    server = start_api(path, port)
+    try:
+        received, records, seconds, startup_rss = asyncio.run(export(server, port, params, compress))
+        return received, records, seconds, startup_rss, peak_rss(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 200000], help="History sizes to export (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the generated words (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    def megabytes(value: Optional[float]) -> str:
+        return f"{value:10.1f}" if value is not None else f"{'n/a':>10}"
+
+    print(f"{'rows':>9}  {'export':<12}{'records':>9}{'MB':>8}{'seconds':>9}{'rows/s':>9}{'start RSS':>10}{'peak RSS':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="bench-export-") as directory:
+            path = os.path.join(directory, "export.db")
+            build_database(path, rows, args.seed)
+            # Records come newest first, so the middle one has this id
+            middle = rows - rows // 2
+            cases = [
+                ("ndjson", {}, False),
+                ("ndjson+gzip", {}, True),
+                ("csv", {"format": "csv"}, False),
+                ("resume", {"cursor": encode_cursor(analyzed_at(middle), middle)}, False),
+            ]
+            for name, params, compress in cases:
+                received, records, seconds, startup_rss, peak = run_case(path, params, compress)
+                print(
+                    f"{rows:>9}  {name:<12}{records:>9}{received / 2**20:8.1f}{seconds:9.1f}{records / seconds:9.0f}"
+                    f"{megabytes(startup_rss)}{megabytes(peak)}"
+                )
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,92 @@
+"""
+Compare the HTML text extraction backends on a fixed local corpus.
+
+The corpus is the saved pages of the test suite plus generated article
+pages, or the .html files of a directory. Reports throughput per backend
+and the pages whose analysis differs from html.parser's.
+
+    python -m benchmarks.bench_extractors --pages 300
+    python -m benchmarks.bench_extractors --corpus saved-pages/
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+from app.services.text_extractors import EXTRACTORS, HtmlParserExtractor, create_text_extractor
+from app.services.url_analyzer import UrlAnalyzerService
+from app.services.word_counter import AnalysisOptions
+
+SAVED_PAGES = Path(__file__).resolve().parent.parent / "tests" / "data" / "pages"
+
+VOCABULARY = (
+    "python profiling latency request database cursor pagination stream export memory "
+    "process worker parser document corpus network server client cache index query "
+    "throughput benchmark allocation response header template annotation"
+).split()
+
+def generated_page(rng: random.Random, paragraphs: int) -> str:
+    """An article-like page with the non-content markup real pages carry."""
+    body = "".join(
+        f"<p>{' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(40, 120)))}"
+        f" <a href='/p{i}'>link {rng.choice(VOCABULARY)}</a> &amp; caf&eacute;.</p>\n"
+        f"<script>track({i});</script>\n"
+        for i in range(paragraphs)
+    )
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Generated article</title>\n"
+        "<style>p { margin: 0 }</style></head><body>\n"
+        "<header><nav><a href='/'>home</a> <a href='/archive'>archive</a></nav></header>\n"
+        f"<main><article><h1>{rng.choice(VOCABULARY)}</h1>\n{body}</article></main>\n"
+        "<footer>footer links</footer></body></html>\n"
+    )
+
+def load_corpus(corpus: Optional[Path], pages: int, seed: int) -> List[Tuple[str, str]]:
+    if corpus is not None:
+        return [(str(path), path.read_text(encoding="utf-8", errors="replace")) for path in sorted(corpus.rglob("*.html"))]
+    documents = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(SAVED_PAGES.glob("*.html"))]
+    rng = random.Random(seed)
+    # Mostly small pages with a long tail of large ones, like a crawl
+    for i in range(pages):
+        documents.append((f"generated-{i}", generated_page(rng, rng.choice([5, 10, 20, 40, 400]))))
+    return documents
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="Directory of .html files to use instead of the generated corpus")
+    parser.add_argument("--pages", type=int, default=200, help="Generated pages (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the generated corpus (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per backend, best is reported (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    documents = load_corpus(args.corpus, args.pages, args.seed)
+    megabytes = sum(len(html.encode()) for _, html in documents) / 2**20
+    print(f"{len(documents)} documents, {megabytes:.1f} MB")
+
+    options = AnalysisOptions(top_n=20, ngram_size=2)
+    reference = None
+    baseline = None
+    print(f"{'backend':<12}{'seconds':>9}{'MB/s':>9}{'speedup':>9}{'differing':>11}")
+    for name in [HtmlParserExtractor.name] + [name for name in EXTRACTORS if name != HtmlParserExtractor.name]:
+        if not EXTRACTORS[name].is_available():
+            print(f"{name:<12}{'not installed':>27}")
+            continue
+        analyzer = UrlAnalyzerService(execution_mode="inline", extractor=create_text_extractor(name))
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for _, html in documents:
+                analyzer.parse_content(html)
+            best = min(best, time.perf_counter() - started)
+        results = [analyzer.analyze_content(html, options) for _, html in documents]
+        if reference is None:
+            reference, baseline = results, best
+        differing = [path for (path, _), result, expected in zip(documents, results, reference) if result != expected]
+        print(f"{name:<12}{best:9.3f}{megabytes / best:9.1f}{baseline / best:8.1f}x{len(differing):>11}")
+        for path in differing[:5]:
+            print(f"    differs: {path}")
+
+if __name__ == "__main__":
+    main(parse_args())
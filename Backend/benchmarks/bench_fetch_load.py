@@ -0,0 +1,75 @@
+"""
+Measure concurrent URL analysis throughput against a slow local site.
+
+A local stub server answers every request after a fixed delay. The same
+number of analyses is run through the async fetch path, which shares a
+pooled HTTP client, and through a blocking fetch on the event loop, which
+is how the service fetched pages before (``--mode blocking``). All pages
+come from one host, so the async path uses at most
+HTTP_MAX_CONNECTIONS_PER_HOST connections.
+
+    python -m benchmarks.bench_fetch_load
+    python -m benchmarks.bench_fetch_load --requests 500 --concurrency 100 --delay 0.2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+import httpx
+from app.core.environment import REQUEST_TIMEOUT
+from app.services.analysis_cache import AnalysisCache
+from app.services.url_analyzer import UrlAnalyzerService
+from benchmarks import percentile
+from benchmarks.stub_server import StubServer
+
+async def run_async(analyzer: UrlAnalyzerService, url: str) -> None:
+    await analyzer.analyze_url(url)
+
+async def run_blocking(analyzer: UrlAnalyzerService, url: str) -> None:
+    # The previous fetch path: a synchronous request made on the event loop thread
+    response = httpx.get(url, timeout=REQUEST_TIMEOUT)
+    analyzer.analyze_content(response.text)
+
+async def load(mode: str, stub: StubServer, requests: int, concurrency: int) -> None:
+    # No result cache, and a distinct URL per request so nothing is coalesced
+    analyzer = UrlAnalyzerService(execution_mode="inline", cache=AnalysisCache())
+    run = run_async if mode == "async" else run_blocking
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await run(analyzer, stub.url(f"/page/{mode}/{i}"))
+            latencies.append(time.perf_counter() - started)
+
+    connections = stub.connections
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await analyzer.aclose()
+    print(
+        f"{mode:<10}{elapsed:9.2f}{requests / elapsed:10.1f}"
+        f"{percentile(latencies, 0.5) * 1000:9.0f}{percentile(latencies, 0.99) * 1000:9.0f}"
+        f"{stub.connections - connections:>13}"
+    )
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=["async", "blocking", "both"], default="both", help="Fetch path to measure (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=200, help="Analyses per mode (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Analyses in flight at once (default: %(default)s)")
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds the stub site takes per response (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    modes = ["blocking", "async"] if args.mode == "both" else [args.mode]
+    print(f"{args.requests} analyses, {args.concurrency} concurrent, site delay {args.delay * 1000:.0f} ms")
+    print(f"{'mode':<10}{'seconds':>9}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'connections':>13}")
+    with StubServer(delay=args.delay) as stub:
+        for mode in modes:
+            asyncio.run(load(mode, stub, args.requests, args.concurrency))
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,111 @@
+"""
+Measure login and analysis latency while a burst of logins hits the API.
+
+Starts the API under uvicorn with a throwaway SQLite database, registers a
+user, then fires concurrent logins while one client keeps analyzing pages
+from a local stub server. Reports p50 and p99 latency of both endpoints and
+failed requests. bcrypt runs on the password hash pool, so logins queue
+behind PASSWORD_HASH_WORKERS while analyses should stay fast.
+
+    python -m benchmarks.bench_login_burst
+    python -m benchmarks.bench_login_burst --logins 100 --rounds 10 --hash-workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+import httpx
+from benchmarks import free_port, percentile, wait_until_up
+from benchmarks.stub_server import StubServer
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+USER = {"username": "bench", "email": "bench@example.com", "password": "bench-password"}
+
+def start_api(database_dir: str, port: int, args: argparse.Namespace) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(database_dir, 'bench.db')}",
+        BCRYPT_ROUNDS=str(args.rounds),
+        PASSWORD_HASH_WORKERS=str(args.hash_workers),
+        ANALYSIS_EXECUTION_MODE="inline",
+        ANALYSIS_CACHE_BACKEND="none",
+        LOGIN_RATE_LIMIT="0",
+    )
+    # The schema is created up front, the way a deployment runs its migrations
+    subprocess.run(
+        [sys.executable, "-c", "import app.models; from app.core.database import Base, engine; Base.metadata.create_all(engine)"],
+        cwd=BACKEND_DIR, env=env, check=True
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+async def burst(port: int, stub: StubServer, args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300) as client:
+        await wait_until_up(client)
+        await client.post("/api/v1/auth/register", json=USER)
+        login = {"username": USER["username"], "password": USER["password"]}
+        token = (await client.post("/api/v1/auth/login", json=login)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        logins: List[float] = []
+        analyses: List[float] = []
+        failures: List[int] = []
+
+        async def one_login() -> None:
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", json=login)
+            logins.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures.append(response.status_code)
+
+        async def keep_analyzing() -> None:
+            for i in range(args.analyses):
+                started = time.perf_counter()
+                response = await client.post("/api/v1/urls/analyze", json={"url": stub.url(f"/page/{i}")}, headers=headers)
+                analyses.append(time.perf_counter() - started)
+                if response.status_code != 201:
+                    failures.append(response.status_code)
+                await asyncio.sleep(args.interval)
+
+        started = time.perf_counter()
+        await asyncio.gather(keep_analyzing(), *(one_login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - started
+
+    print(f"{args.logins} logins, {args.analyses} analyses, bcrypt rounds {args.rounds}, {args.hash_workers} hash workers")
+    print(f"{'endpoint':<10}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, latencies in (("login", logins), ("analyze", analyses)):
+        print(
+            f"{name:<10}{len(latencies):>7}"
+            f"{percentile(latencies, 0.5) * 1000:9.0f}{percentile(latencies, 0.99) * 1000:9.0f}"
+        )
+    print(f"{len(failures)} failed requests, {elapsed:.1f} s total")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40, help="Concurrent logins in the burst (default: %(default)s)")
+    parser.add_argument("--analyses", type=int, default=30, help="Analyses made one after another during the burst (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between analyses (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS for the API (default: %(default)s)")
+    parser.add_argument("--hash-workers", type=int, default=2, help="PASSWORD_HASH_WORKERS for the API (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-login-") as database_dir, StubServer() as stub:
+        server = start_api(database_dir, port, args)
+        try:
+            asyncio.run(burst(port, stub, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,126 @@
+"""
+Measure word search over stored analyses, index lookup vs JSON scan.
+
+Fills a temporary SQLite database with analyses whose top words follow a
+Zipf-like distribution, then runs the same searches the /urls/search
+endpoint runs through the ``analysis_words`` index, and the same searches
+done by loading every stored ``top_words`` blob and filtering in Python.
+Both return the match count and the first page, newest first, and are
+checked to agree.
+
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import create_engine, desc, func, select
+from sqlalchemy.orm import Session
+from app.core.database import Base
+from app.models import UrlAnalysis
+from app.services.analysis_store import matching_analysis_ids
+
+PAGE_SIZE = 10
+VOCABULARY_SIZE = 50000
+BATCH_SIZE = 50000
+
+def build_database(path: str, rows: int, seed: int) -> None:
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    rnd = random.Random(seed)
+    vocabulary = list(dict.fromkeys(
+        "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9))) for _ in range(VOCABULARY_SIZE)
+    ))
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    started = datetime(2026, 1, 1)
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'bench', 'bench@example.com', '')")
+    for start in range(1, rows + 1, BATCH_SIZE):
+        analyses = []
+        words = []
+        for analysis_id in range(start, min(rows, start + BATCH_SIZE - 1) + 1):
+            top = list(dict.fromkeys(rnd.choices(vocabulary, cum_weights=weights, k=6)))[:5]
+            top_words = [{"word": word, "count": 10 - rank} for rank, word in enumerate(top)]
+            analyzed_at = (started + timedelta(seconds=analysis_id)).isoformat(" ", "microseconds")
+            analyses.append((analysis_id, f"https://example.com/{analysis_id}", json.dumps(top_words), 1, analyzed_at))
+            words.extend((analysis_id, entry["word"], entry["count"]) for entry in top_words)
+        connection.executemany("INSERT INTO url_analyses (id, url, top_words, user_id, analyzed_at) VALUES (?, ?, ?, ?, ?)", analyses)
+        connection.executemany("INSERT INTO analysis_words (analysis_id, word, count) VALUES (?, ?, ?)", words)
+        connection.commit()
+    connection.close()
+
+def index_search(session: Session, terms: List[str], match_all: bool, prefix: bool) -> Tuple[int, List[int]]:
+    query = select(UrlAnalysis.id).where(UrlAnalysis.id.in_(matching_analysis_ids(terms, match_all, prefix)))
+    total = session.scalar(select(func.count()).select_from(query.subquery()))
+    page = session.scalars(query.order_by(desc(UrlAnalysis.analyzed_at), desc(UrlAnalysis.id)).limit(PAGE_SIZE)).all()
+    return total, list(page)
+
+def json_scan(connection: sqlite3.Connection, terms: List[str], match_all: bool, prefix: bool) -> Tuple[int, List[int]]:
+    # Every stored top_words blob is loaded and filtered in Python
+    combine = all if match_all else any
+    hits = []
+    for analysis_id, analyzed_at, top_words in connection.execute("SELECT id, analyzed_at, top_words FROM url_analyses"):
+        words = {entry["word"] for entry in json.loads(top_words)}
+        if prefix:
+            matched = combine(any(word.startswith(term) for word in words) for term in terms)
+        else:
+            matched = combine(term in words for term in terms)
+        if matched:
+            hits.append((analyzed_at, analysis_id))
+    hits.sort(reverse=True)
+    return len(hits), [analysis_id for _, analysis_id in hits[:PAGE_SIZE]]
+
+def timed(search, *args) -> Tuple[float, Tuple[int, List[int]]]:
+    started = time.perf_counter()
+    result = search(*args)
+    return time.perf_counter() - started, result
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="Stored analyses (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the generated words (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="bench-search-") as directory:
+        path = os.path.join(directory, "search.db")
+        started = time.perf_counter()
+        build_database(path, args.rows, args.seed)
+        print(f"{args.rows} analyses built in {time.perf_counter() - started:.1f} s")
+
+        connection = sqlite3.connect(path)
+        ranked = [word for (word,) in connection.execute(
+            "SELECT word FROM analysis_words GROUP BY word ORDER BY count(*) DESC, word LIMIT 2000"
+        )]
+        common, middle, rare = ranked[5], ranked[300], ranked[-1]
+        cases = [
+            ("rare", [rare], True, False),
+            ("middle", [middle], True, False),
+            ("common", [common], True, False),
+            ("all of 2", [common, middle], True, False),
+            ("any of 2", [middle, rare], False, False),
+            ("prefix", [middle[:3]], True, True),
+        ]
+        engine = create_engine(f"sqlite:///{path}")
+        print(f"{'search':<10}{'matches':>9}{'index ms':>10}{'scan ms':>10}{'same':>6}")
+        with Session(engine) as session:
+            for name, terms, match_all, prefix in cases:
+                index_seconds, found = timed(index_search, session, terms, match_all, prefix)
+                scan_seconds, scanned = timed(json_scan, connection, terms, match_all, prefix)
+                print(
+                    f"{name:<10}{found[0]:>9}{index_seconds * 1000:10.1f}{scan_seconds * 1000:10.0f}"
+                    f"{'yes' if found == scanned else 'NO':>6}"
+                )
+        connection.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main(parse_args())
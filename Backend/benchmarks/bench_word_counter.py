@@ -0,0 +1,71 @@
+"""
+Measure word counting throughput and peak allocations from 10k to 10M words.
+
+Text is generated from a Zipf-distributed vocabulary mixed with English stop
+words, like page text. Each size is timed without tracing, then counted
+again under tracemalloc for the peak memory allocated while counting (the
+input text itself is excluded).
+
+    python -m benchmarks.bench_word_counter
+    python -m benchmarks.bench_word_counter --sizes 10000 1000000 --ngram-size 2
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import List, Optional
+from nltk.corpus import stopwords
+from app.services.word_counter import AnalysisOptions
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+def generate_text(words: int, seed: int, vocabulary_size: int = 50_000) -> str:
+    rng = random.Random(seed)
+    stop_words = sorted(stopwords.words("english"))
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 12))) for _ in range(vocabulary_size)]
+    # Zipf-like weights: a few words are very common, most are rare
+    weights = [1 / rank for rank in range(1, vocabulary_size + 1)]
+    # Roughly every third word of running English text is a stop word
+    content = rng.choices(vocabulary, weights, k=words - words // 3)
+    text = content + rng.choices(stop_words, k=words // 3)
+    rng.shuffle(text)
+    lines = (" ".join(text[i:i + 12]) + "." for i in range(0, len(text), 12))
+    return "\n".join(lines)
+
+def count(text: str, options: AnalysisOptions, stop_words: set):
+    counter = options.create_counter(stop_words)
+    counter.update(text)
+    return options.summarize(counter), counter
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Words per run (default: %(default)s)")
+    parser.add_argument("--ngram-size", type=int, default=1, help="Also count phrases of this many words (default: %(default)s)")
+    parser.add_argument("--top-n", type=int, default=5, help="Number of top words selected (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the generated text (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> None:
+    options = AnalysisOptions(top_n=args.top_n, ngram_size=args.ngram_size)
+    stop_words = set(stopwords.words("english"))
+    print(f"{'words':>11}{'MB':>8}{'seconds':>9}{'Mwords/s':>10}{'peak MB':>9}{'distinct':>10}")
+    for size in args.sizes:
+        text = generate_text(size, args.seed)
+        started = time.perf_counter()
+        _, counter = count(text, options, stop_words)
+        elapsed = time.perf_counter() - started
+        distinct = len(counter.counts)
+        del counter
+
+        tracemalloc.start()
+        count(text, options, stop_words)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{size:>11,}{len(text) / 2**20:8.1f}{elapsed:9.3f}{size / elapsed / 1e6:10.2f}"
+            f"{peak / 2**20:9.1f}{distinct:>10,}"
+        )
+
+if __name__ == "__main__":
+    main(parse_args())
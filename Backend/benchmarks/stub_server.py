@@ -0,0 +1,96 @@
+"""
+Local HTTP server standing in for the sites benchmarks analyze.
+
+Every path serves the same page after an optional delay, which plays the
+part of a slow remote site. Connections and requests are counted, so a
+benchmark can tell how many connections its client opened.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+PARAGRAPH = (
+    "<p>Python services analyze pages: every request fetches a page, parses the markup "
+    "and counts words; slow sites must not stall other requests.</p>\n"
+)
+
+def html_page(size: int) -> bytes:
+    """An HTML page of about ``size`` bytes."""
+    head = b"<!DOCTYPE html><html><head><title>Benchmark page</title></head><body>\n"
+    tail = b"</body></html>\n"
+    repeats = max(1, (size - len(head) - len(tail)) // len(PARAGRAPH))
+    return head + PARAGRAPH.encode() * repeats + tail
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once
+    request_queue_size = 1024
+
+class StubServer:
+    """Threaded HTTP server serving one page on every path."""
+
+    def __init__(
+        self,
+        body: Optional[bytes] = None,
+        delay: float = 0.0,
+        etag: Optional[str] = None,
+        content_length: bool = True
+    ):
+        self.body = body if body is not None else html_page(16 * 1024)
+        self.delay = delay
+        self.etag = etag
+        # Without a Content-Length the body is delimited by closing the connection
+        self.content_length = content_length
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if stub.etag:
+                    self.send_header("ETag", stub.etag)
+                if stub.content_length:
+                    self.send_header("Content-Length", str(len(stub.body)))
+                else:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _Server(("127.0.0.1", 0), Handler)
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def __enter__(self) -> "StubServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,389 @@
+"""
+Analyze a corpus of saved HTML without network access and store the results.
+
+Reads WARC files (plain or gzip-compressed) and directories of saved HTML
+pages, runs every document through the analyzer's parsing and word counting
+on a process pool, and inserts the analyses in batched transactions, owned
+by an existing user.
+
+    python import_corpus.py --user alice crawl.warc.gz pages/
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from email.parser import BytesHeaderParser
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+from sqlalchemy import insert, select
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.environment import ANALYSIS_WORKERS
+from app.core.errors import AppError
+from app.models import UrlAnalysis, User
+from app.services.analysis_store import analysis_values, record_analyses
+from app.services.url_analyzer import AnalysisResult, UrlAnalyzerService, decode_body
+from app.services.word_counter import AnalysisOptions
+
+logger = logging.getLogger("import_corpus")
+
+HTML_SUFFIXES = {".html", ".htm", ".xhtml"}
+WARC_SUFFIXES = (".warc", ".warc.gz")
+
+# Documents sent to a worker per task, so inter-process overhead is paid per chunk
+CHUNK_DOCUMENTS = 32
+
+# Chunks submitted to the pool per worker before waiting for results,
+# which bounds memory whatever the size of the corpus
+IN_FLIGHT_PER_WORKER = 2
+
+@dataclass
+class Document:
+    """One page to analyze.
+
+    Its bytes are either ``length`` bytes at ``offset`` of ``path``, read by
+    the worker through a memory map, or ``content`` when they had to be
+    decompressed by the reader. ``http`` marks a WARC response record,
+    whose bytes are a full HTTP response.
+    """
+    url: str
+    path: Optional[str] = None
+    offset: int = 0
+    length: int = 0
+    content: Optional[bytes] = None
+    http: bool = False
+
+@dataclass
+class DocumentResult:
+    url: str
+    status: str  # analyzed, skipped or failed
+    reason: Optional[str] = None
+    result: Optional[AnalysisResult] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+# --- Reading the corpus ---------------------------------------------------
+
+def iter_warc_records(stream: BinaryIO, keep_content: bool) -> Iterator[Tuple[Dict[str, str], int, int, Optional[bytes]]]:
+    """Yield ``(headers, offset, length, content)`` for each record of a WARC stream.
+
+    Header names are lowercased. The content block is only read when
+    ``keep_content`` is set; otherwise it is skipped over.
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        if not line.strip():
+            # Blank lines separate records
+            continue
+        if not line.startswith(b"WARC/"):
+            raise ValueError(f"Expected a WARC record at offset {stream.tell() - len(line)}")
+        headers: Dict[str, str] = {}
+        for line in iter(stream.readline, b""):
+            if not line.strip():
+                break
+            name, _, value = line.decode("utf-8", errors="replace").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        offset = stream.tell()
+        if keep_content:
+            content = stream.read(length)
+        else:
+            stream.seek(offset + length)
+            content = None
+        yield headers, offset, length, content
+
+def iter_warc_documents(path: Path) -> Iterator[Document]:
+    """Yield the response and resource records of a WARC file.
+
+    Uncompressed files are memory-mapped and only their record offsets are
+    handed to the workers; compressed ones have to be read sequentially.
+    """
+    compressed = path.name.endswith(".gz")
+    with open(path, "rb") as f:
+        if compressed:
+            stream = gzip.GzipFile(fileobj=f)
+        elif os.fstat(f.fileno()).st_size:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            return
+        with stream:
+            for headers, offset, length, content in iter_warc_records(stream, keep_content=compressed):
+                record_type = headers.get("warc-type")
+                url = headers.get("warc-target-uri", "").strip("<>")
+                if record_type not in ("response", "resource") or not url or not length:
+                    continue
+                if record_type == "resource" and "html" not in headers.get("content-type", "html"):
+                    continue
+                yield Document(
+                    url=url,
+                    path=None if compressed else str(path),
+                    offset=offset,
+                    length=length,
+                    content=content,
+                    http=record_type == "response"
+                )
+
+def iter_documents(paths: List[Path], base_url: Optional[str]) -> Iterator[Document]:
+    """Yield the documents of WARC files and saved HTML pages under ``paths``.
+
+    Saved pages get their ``file://`` URI as URL, or their path relative to
+    the given directory appended to ``base_url``.
+    """
+    for root in paths:
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for path in files:
+            name = path.name.lower()
+            if name.endswith(WARC_SUFFIXES):
+                yield from iter_warc_documents(path)
+            elif path.suffix.lower() in HTML_SUFFIXES:
+                size = path.stat().st_size
+                if not size:
+                    continue
+                if base_url and root.is_dir():
+                    url = urljoin(base_url, path.relative_to(root).as_posix())
+                else:
+                    url = path.resolve().as_uri()
+                yield Document(url=url, path=str(path), length=size)
+
+# --- Analysis, in the worker processes -------------------------------------
+
+_worker_analyzer: Optional[UrlAnalyzerService] = None
+_worker_options: Optional[AnalysisOptions] = None
+# Memory map of the file the previous document came from; records of one
+# WARC file usually follow each other
+_worker_map: Optional[Tuple[str, mmap.mmap]] = None
+
+def _init_worker(stop_words: List[str], options: AnalysisOptions) -> None:
+    global _worker_analyzer, _worker_options
+    _worker_analyzer = UrlAnalyzerService(stop_words=stop_words, execution_mode="inline")
+    _worker_options = options
+
+def _read_mapped(path: str, offset: int, length: int) -> bytes:
+    global _worker_map
+    if _worker_map is None or _worker_map[0] != path:
+        if _worker_map is not None:
+            _worker_map[1].close()
+        with open(path, "rb") as f:
+            _worker_map = (path, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return _worker_map[1][offset:offset + length]
+
+def _dechunk(body: bytes) -> bytes:
+    """Decode an HTTP body sent with ``Transfer-Encoding: chunked``."""
+    parts = []
+    position = 0
+    while True:
+        line_end = body.index(b"\r\n", position)
+        size = int(body[position:line_end].split(b";", 1)[0], 16)
+        if not size:
+            return b"".join(parts)
+        start = line_end + 2
+        parts.append(body[start:start + size])
+        position = start + size + 2
+
+def _http_body(message: bytes) -> Tuple[Optional[str], bytes, Dict[str, Optional[str]]]:
+    """Split a recorded HTTP response into a skip reason, its decoded body and its headers."""
+    head, separator, body = message.partition(b"\r\n\r\n")
+    if not separator:
+        return "malformed HTTP response", b"", {}
+    status_line, _, header_lines = head.partition(b"\r\n")
+    status_parts = status_line.split(None, 2)
+    if len(status_parts) < 2 or status_parts[1] != b"200":
+        return f"HTTP status {status_line.decode('latin-1').strip()}", b"", {}
+    headers = BytesHeaderParser().parsebytes(header_lines)
+    content_type = headers.get("content-type", "")
+    if content_type and "html" not in content_type.lower():
+        return f"content type {content_type}", b"", {}
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = _dechunk(body)
+    encoding = headers.get("content-encoding", "identity").lower()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # wbits=47 accepts both gzip and zlib framing
+        body = zlib.decompress(body, 47)
+    elif encoding != "identity":
+        return f"content encoding {encoding}", b"", {}
+    return None, body, {
+        "charset": headers.get_content_charset(),
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified")
+    }
+
+def _analyze_document(document: Document) -> DocumentResult:
+    timings = {}
+    started = time.perf_counter()
+    try:
+        body = document.content
+        if body is None:
+            body = _read_mapped(document.path, document.offset, document.length)
+        http: Dict[str, Optional[str]] = {}
+        if document.http:
+            reason, body, http = _http_body(body)
+            if reason:
+                return DocumentResult(document.url, "skipped", reason)
+        html = decode_body(body, http.get("charset"))
+        timings["read"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        text = _worker_analyzer.parse_content(html)
+        timings["parse"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        summary = _worker_analyzer.count_words(text, _worker_options)
+        timings["count"] = time.perf_counter() - started
+    except AppError as e:
+        return DocumentResult(document.url, "failed", e.message, timings=timings)
+    except Exception as e:
+        return DocumentResult(document.url, "failed", str(e) or type(e).__name__, timings=timings)
+    result = AnalysisResult(
+        summary["top_words"],
+        etag=http.get("etag"),
+        last_modified=http.get("last_modified"),
+        top_ngrams=summary["top_ngrams"]
+    )
+    return DocumentResult(document.url, "analyzed", result=result, timings=timings)
+
+def _analyze_documents(documents: List[Document]) -> List[DocumentResult]:
+    return [_analyze_document(document) for document in documents]
+
+# --- Import -----------------------------------------------------------------
+
+class Importer:
+    """Feeds documents through the process pool and stores their results in batches."""
+
+    def __init__(self, user_id: Optional[int], options: AnalysisOptions, batch_size: int):
+        self.user_id = user_id
+        self.options = options
+        self.options_dict = asdict(options)
+        self.batch_size = batch_size
+        self.counts: Counter = Counter()
+        self.timings: Counter = Counter()
+        self._batch: List[Dict[str, Any]] = []
+
+    async def add(self, result: DocumentResult) -> None:
+        self.counts[result.status] += 1
+        self.timings.update(result.timings)
+        if result.status != "analyzed":
+            logger.debug("%s %s: %s", result.status.capitalize(), result.url, result.reason)
+            return
+        if self.user_id is not None:
+            self._batch.append(analysis_values(result.url, self.user_id, result.result, self.options_dict))
+            if len(self._batch) >= self.batch_size:
+                await self.flush()
+
+    async def flush(self) -> None:
+        """Insert the pending analyses, with their word and summary rows, in one transaction."""
+        if not self._batch:
+            return
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            analyses = (await db.scalars(
+                insert(UrlAnalysis).returning(UrlAnalysis, sort_by_parameter_order=True),
+                self._batch
+            )).all()
+            await record_analyses(db, analyses)
+            await db.commit()
+        self.counts["stored"] += len(self._batch)
+        self._batch = []
+        self.timings["insert"] += time.perf_counter() - started
+
+    async def run(self, documents: Iterator[Document], workers: int) -> None:
+        stop_words = sorted(UrlAnalyzerService(execution_mode="inline").stop_words)
+        max_in_flight = workers * IN_FLIGHT_PER_WORKER
+        documents = iter(documents)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(stop_words, self.options)
+        ) as pool:
+            pending: set = set()
+            while True:
+                started = time.perf_counter()
+                chunk = list(islice(documents, CHUNK_DOCUMENTS))
+                self.timings["scan"] += time.perf_counter() - started
+                if chunk:
+                    pending.add(asyncio.wrap_future(pool.submit(_analyze_documents, chunk)))
+                if not pending:
+                    break
+                if chunk and len(pending) < max_in_flight:
+                    continue
+                # Workers carry on with the queued chunks while results are inserted
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        await self.add(result)
+        await self.flush()
+
+def report(importer: Importer, elapsed: float, workers: int) -> None:
+    counts, timings = importer.counts, importer.timings
+    documents = counts["analyzed"] + counts["skipped"] + counts["failed"]
+    print(
+        f"{documents} documents in {elapsed:.2f}s ({documents / elapsed if elapsed else 0:.1f} documents/s): "
+        f"{counts['analyzed']} analyzed, {counts['skipped']} skipped, {counts['failed']} failed, "
+        f"{counts['stored']} stored"
+    )
+    print(f"  {'scan':<7}{timings['scan']:9.2f}s  reading the corpus, main process")
+    for stage in ("read", "parse", "count"):
+        print(f"  {stage:<7}{timings[stage]:9.2f}s  total across {workers} worker processes")
+    print(f"  {'insert':<7}{timings['insert']:9.2f}s  database writes")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="WARC files (.warc, .warc.gz) and directories of .html files")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user", help="Username owning the imported analyses")
+    target.add_argument("--dry-run", action="store_true", help="Analyze without storing anything")
+    parser.add_argument("--base-url", help="URL prefix for pages in directories, instead of file:// URIs")
+    parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS, help="Analysis processes (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Analyses inserted per transaction (default: %(default)s)")
+    parser.add_argument("--top-n", type=int, default=5, help="Number of top words stored (default: %(default)s)")
+    parser.add_argument("--ngram-size", type=int, default=1, help="Also count phrases of this many words (default: %(default)s)")
+    parser.add_argument("--min-word-length", type=int, default=3, help="Shortest word counted (default: %(default)s)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every skipped or failed document")
+    args = parser.parse_args(argv)
+    for name in ("workers", "batch_size"):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be a positive integer")
+    for path in args.paths:
+        if not path.exists():
+            parser.error(f"{path} does not exist")
+    return args
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        options = AnalysisOptions(top_n=args.top_n, ngram_size=args.ngram_size, min_word_length=args.min_word_length)
+    except AppError as e:
+        print(f"error: {e.message}", file=sys.stderr)
+        return 2
+    user_id = None
+    try:
+        if args.user:
+            async with AsyncSessionLocal() as db:
+                user_id = await db.scalar(select(User.id).where(User.username == args.user))
+            if user_id is None:
+                print(f"error: no user named {args.user!r}", file=sys.stderr)
+                return 2
+        importer = Importer(user_id, options, args.batch_size)
+        started = time.perf_counter()
+        await importer.run(iter_documents(args.paths, args.base_url), args.workers)
+        report(importer, time.perf_counter() - started, args.workers)
+    finally:
+        await async_engine.dispose()
+    return 0
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if arguments.verbose else logging.INFO)
+    sys.exit(asyncio.run(main(arguments)))
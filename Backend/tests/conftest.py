@@ -0,0 +1,168 @@
+"""
+Shared test fixtures.
+Tests run the API in-process against a throwaway async SQLite database and
+fetch pages from a local stub HTTP server, so no network access is needed.
+"""
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Settings are read when the app is imported, so the test configuration comes first
+_database_dir = tempfile.mkdtemp(prefix="url-analyzer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-that-is-long-enough-for-jwt")
+os.environ["ANALYSIS_EXECUTION_MODE"] = "inline"
+os.environ["ANALYSIS_CACHE_BACKEND"] = "none"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["LOGIN_RATE_LIMIT"] = "0"
+
+import httpx
+import pytest
+from sqlalchemy import event
+from app.core.database import Base, async_engine
+from app.main import app
+from app.routers.v1.urls import url_analyzer
+from app.services.auth import auth, principals
+
+PAGE = (
+    b"<html><head><title>Hello World</title>\n<script>var x = 'ignored';</script></head>\n"
+    b"<body><nav>menu menu</nav>\n<p>Python python programming language. Python rocks; programming fun!</p>\n"
+    b"<footer>footer text</footer></body></html>\n"
+)
+
+class StubServer:
+    """Local HTTP server serving registered pages.
+
+    Pages with an ETag answer a matching ``If-None-Match`` with 304. Requests
+    and body bytes sent are counted so tests can tell what was downloaded.
+    """
+
+    def __init__(self):
+        self.pages: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                page = stub.pages.get(self.path)
+                body, headers = page if page is not None else (b"not found", {})
+                etag = headers.get("ETag")
+                if page is not None and etag and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                else:
+                    status = 200 if page is not None else 404
+                with stub._lock:
+                    stub.requests += 1
+                    stub.bytes_sent += len(body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    def add(self, path: str, body: bytes = PAGE, etag: Optional[str] = None) -> str:
+        """Serve ``body`` at ``path`` and return its URL."""
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if etag:
+            headers["ETag"] = etag
+        self.pages[path] = (body, headers)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+def stub_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+async def database():
+    """Fresh tables for every test, and empty authentication caches."""
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    principals._principals.clear()
+    if auth._verified_tokens is not None:
+        auth._verified_tokens.clear()
+    yield
+    # Pooled connections belong to this test's event loop
+    await async_engine.dispose()
+
+@pytest.fixture
+def statements(database):
+    """SQL statements executed on the async engine while the test runs."""
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+@pytest.fixture
+async def client(database):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    # The shared HTTP client is bound to this test's event loop as well
+    await url_analyzer.aclose()
+
+@pytest.fixture
+def login(client):
+    """Register a user and return the headers authenticating as them."""
+    async def login(username: str = "alice") -> Dict[str, str]:
+        password = "correct-horse-battery"
+        await client.post("/api/v1/auth/register", json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": password
+        })
+        response = await client.post("/api/v1/auth/login", json={"username": username, "password": password})
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login
+
+@pytest.fixture
+def analyze_many(stub_server):
+    """Store analyses of ``count`` distinct stub pages through the batch endpoint."""
+    async def analyze_many(client: httpx.AsyncClient, count: int, prefix: str = "/pages") -> List[str]:
+        urls = [stub_server.add(f"{prefix}/{i}") for i in range(count)]
+        response = await client.post("/api/v1/urls/analyze/batch", json={"urls": urls})
+        assert response.json()["succeeded"] == count
+        return urls
+    return analyze_many
+
+@pytest.fixture
+async def auth_client(client, login):
+    """API client authenticated as ``alice``."""
+    client.headers.update(await login())
+    return client
@@ -0,0 +1,115 @@
+from typing import Dict, Optional, Tuple
+import pytest
+from app.core import cache as cache_module
+from app.routers.v1.urls import url_analyzer
+from app.services.analysis_cache import (
+    AnalysisCache, InMemoryAnalysisCache, RedisAnalysisCache, create_analysis_cache, normalize_url
+)
+
+pytestmark = pytest.mark.anyio
+
+RESULT = {"top_words": [{"word": "python", "count": 3}], "top_ngrams": None, "etag": '"v1"', "last_modified": None}
+
+class Clock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+class FakeRedis:
+    """In-process stand-in for the redis.asyncio client, with key expiry."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.values: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.closed = False
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and expires_at <= self.clock.now:
+            del self.values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        self.values[key] = (value.encode(), self.clock.now + ex if ex else None)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTP://Example.COM", "http://example.com/"),
+    ("https://example.com/path?b=2&a=1#section", "https://example.com/path?a=1&b=2"),
+    ("  https://example.com/?q=&a=1  ", "https://example.com/?a=1&q="),
+    ("https://example.com/Path", "https://example.com/Path"),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+async def test_memory_cache_expires_entries(clock):
+    cache = InMemoryAnalysisCache(max_entries=10, ttl=60)
+    await cache.set("key", RESULT)
+
+    clock.now += 59
+    assert await cache.get("key") == RESULT
+    clock.now += 1
+    assert await cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+async def test_memory_cache_evicts_least_recently_used(clock):
+    cache = InMemoryAnalysisCache(max_entries=2, ttl=60)
+    await cache.set("a", RESULT)
+    await cache.set("b", RESULT)
+    await cache.get("a")
+    await cache.set("c", RESULT)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == RESULT
+    assert await cache.get("c") == RESULT
+    assert cache.stats()["evictions"] == 1
+
+async def test_redis_cache_round_trip_and_expiry():
+    clock = Clock()
+    client = FakeRedis(clock)
+    cache = RedisAnalysisCache(ttl=30, client=client)
+
+    assert await cache.get("key") is None
+    await cache.set("key", RESULT)
+    assert list(client.values) == ["url-analysis:key"]
+    assert await cache.get("key") == RESULT
+    clock.now += 30
+    assert await cache.get("key") is None
+    assert cache.stats() == {"backend": "redis", "hits": 1, "misses": 2}
+
+    await cache.aclose()
+    assert client.closed
+
+def test_create_analysis_cache():
+    assert isinstance(create_analysis_cache("memory"), InMemoryAnalysisCache)
+    assert type(create_analysis_cache("none")) is AnalysisCache
+
+async def test_cached_analysis_is_still_recorded(auth_client, stub_server, monkeypatch):
+    monkeypatch.setattr(url_analyzer, "cache", InMemoryAnalysisCache(max_entries=10, ttl=60))
+    url = stub_server.add("/cached/page")
+    requests = stub_server.requests
+
+    first = (await auth_client.post("/api/v1/urls/analyze", json={"url": url})).json()
+    # A different spelling of the same address is served from the cache
+    respelled = url.replace("http://", "HTTP://") + "#top"
+    second = (await auth_client.post("/api/v1/urls/analyze", json={"url": respelled})).json()
+
+    assert stub_server.requests - requests == 1
+    assert second["top_words"] == first["top_words"]
+    assert second["id"] != first["id"]
+    history = (await auth_client.get("/api/v1/urls/history")).json()
+    assert history["total"] == 2
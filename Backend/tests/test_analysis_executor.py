@@ -0,0 +1,36 @@
+import os
+import signal
+import pytest
+from app.core.errors import ExternalServiceError, ServiceUnavailableError
+from app.services.analysis_executor import AnalysisExecutor
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def executor():
+    executor = AnalysisExecutor(max_workers=1, max_pending=2)
+    yield executor
+    executor.shutdown()
+
+async def test_runs_on_worker_process(executor):
+    assert await executor.run(os.getpid) != os.getpid()
+    assert executor.pending == 0
+
+async def test_replaces_pool_after_worker_is_killed(executor):
+    worker = await executor.run(os.getpid)
+    os.kill(worker, signal.SIGKILL)
+
+    assert await executor.run(os.getpid) not in (worker, os.getpid())
+
+async def test_task_killing_its_worker_fails_alone(executor):
+    with pytest.raises(ExternalServiceError) as error:
+        await executor.run(os._exit, 1)
+    assert error.value.error_code == "WORKER_CRASHED"
+
+    assert await executor.run(os.getpid) != os.getpid()
+    assert executor.pending == 0
+
+async def test_rejects_tasks_beyond_max_pending():
+    executor = AnalysisExecutor(max_workers=1, max_pending=0)
+    with pytest.raises(ServiceUnavailableError):
+        await executor.run(os.getpid)
@@ -0,0 +1,153 @@
+import asyncio
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select, update
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisJob, UrlAnalysis, User
+from app.services.analysis_jobs import AnalysisJobQueue
+from app.services.url_analyzer import AnalysisResult
+from app.services.word_counter import AnalysisOptions
+
+pytestmark = pytest.mark.anyio
+
+LEASE_TIMEOUT = 60
+
+class FakeAnalyzer:
+    """Analyzer stand-in that counts calls and yields to other tasks mid-analysis."""
+
+    def __init__(self, during=None):
+        self.calls = 0
+        self.during = during
+
+    async def analyze_url(self, url, options, load_previous=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.during is not None:
+            await self.during()
+        return AnalysisResult([{"word": "python", "count": 3}])
+
+@pytest.fixture
+async def user_id(database):
+    async with AsyncSessionLocal() as db:
+        user = User(username="alice", email="alice@example.com", hashed_password="unused")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+async def create_job(user_id: int, status: str = "queued", updated_at=None) -> int:
+    async with AsyncSessionLocal() as db:
+        job = AnalysisJob(
+            url="http://example.com/",
+            analysis_options=asdict(AnalysisOptions()),
+            user_id=user_id,
+            status=status,
+            updated_at=updated_at or datetime.now(timezone.utc)
+        )
+        db.add(job)
+        await db.commit()
+        return job.id
+
+async def load_job(job_id: int) -> AnalysisJob:
+    async with AsyncSessionLocal() as db:
+        return await db.get(AnalysisJob, job_id)
+
+async def count_analyses() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(UrlAnalysis))
+
+async def wait_until_finished(job_id: int) -> AnalysisJob:
+    for _ in range(200):
+        job = await load_job(job_id)
+        if job.status in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    pytest.fail(f"job {job_id} did not finish")
+
+def create_queue(analyzer) -> AnalysisJobQueue:
+    return AnalysisJobQueue(analyzer, workers=2, lease_timeout=LEASE_TIMEOUT)
+
+async def test_job_runs_once_across_queues(user_id):
+    # Each server process has its own queue, and every one of them resumes queued jobs
+    job_id = await create_job(user_id)
+    analyzers = [FakeAnalyzer(), FakeAnalyzer()]
+    queues = [create_queue(analyzer) for analyzer in analyzers]
+
+    await asyncio.gather(*(queue.run_job(job_id) for queue in queues))
+
+    job = await load_job(job_id)
+    assert (job.status, job.attempts) == ("succeeded", 1)
+    assert sum(analyzer.calls for analyzer in analyzers) == 1
+    assert await count_analyses() == 1
+
+async def test_started_queues_share_unfinished_jobs(user_id):
+    job_ids = [await create_job(user_id) for _ in range(4)]
+    analyzers = [FakeAnalyzer(), FakeAnalyzer()]
+    queues = [create_queue(analyzer) for analyzer in analyzers]
+    try:
+        for queue in queues:
+            await queue.start()
+        jobs = [await wait_until_finished(job_id) for job_id in job_ids]
+    finally:
+        for queue in queues:
+            await queue.aclose()
+
+    assert [job.attempts for job in jobs] == [1, 1, 1, 1]
+    assert sum(analyzer.calls for analyzer in analyzers) == 4
+    assert await count_analyses() == 4
+
+async def test_stale_running_job_is_recovered(user_id):
+    expired = datetime.now(timezone.utc) - timedelta(seconds=2 * LEASE_TIMEOUT)
+    job_id = await create_job(user_id, status="running", updated_at=expired)
+    queue = create_queue(FakeAnalyzer())
+    try:
+        await queue.start()
+        job = await wait_until_finished(job_id)
+    finally:
+        await queue.aclose()
+
+    assert (job.status, job.attempts) == ("succeeded", 1)
+
+async def test_running_job_within_lease_is_left_alone(user_id):
+    job_id = await create_job(user_id, status="running")
+    analyzer = FakeAnalyzer()
+    queue = create_queue(analyzer)
+
+    await queue.run_job(job_id)
+
+    job = await load_job(job_id)
+    assert (job.status, job.attempts) == ("running", 0)
+    assert analyzer.calls == 0
+
+async def test_outcome_is_discarded_after_takeover(user_id):
+    job_id = await create_job(user_id)
+
+    async def take_over():
+        # Another worker claimed the job after this attempt's lease expired
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(attempts=AnalysisJob.attempts + 1))
+            await db.commit()
+
+    await create_queue(FakeAnalyzer(during=take_over)).run_job(job_id)
+
+    job = await load_job(job_id)
+    assert (job.status, job.analysis_id) == ("running", None)
+    assert await count_analyses() == 0
+
+async def test_attempt_is_aborted_before_its_lease_expires(user_id):
+    job_id = await create_job(user_id)
+
+    async def trickle():
+        # A page arriving slowly enough that no per-read timeout fires
+        await asyncio.sleep(3600)
+
+    queue = AnalysisJobQueue(FakeAnalyzer(during=trickle), lease_timeout=0.2, max_attempts=1)
+    started = asyncio.get_running_loop().time()
+    await asyncio.wait_for(queue.run_job(job_id), timeout=5)
+
+    assert asyncio.get_running_loop().time() - started < queue.lease_timeout
+    job = await load_job(job_id)
+    # Recorded as a timeout while the lease was still held
+    assert (job.status, job.attempts) == ("failed", 1)
+    assert "did not finish" in job.error
+    assert await count_analyses() == 0
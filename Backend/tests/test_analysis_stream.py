@@ -0,0 +1,66 @@
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+STREAM = "/api/v1/urls/analyze/stream"
+
+# Large enough for several download progress events and word count snapshots
+PARAGRAPH = b"<p>Python streams events while python counts words</p>\n"
+LARGE_PAGE = b"<html><body>\n" + PARAGRAPH * 4000 + b"</body></html>\n"
+
+def parse_events(body: str):
+    """``(event, data)`` pairs of a ``text/event-stream`` body."""
+    events = []
+    for block in body.split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+async def test_stream_reports_progress_then_stored_result(auth_client, stub_server):
+    url = stub_server.add("/stream/large", LARGE_PAGE)
+
+    response = await auth_client.post(STREAM, json={"url": url})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    # download progress, then parsing, then snapshots, then the stored result
+    first_parsed = names.index("parsed")
+    assert set(names[:first_parsed]) == {"download"}
+    assert names[first_parsed + 1:-1] and set(names[first_parsed + 1:-1]) == {"snapshot"}
+    assert names[-1] == "result"
+
+    downloads = [data for name, data in events if name == "download"]
+    assert [data["complete"] for data in downloads] == [False] * (len(downloads) - 1) + [True]
+    assert downloads[-1]["bytes"] == downloads[-1]["total"] == len(LARGE_PAGE)
+    assert [data["bytes"] for data in downloads] == sorted(data["bytes"] for data in downloads)
+    snapshots = [data for name, data in events if name == "snapshot"]
+    assert [data["tokens"] for data in snapshots] == sorted(data["tokens"] for data in snapshots)
+
+    result = events[-1][1]
+    assert result["top_words"][0] == {"word": "python", "count": 8000}
+    assert result["user"]["username"] == "alice"
+    history = (await auth_client.get("/api/v1/urls/history")).json()
+    assert [item["id"] for item in history["items"]] == [result["id"]]
+    assert history["items"][0]["top_words"] == result["top_words"]
+
+async def test_stream_of_small_page(auth_client, stub_server):
+    url = stub_server.add("/stream/small")
+
+    events = parse_events((await auth_client.post(STREAM, json={"url": url})).text)
+
+    assert [name for name, _ in events] == ["download", "parsed", "result"]
+    assert events[-1][1]["top_words"][0] == {"word": "python", "count": 3}
+
+async def test_stream_reports_fetch_failure(auth_client, stub_server):
+    response = await auth_client.post(STREAM, json={"url": stub_server.url("/stream/missing")})
+
+    assert response.status_code == 200
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["error"]
+    assert events[0][1]["detail"].startswith("Failed to analyze URL: ")
+    assert (await auth_client.get("/api/v1/urls/history")).json()["total"] == 0
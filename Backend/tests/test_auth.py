@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import select, update
+from app.core.database import AsyncSessionLocal
+from app.core.environment import BCRYPT_ROUNDS
+from app.models import RefreshToken, User
+from app.services.auth import principals
+from app.services.auth.token_purge import RefreshTokenPurger
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct-horse-battery"
+
+# Needs authentication but no database query of its own
+AUTHENTICATED = "/api/v1/urls/analyzer/stats"
+
+async def register_and_login(client, username: str = "alice"):
+    """Register ``username`` and return the login response body."""
+    await client.post("/api/v1/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": PASSWORD
+    })
+    response = await client.post("/api/v1/auth/login", json={"username": username, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+def bearer(tokens) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+async def test_cached_principal_needs_no_query(auth_client, statements):
+    # The first request loads the user and caches it
+    statements.clear()
+    assert (await auth_client.get(AUTHENTICATED)).status_code == 200
+    assert any("FROM users" in statement for statement in statements)
+
+    statements.clear()
+    assert (await auth_client.get(AUTHENTICATED)).status_code == 200
+    assert statements == []
+
+async def test_logout_evicts_principal(client, statements):
+    tokens = await register_and_login(client)
+    await client.get(AUTHENTICATED, headers=bearer(tokens))
+    assert principals.get_cached_principal("alice") is not None
+
+    response = await client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    assert principals.get_cached_principal("alice") is None
+    statements.clear()
+    await client.get(AUTHENTICATED, headers=bearer(tokens))
+    assert any("FROM users" in statement for statement in statements)
+
+async def test_refresh_evicts_principal(client):
+    tokens = await register_and_login(client)
+    await client.get(AUTHENTICATED, headers=bearer(tokens))
+    assert principals.get_cached_principal("alice") is not None
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    # Rotation revoked the presented refresh token, and with it the cached principal
+    assert principals.get_cached_principal("alice") is None
+
+async def test_eviction_is_per_user(client):
+    alice = await register_and_login(client, "alice")
+    bob = await register_and_login(client, "bob")
+    for tokens in (alice, bob):
+        await client.get(AUTHENTICATED, headers=bearer(tokens))
+
+    await client.post("/api/v1/auth/logout", json={"refresh_token": alice["refresh_token"]})
+
+    assert principals.get_cached_principal("alice") is None
+    assert principals.get_cached_principal("bob") is not None
+
+async def stored_hash(username: str) -> str:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(User.hashed_password).where(User.username == username))
+
+async def test_login_upgrades_hash_with_other_cost(client):
+    await register_and_login(client)
+    # A hash made before BCRYPT_ROUNDS changed
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS + 1).hash(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(User).where(User.username == "alice").values(hashed_password=old_hash))
+        await db.commit()
+
+    failed = await client.post("/api/v1/auth/login", json={"username": "alice", "password": "wrong-password"})
+    assert failed.status_code == 401
+    assert await stored_hash("alice") == old_hash
+
+    response = await client.post("/api/v1/auth/login", json={"username": "alice", "password": PASSWORD})
+
+    assert response.status_code == 200
+    new_hash = await stored_hash("alice")
+    assert new_hash.split("$")[2] == f"{BCRYPT_ROUNDS:02d}" != old_hash.split("$")[2]
+    # The new hash still verifies
+    assert (await client.post("/api/v1/auth/login", json={"username": "alice", "password": PASSWORD})).status_code == 200
+
+async def test_replayed_refresh_token_is_rejected(client):
+    tokens = await register_and_login(client)
+
+    rotated = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    replayed = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert rotated.status_code == 200
+    assert replayed.status_code == 401
+    new_tokens = rotated.json()
+    assert (await client.get(AUTHENTICATED, headers=bearer(new_tokens))).status_code == 200
+    again = await client.post("/api/v1/auth/refresh", json={"refresh_token": new_tokens["refresh_token"]})
+    assert again.status_code == 200
+
+async def test_purge_deletes_only_revoked_and_expired_tokens(database):
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        user = User(username="alice", email="alice@example.com", hashed_password="")
+        db.add(user)
+        await db.flush()
+        tokens = {
+            **{f"revoked-{i}": (True, now + timedelta(days=1)) for i in range(5)},
+            **{f"expired-{i}": (False, now - timedelta(minutes=i + 1)) for i in range(4)},
+            "active": (False, now + timedelta(days=7)),
+            "expiring-soon": (False, now + timedelta(minutes=1)),
+        }
+        db.add_all(
+            RefreshToken(token=token, user_id=user.id, is_revoked=revoked, expires_at=expires_at)
+            for token, (revoked, expires_at) in tokens.items()
+        )
+        await db.commit()
+
+    # Several batches, the last one partial
+    deleted = await RefreshTokenPurger(batch_size=2).purge()
+
+    assert deleted == 9
+    async with AsyncSessionLocal() as db:
+        remaining = set(await db.scalars(select(RefreshToken.token)))
+    assert remaining == {"active", "expiring-soon"}
+    assert await RefreshTokenPurger(batch_size=2).purge() == 0
@@ -0,0 +1,70 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+EXPORT = "/api/v1/urls/history/export"
+
+def ndjson_records(body: str):
+    return [json.loads(line) for line in body.splitlines()]
+
+async def test_export_ndjson_matches_history(auth_client, analyze_many):
+    await analyze_many(auth_client, 5)
+
+    response = await auth_client.get(EXPORT, headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "content-encoding" not in response.headers
+    records = ndjson_records(response.text)
+    history = (await auth_client.get("/api/v1/urls/history/all", params={"size": 10})).json()
+    assert [record["id"] for record in records] == [item["id"] for item in history["items"]]
+    assert records[0]["username"] == "alice"
+    assert records[0]["top_words"][0] == {"word": "python", "count": 3}
+
+async def test_export_csv(auth_client, analyze_many):
+    await analyze_many(auth_client, 3)
+
+    response = await auth_client.get(EXPORT, params={"format": "csv"}, headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert json.loads(rows[0]["top_words"])[0] == {"word": "python", "count": 3}
+
+async def test_export_is_gzipped_when_accepted(auth_client, analyze_many):
+    await analyze_many(auth_client, 3)
+
+    async with auth_client.stream("GET", EXPORT, headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        body = gzip.decompress(b"".join([chunk async for chunk in response.aiter_raw()]))
+
+    assert len(ndjson_records(body.decode())) == 3
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+async def test_export_resumes_after_cursor(auth_client, analyze_many, format):
+    # Rows of one batch share a second, so resuming must not repeat any of them
+    await analyze_many(auth_client, 6)
+
+    def parse(response):
+        if format == "csv":
+            return list(csv.DictReader(io.StringIO(response.text)))
+        return ndjson_records(response.text)
+
+    full = parse(await auth_client.get(EXPORT, params={"format": format}))
+    for position in (0, 2, 5):
+        resumed = parse(await auth_client.get(EXPORT, params={"format": format, "cursor": full[position]["cursor"]}))
+        assert [str(record["id"]) for record in resumed] == [str(record["id"]) for record in full[position + 1:]]
+
+async def test_export_mine_only(client, login, stub_server):
+    alice = await login("alice")
+    bob = await login("bob")
+    for headers, path in ((alice, "/export/alice"), (bob, "/export/bob")):
+        await client.post("/api/v1/urls/analyze", json={"url": stub_server.add(path)}, headers=headers)
+
+    records = ndjson_records((await client.get(EXPORT, params={"mine": "true"}, headers=bob)).text)
+
+    assert [record["username"] for record in records] == ["bob"]
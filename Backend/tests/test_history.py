@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import update
+from app.core.database import AsyncSessionLocal
+from app.models import UrlAnalysis
+
+pytestmark = pytest.mark.anyio
+
+async def test_analyze_stores_history(auth_client, stub_server):
+    url = stub_server.add("/history/analyze")
+
+    response = await auth_client.post("/api/v1/urls/analyze", json={"url": url})
+
+    assert response.status_code == 201
+    analysis = response.json()
+    assert analysis["top_words"][:2] == [{"word": "python", "count": 3}, {"word": "programming", "count": 2}]
+    assert analysis["user"]["username"] == "alice"
+    history = (await auth_client.get("/api/v1/urls/history")).json()
+    assert history["total"] == 1
+    assert [item["id"] for item in history["items"]] == [analysis["id"]]
+
+async def test_history_is_per_user(client, login, stub_server):
+    alice = await login("alice")
+    bob = await login("bob")
+    url = stub_server.add("/history/per-user")
+    await client.post("/api/v1/urls/analyze", json={"url": url}, headers=alice)
+
+    assert (await client.get("/api/v1/urls/history", headers=alice)).json()["total"] == 1
+    assert (await client.get("/api/v1/urls/history", headers=bob)).json()["total"] == 0
+    assert (await client.get("/api/v1/urls/history/all")).json()["total"] == 1
+
+async def test_history_pages_by_offset(auth_client, analyze_many):
+    urls = await analyze_many(auth_client, 5)
+
+    pages = [
+        (await auth_client.get("/api/v1/urls/history", params={"page": page, "size": 2})).json()
+        for page in (1, 2, 3)
+    ]
+
+    assert [page["page"] for page in pages] == [1, 2, 3]
+    assert [page["total"] for page in pages] == [5, 5, 5]
+    assert [page["pages"] for page in pages] == [3, 3, 3]
+    seen = [item["url"] for page in pages for item in page["items"]]
+    assert sorted(seen) == sorted(urls)
+
+async def walk_cursor(client, path: str, size: int, max_pages: int = 20):
+    """Follow ``next_cursor`` from the first page and return the ids seen in order."""
+    ids, cursor = [], None
+    for _ in range(max_pages):
+        params = {"size": size, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get(path, params=params)).json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+    pytest.fail(f"cursor paging of {path} did not finish after {max_pages} pages")
+
+async def test_history_pages_by_cursor(auth_client, analyze_many):
+    # A batch stores its rows within the same second
+    await analyze_many(auth_client, 5)
+
+    for path in ("/api/v1/urls/history", "/api/v1/urls/history/all"):
+        ids = await walk_cursor(auth_client, path, size=2)
+        assert len(ids) == len(set(ids)) == 5
+
+async def test_cursor_page_has_no_page_number(auth_client, analyze_many):
+    await analyze_many(auth_client, 5)
+    first = (await auth_client.get("/api/v1/urls/history", params={"size": 2})).json()
+
+    # A page number sent along with the cursor is ignored
+    params = {"size": 2, "page": 3, "cursor": first["next_cursor"]}
+    second = (await auth_client.get("/api/v1/urls/history", params=params)).json()
+
+    assert first["page"] == 1
+    assert second["page"] is None
+    assert len(second["items"]) == 2
+    assert not {item["id"] for item in first["items"]} & {item["id"] for item in second["items"]}
+
+async def test_history_cursor_pages_through_shared_timestamp(auth_client, analyze_many):
+    await analyze_many(auth_client, 5)
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(UrlAnalysis).values(analyzed_at=datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)))
+        await db.commit()
+
+    ids = await walk_cursor(auth_client, "/api/v1/urls/history", size=2)
+
+    # Rows sharing a timestamp come in id order
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+async def test_history_requires_authentication(client):
+    response = await client.get("/api/v1/urls/history")
+    assert response.status_code == 403
+
+@pytest.mark.parametrize("path", ["/api/v1/urls/history", "/api/v1/urls/history/all"])
+async def test_history_statements_do_not_grow_with_page_size(client, login, analyze_many, statements, path):
+    # Rows of several users, so lazily loading each row's user would show up
+    for username in ("alice", "bob"):
+        client.headers.update(await login(username))
+        await analyze_many(client, 12, prefix=f"/statements/{username}")
+    await client.get(path)
+
+    counts = []
+    for size in (1, 10, 100):
+        statements.clear()
+        page = (await client.get(path, params={"size": size})).json()
+        assert len(page["items"]) == min(size, page["total"])
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1] == counts[2]
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from app.core import environment
+from app.core.database import Base
+from app.models import AnalysisWord
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+# The revision before analysis_words, and the one adding and backfilling it
+BEFORE_WORDS = "b5d1e8f3a720"
+WORDS = "c8a3e5f1d294"
+# Tables added by WORDS and the revisions after it
+LATER_TABLES = {"analysis_words", "user_analysis_stats", "daily_analysis_stats"}
+
+ANALYSES = 2500  # more than one backfill batch
+
+def top_words(analysis_id: int):
+    if analysis_id % 100 == 0:
+        return []
+    return [{"word": "common", "count": 3}, {"word": f"word{analysis_id}", "count": 1}]
+
+@pytest.fixture
+def migrated(tmp_path, monkeypatch):
+    """A SQLite database at ``BEFORE_WORDS``, filled with analyses."""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    # alembic/env.py connects to the configured database
+    monkeypatch.setattr(environment, "DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    # The first revisions use PostgreSQL defaults, so the older tables come from the models
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[
+        table for table in Base.metadata.sorted_tables if table.name not in LATER_TABLES
+    ])
+    command.stamp(config, BEFORE_WORDS)
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'alice', 'alice@example.com', '')"
+        ))
+        connection.execute(
+            text("INSERT INTO url_analyses (id, url, top_words, user_id) VALUES (:id, :url, :top_words, 1)"),
+            [
+                {"id": i, "url": f"https://example.com/{i}", "top_words": json.dumps(top_words(i))}
+                for i in range(1, ANALYSES + 1)
+            ]
+        )
+    yield config, engine
+    engine.dispose()
+
+def word_rows(engine):
+    with engine.connect() as connection:
+        return set(connection.execute(text("SELECT analysis_id, word, count FROM analysis_words")))
+
+def expected_rows():
+    return {(i, item["word"], item["count"]) for i in range(1, ANALYSES + 1) for item in top_words(i)}
+
+def test_backfill_of_existing_analyses(migrated):
+    config, engine = migrated
+
+    command.upgrade(config, WORDS)
+
+    assert word_rows(engine) == expected_rows()
+
+def test_backfill_resumes_after_interruption(migrated):
+    config, engine = migrated
+    # An interrupted run leaves the table and its first batches behind, without stamping the revision
+    AnalysisWord.__table__.create(engine)
+    done = [row for row in sorted(expected_rows()) if row[0] <= 1200]
+    with engine.begin() as connection:
+        connection.execute(AnalysisWord.__table__.insert(), [
+            {"analysis_id": analysis_id, "word": word, "count": count} for analysis_id, word, count in done
+        ])
+
+    # Rows already backfilled would violate the primary key if they were inserted again
+    command.upgrade(config, WORDS)
+
+    assert word_rows(engine) == expected_rows()
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT version_num FROM alembic_version")) == WORDS
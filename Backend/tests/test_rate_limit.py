@@ -0,0 +1,78 @@
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import SlidingWindowRateLimiter
+from app.routers.v1 import auth as auth_router
+
+class Clock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+def test_rejects_attempts_beyond_the_limit(clock):
+    limiter = SlidingWindowRateLimiter(max_attempts=3, window=60)
+    for _ in range(3):
+        assert limiter.hit("client") == 0
+        clock.now += 10
+
+    # The oldest attempt leaves the window 30 seconds from now
+    assert limiter.hit("client") == pytest.approx(30)
+    assert limiter.rejected == 1
+
+def test_window_slides(clock):
+    limiter = SlidingWindowRateLimiter(max_attempts=2, window=60)
+    limiter.hit("client")
+    clock.now += 30
+    limiter.hit("client")
+    assert limiter.hit("client") == pytest.approx(30)
+
+    clock.now += 30
+    # Only the first attempt has expired; rejected attempts were never counted
+    assert limiter.hit("client") == 0
+    assert limiter.hit("client") == pytest.approx(30)
+    clock.now += 60
+    assert limiter.hit("client") == 0
+    assert limiter.hit("client") == 0
+
+def test_clients_are_limited_separately(clock):
+    limiter = SlidingWindowRateLimiter(max_attempts=1, window=60)
+    assert limiter.hit("a") == 0
+    assert limiter.hit("b") == 0
+    assert limiter.hit("a") > 0
+
+    limiter.reset("a")
+    assert limiter.hit("a") == 0
+
+def test_least_recently_seen_clients_are_forgotten(clock):
+    limiter = SlidingWindowRateLimiter(max_attempts=1, window=60, max_keys=2)
+    limiter.hit("a")
+    limiter.hit("b")
+    limiter.hit("c")
+
+    assert limiter.hit("a") == 0
+    assert limiter.hit("c") > 0
+
+@pytest.mark.anyio
+async def test_login_is_rate_limited(client, login, clock, monkeypatch):
+    await login("alice")
+    monkeypatch.setattr(auth_router, "login_rate_limiter", SlidingWindowRateLimiter(max_attempts=3, window=60))
+    credentials = {"username": "alice", "password": "wrong-password"}
+
+    statuses = [(await client.post("/api/v1/auth/login", json=credentials)).status_code for _ in range(3)]
+    rejected = await client.post("/api/v1/auth/login", json={**credentials, "password": "correct-horse-battery"})
+
+    assert statuses == [401, 401, 401]
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "60"
+    clock.now += 60
+    response = await client.post("/api/v1/auth/login", json={**credentials, "password": "correct-horse-battery"})
+    assert response.status_code == 200
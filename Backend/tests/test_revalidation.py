@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import event, func, null, select, update
+from app.core.database import AsyncSessionLocal
+from app.models import UrlAnalysis
+from app.services.analysis_store import find_previous_analyses
+
+pytestmark = pytest.mark.anyio
+
+class Downloads:
+    """Body bytes the stub server sent since the last check."""
+
+    def __init__(self, stub_server):
+        self.stub_server = stub_server
+        self.seen = stub_server.bytes_sent
+
+    def __call__(self) -> int:
+        sent, self.seen = self.stub_server.bytes_sent - self.seen, self.stub_server.bytes_sent
+        return sent
+
+async def test_unchanged_page_is_not_downloaded_again(auth_client, stub_server):
+    url = stub_server.add("/revalidate/same", etag='"v1"')
+    downloads = Downloads(stub_server)
+
+    first = (await auth_client.post("/api/v1/urls/analyze", json={"url": url})).json()
+    assert downloads() > 0
+    second = (await auth_client.post("/api/v1/urls/analyze", json={"url": url})).json()
+
+    assert downloads() == 0
+    assert second["top_words"] == first["top_words"]
+
+async def test_revalidates_against_newest_row_with_same_options(auth_client, stub_server):
+    url = stub_server.add("/revalidate/options", etag='"v1"')
+    downloads = Downloads(stub_server)
+    await auth_client.post("/api/v1/urls/analyze", json={"url": url})
+    page_size = downloads()
+    await auth_client.post("/api/v1/urls/analyze", json={"url": url, "top_n": 2})
+    assert downloads() == page_size
+
+    # The newest row was computed with other options; the one before it still applies
+    response = await auth_client.post("/api/v1/urls/analyze", json={"url": url})
+
+    assert downloads() == 0
+    assert len(response.json()["top_words"]) == 5
+
+async def test_rows_without_options_match_the_defaults(auth_client, stub_server):
+    url = stub_server.add("/revalidate/legacy", etag='"v1"')
+    downloads = Downloads(stub_server)
+    await auth_client.post("/api/v1/urls/analyze", json={"url": url})
+    page_size = downloads()
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(UrlAnalysis).values(analysis_options=null()))
+        await db.commit()
+
+    await auth_client.post("/api/v1/urls/analyze", json={"url": url})
+    assert downloads() == 0
+    await auth_client.post("/api/v1/urls/analyze", json={"url": url, "ngram_size": 2})
+    assert downloads() == page_size
+
+async def test_batch_revalidates_every_url(auth_client, stub_server):
+    urls = [stub_server.add(f"/revalidate/batch/{i}", etag=f'"v{i}"') for i in range(3)]
+    downloads = Downloads(stub_server)
+    await auth_client.post("/api/v1/urls/analyze/batch", json={"urls": urls})
+    await auth_client.post("/api/v1/urls/analyze/batch", json={"urls": urls, "top_n": 2})
+    assert downloads() > 0
+
+    response = (await auth_client.post("/api/v1/urls/analyze/batch", json={"urls": urls})).json()
+
+    assert response["succeeded"] == 3
+    assert downloads() == 0
+
+async def test_batch_lookup_loads_newest_row_per_url(auth_client, stub_server):
+    urls = [stub_server.add(f"/revalidate/newest/{i}", etag=f'"v{i}"') for i in range(2)]
+    for _ in range(3):
+        await auth_client.post("/api/v1/urls/analyze/batch", json={"urls": urls})
+    await auth_client.post("/api/v1/urls/analyze/batch", json={"urls": urls, "top_n": 2})
+    async with AsyncSessionLocal() as db:
+        expected = set(await db.scalars(
+            select(func.max(UrlAnalysis.id))
+            .where(UrlAnalysis.analysis_options["top_n"].as_integer() == 5)
+            .group_by(UrlAnalysis.url)
+        ))
+
+    loaded = []
+    record = lambda row, context: loaded.append(row.id)
+    event.listen(UrlAnalysis, "load", record)
+    try:
+        async with AsyncSessionLocal() as db:
+            previous = await find_previous_analyses(db, urls, {"top_n": 5, "ngram_size": 1, "min_word_length": 3})
+    finally:
+        event.remove(UrlAnalysis, "load", record)
+
+    assert sorted(previous) == sorted(urls)
+    assert set(loaded) == expected
+    assert len(loaded) == 2
@@ -0,0 +1,85 @@
+import pytest
+from app.services.analysis_store import _prefix_upper_bound
+
+pytestmark = pytest.mark.anyio
+
+SEARCH = "/api/v1/urls/search"
+
+# The top words of every page are exactly its words
+PAGES = {
+    "one": "apple banana abzug",
+    "two": "apple cherry zebra",
+    "three": "banana azure abcde",
+    "four": "zzzz acorn",
+}
+
+@pytest.fixture
+async def seeded(auth_client, stub_server):
+    """Analyze every page once and return the analysis id of each."""
+    ids = {}
+    for name, text in PAGES.items():
+        url = stub_server.add(f"/search/{name}", f"<html><body><p>{text}</p></body></html>".encode())
+        ids[name] = (await auth_client.post("/api/v1/urls/analyze", json={"url": url})).json()["id"]
+    return ids
+
+async def search(client, **params):
+    response = await client.get(SEARCH, params={"size": 100, **params})
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert page["total"] == len(page["items"])
+    return {item["id"] for item in page["items"]}
+
+@pytest.mark.parametrize("prefix, expected", [("z", None), ("zz", None), ("az", "b"), ("abz", "ac"), ("abc", "abd")])
+def test_prefix_upper_bound(prefix, expected):
+    assert _prefix_upper_bound(prefix) == expected
+
+@pytest.mark.parametrize("params, expected", [
+    ({"word": "apple"}, {"one", "two"}),
+    ({"word": "APPLE"}, {"one", "two"}),
+    ({"word": "apple,banana"}, {"one"}),
+    ({"word": ["apple", "banana"]}, {"one"}),
+    ({"word": "apple banana", "match": "any"}, {"one", "two", "three"}),
+    ({"word": "cherry,zzzz", "match": "any"}, {"two", "four"}),
+    ({"word": "cherry,azure"}, set()),
+    ({"word": "missing"}, set()),
+    ({"word": "z", "prefix": "true"}, {"two", "four"}),
+    ({"word": "zz", "prefix": "true"}, {"four"}),
+    ({"word": "az", "prefix": "true"}, {"three"}),
+    ({"word": "abz", "prefix": "true"}, {"one"}),
+    ({"word": "ab", "prefix": "true"}, {"one", "three"}),
+    ({"word": "ab,ban", "prefix": "true"}, {"one", "three"}),
+    ({"word": "ab,zz", "prefix": "true", "match": "any"}, {"one", "three", "four"}),
+])
+async def test_search_modes(auth_client, seeded, params, expected):
+    assert await search(auth_client, **params) == {seeded[name] for name in expected}
+
+@pytest.mark.parametrize("word", ["", ",", "py%", "naïve", "two2", ",".join(f"w{'a' * i}" for i in range(11))])
+async def test_invalid_search_terms(auth_client, word):
+    response = await auth_client.get(SEARCH, params={"word": word})
+    assert response.status_code == 400
+
+async def test_search_pages_by_cursor(auth_client, seeded):
+    ids, cursor = [], None
+    for _ in range(10):
+        params = {"word": "apple,banana,zzzz", "match": "any", "size": 1, **({"cursor": cursor} if cursor else {})}
+        page = (await auth_client.get(SEARCH, params=params)).json()
+        assert page["total"] == 4
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Newest first, each analysis once
+    assert ids == sorted(seeded.values(), reverse=True)
+
+async def test_search_mine_only(client, login, stub_server):
+    alice = await login("alice")
+    bob = await login("bob")
+    for headers, name in ((alice, "alice"), (bob, "bob")):
+        url = stub_server.add(f"/search/mine/{name}", b"<p>shared words</p>")
+        await client.post("/api/v1/urls/analyze", json={"url": url}, headers=headers)
+
+    everyone = (await client.get(SEARCH, params={"word": "shared"}, headers=bob)).json()
+    mine = (await client.get(SEARCH, params={"word": "shared", "mine": "true"}, headers=bob)).json()
+    assert everyone["total"] == 2
+    assert [item["user"]["username"] for item in mine["items"]] == ["bob"]
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from app.core.errors import ExternalServiceError
+from app.services.analysis_cache import AnalysisCache
+from app.services.url_analyzer import UrlAnalyzerService
+from app.services.word_counter import AnalysisOptions
+
+pytestmark = pytest.mark.anyio
+
+CALLERS = 20
+
+@pytest.fixture
+async def analyzer():
+    # No result cache, so only coalescing keeps callers from fetching
+    analyzer = UrlAnalyzerService(execution_mode="inline", cache=AnalysisCache())
+    yield analyzer
+    await analyzer.aclose()
+
+class Gate:
+    """``load_previous`` callback holding the shared run until the gate opens."""
+
+    def __init__(self):
+        self.opened = asyncio.Event()
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await self.opened.wait()
+        return None
+
+async def start_callers(analyzer, url, gate, count=CALLERS):
+    tasks = [asyncio.ensure_future(analyzer.analyze_url(url, load_previous=gate)) for _ in range(count)]
+    # Let every caller join the run before it can finish
+    for _ in range(100):
+        await asyncio.sleep(0)
+        if analyzer.get_stats()["single_flight"]["coalesced"] == count - 1:
+            return tasks
+    pytest.fail("callers did not join the shared run")
+
+async def test_concurrent_callers_share_one_fetch(analyzer, stub_server):
+    url = stub_server.add("/single-flight/shared")
+    gate = Gate()
+    requests = stub_server.requests
+
+    tasks = await start_callers(analyzer, url, gate)
+    gate.opened.set()
+    results = await asyncio.gather(*tasks)
+
+    assert stub_server.requests - requests == 1
+    assert gate.calls == 1
+    assert all(result.top_words == results[0].top_words for result in results)
+    assert results[0].top_words[0] == {"word": "python", "count": 3}
+    assert analyzer._in_flight == {}
+
+async def test_failure_reaches_every_caller(analyzer, stub_server):
+    url = stub_server.url("/single-flight/missing")
+    gate = Gate()
+    requests = stub_server.requests
+
+    tasks = await start_callers(analyzer, url, gate)
+    gate.opened.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert stub_server.requests - requests == 1
+    assert all(isinstance(result, ExternalServiceError) for result in results)
+    # A failed run is not remembered; the next call fetches again
+    assert analyzer._in_flight == {}
+    gate = Gate()
+    gate.opened.set()
+    with pytest.raises(ExternalServiceError):
+        await analyzer.analyze_url(url, load_previous=gate)
+    assert stub_server.requests - requests == 2
+
+async def test_cancelled_caller_does_not_cancel_shared_run(analyzer, stub_server):
+    url = stub_server.add("/single-flight/cancelled")
+    gate = Gate()
+    requests = stub_server.requests
+
+    first, *others = await start_callers(analyzer, url, gate, count=3)
+    # The caller that started the run goes away before it finishes
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    gate.opened.set()
+    results = await asyncio.gather(*others)
+
+    assert first.cancelled()
+    assert stub_server.requests - requests == 1
+    assert [result.top_words[0]["word"] for result in results] == ["python", "python"]
+
+async def test_different_options_are_not_shared(analyzer, stub_server):
+    url = stub_server.add("/single-flight/options")
+    requests = stub_server.requests
+
+    await asyncio.gather(
+        analyzer.analyze_url(url, AnalysisOptions(top_n=1)),
+        analyzer.analyze_url(url, AnalysisOptions(top_n=2)),
+    )
+
+    assert stub_server.requests - requests == 2
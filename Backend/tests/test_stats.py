@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.core.database import AsyncSessionLocal
+from app.models import DailyAnalysisStats, UrlAnalysis, User, UserAnalysisStats
+from app.services.analysis_store import _utc_day, record_analyses
+
+pytestmark = pytest.mark.anyio
+
+async def stored_counts():
+    """Analysis count and latest time per user, counted from url_analyses itself."""
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(User.username, func.count(UrlAnalysis.id), func.max(UrlAnalysis.analyzed_at))
+            .join(UrlAnalysis, UrlAnalysis.user_id == User.id)
+            .group_by(User.username)
+        )
+        return {username: (count, last) for username, count, last in rows}
+
+def naive(moment):
+    return datetime.fromisoformat(moment).replace(tzinfo=None) if isinstance(moment, str) else moment.replace(tzinfo=None)
+
+async def test_summary_tables_match_stored_analyses(client, login, stub_server, analyze_many):
+    alice = await login("alice")
+    bob = await login("bob")
+    # Single inserts and batches storing several analyses of one user at once
+    client.headers.update(alice)
+    await client.post("/api/v1/urls/analyze", json={"url": stub_server.add("/stats/alice/single")})
+    await analyze_many(client, 4, prefix="/stats/alice/batch")
+    client.headers.update(bob)
+    await analyze_many(client, 3, prefix="/stats/bob/batch")
+    await client.post("/api/v1/urls/analyze", json={"url": stub_server.add("/stats/bob/single")})
+
+    counts = await stored_counts()
+    assert counts["alice"][0] == 5 and counts["bob"][0] == 4
+    total = sum(count for count, _ in counts.values())
+    today = datetime.now(timezone.utc).date().isoformat()
+    for username, headers in (("alice", alice), ("bob", bob)):
+        stats = (await client.get("/api/v1/urls/stats", headers=headers)).json()
+        count, last = counts[username]
+        assert stats["user"]["analyses"] == count
+        assert naive(stats["user"]["last_analyzed_at"]) == naive(last)
+        assert stats["user"]["daily"] == [{"day": today, "count": count}]
+        assert stats["all_users"]["analyses"] == total
+        assert naive(stats["all_users"]["last_analyzed_at"]) == max(naive(last) for _, last in counts.values())
+        assert stats["all_users"]["daily"] == [{"day": today, "count": total}]
+        assert (await client.get("/api/v1/urls/history", headers=headers)).json()["total"] == count
+    assert (await client.get("/api/v1/urls/history/all")).json()["total"] == total
+
+async def test_stats_without_analyses(auth_client):
+    stats = (await auth_client.get("/api/v1/urls/stats")).json()
+    assert stats["user"] == {"analyses": 0, "last_analyzed_at": None, "daily": []}
+    assert (await auth_client.get("/api/v1/urls/history")).json()["total"] == 0
+
+def test_utc_day():
+    # Aware times are bucketed by their UTC date; SQLite's naive values already are UTC
+    assert _utc_day(datetime(2026, 1, 1, 23, 30, tzinfo=timezone(timedelta(hours=-5)))) == date(2026, 1, 2)
+    assert _utc_day(datetime(2026, 1, 2, 0, 30, tzinfo=timezone(timedelta(hours=2)))) == date(2026, 1, 1)
+    assert _utc_day(datetime(2026, 1, 1, 23, 30)) == date(2026, 1, 1)
+
+async def test_last_analyzed_at_never_moves_back(database):
+    newer = datetime(2026, 3, 2, 1, 0, tzinfo=timezone.utc)
+    older = datetime(2026, 3, 1, 22, 0, tzinfo=timezone(timedelta(hours=-4)))
+    async with AsyncSessionLocal() as db:
+        user = User(username="carol", email="carol@example.com", hashed_password="")
+        db.add(user)
+        await db.flush()
+        # Several analyses of one user in one batch, then an older one stored later
+        for batch in ([newer, newer - timedelta(hours=3)], [older]):
+            analyses = [UrlAnalysis(url="https://example.com/", top_words=[], user_id=user.id, analyzed_at=at) for at in batch]
+            db.add_all(analyses)
+            await db.flush()
+            await record_analyses(db, analyses)
+        await db.commit()
+
+        stats = await db.get(UserAnalysisStats, user.id)
+        assert stats.analysis_count == 3
+        assert naive(stats.last_analyzed_at) == naive(newer)
+        daily = (await db.execute(
+            select(DailyAnalysisStats.day, DailyAnalysisStats.analysis_count).order_by(DailyAnalysisStats.day)
+        )).all()
+        # 22:00 at UTC-4 is March 2 in UTC, 22:00 UTC on March 1 is not
+        assert daily == [(date(2026, 3, 1), 1), (date(2026, 3, 2), 2)]
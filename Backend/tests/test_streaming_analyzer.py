@@ -0,0 +1,53 @@
+from pathlib import Path
+import pytest
+from app.services.streaming_analyzer import StreamingWordCounter
+from app.services.text_extractors import HtmlParserExtractor
+from app.services.url_analyzer import UrlAnalyzerService
+from app.services.word_counter import AnalysisOptions
+
+PAGES = sorted((Path(__file__).parent / "data" / "pages").glob("*.html"))
+
+OPTIONS = AnalysisOptions(top_n=100, ngram_size=2)
+
+@pytest.fixture(scope="module")
+def analyzer():
+    # The streaming tokenizer reproduces BeautifulSoup's html.parser tree
+    return UrlAnalyzerService(execution_mode="inline", extractor=HtmlParserExtractor())
+
+def stream(analyzer: UrlAnalyzerService, html: str, chunk_size: int):
+    counter = StreamingWordCounter(analyzer.stop_words, OPTIONS.min_word_length, OPTIONS.ngram_size)
+    for start in range(0, len(html), chunk_size):
+        counter.feed(html[start:start + chunk_size])
+    counter.close()
+    return OPTIONS.summarize(counter.words)
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 1 << 20])
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_streaming_matches_buffered(analyzer, page, chunk_size):
+    html = page.read_text(encoding="utf-8")
+    assert stream(analyzer, html, chunk_size) == analyzer.analyze_content(html, OPTIONS)
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_cdata_and_character_references(analyzer, chunk_size):
+    html = "<p>caf&eacute; &#99;afe <![CDATA[cdata words]]> word&amp;split wor</p><p>ds</p>"
+    assert stream(analyzer, html, chunk_size) == analyzer.analyze_content(html, OPTIONS)
+
+def test_text_only_in_hidden_tags_is_not_text():
+    counter = StreamingWordCounter(set())
+    counter.feed("<html><head><script>words()</script></head><body><nav>menu</nav><template>x</template></body></html>")
+    counter.close()
+    assert not counter.has_text
+    assert not counter.words.has_words()
+
+@pytest.mark.anyio
+async def test_streaming_pipeline_matches_buffered_over_http(analyzer, stub_server):
+    page = PAGES[0]
+    url = stub_server.add(f"/streaming/{page.name}", page.read_bytes())
+    streaming = UrlAnalyzerService(execution_mode="inline", pipeline="streaming", extractor=HtmlParserExtractor())
+    try:
+        result = await streaming.analyze_url(url, OPTIONS)
+    finally:
+        await streaming.aclose()
+
+    expected = analyzer.analyze_content(page.read_text(encoding="utf-8"), OPTIONS)
+    assert (result.top_words, result.top_ngrams) == (expected["top_words"], expected["top_ngrams"])
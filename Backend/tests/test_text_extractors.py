@@ -0,0 +1,52 @@
+from pathlib import Path
+import pytest
+from app.services.text_extractors import EXTRACTORS, HtmlParserExtractor, create_text_extractor
+from app.services.url_analyzer import UrlAnalyzerService
+from app.services.word_counter import AnalysisOptions
+
+PAGES = sorted((Path(__file__).parent / "data" / "pages").glob("*.html"))
+
+AVAILABLE = [name for name, extractor in EXTRACTORS.items() if extractor.is_available()]
+
+def analyze(name: str, html: str):
+    analyzer = UrlAnalyzerService(execution_mode="inline", extractor=create_text_extractor(name))
+    return analyzer.analyze_content(html, AnalysisOptions(top_n=100, ngram_size=2))
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+@pytest.mark.parametrize("name", [name for name in AVAILABLE if name != HtmlParserExtractor.name])
+def test_same_words_as_html_parser(name, page):
+    html = page.read_text(encoding="utf-8")
+    assert analyze(name, html) == analyze(HtmlParserExtractor.name, html)
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_skipped_tags_are_not_text(name):
+    html = (
+        "<html><head><title>kept</title> <style>.styled{}</style><script>scripted()</script></head>\n"
+        "<body><header>header</header><nav>navigation</nav><p>body<template>templated</template></p>\n"
+        "<ruby>base<rt>annotation</rt></ruby><noscript>fallback</noscript><footer>footer</footer></body></html>"
+    )
+    assert create_text_extractor(name).extract(html).split() == ["kept", "body", "base"]
+
+# CDATA sections are where the backends knowingly differ. In HTML content the
+# HTML parsers treat them as comments while html.parser keeps their text; in
+# SVG and MathML, lexbor follows HTML5 and keeps the text but libxml2 drops it.
+CDATA_PAGE = (
+    "<html><body><p>before <![CDATA[html cdata]]> after</p>\n"
+    "<svg><text><![CDATA[svg cdata]]></text></svg></body></html>"
+)
+CDATA_TEXT = {
+    "html.parser": "before html cdata after svg cdata",
+    "lxml": "before after",
+    "selectolax": "before after svg cdata",
+}
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_cdata_sections(name):
+    text = create_text_extractor(name).extract(CDATA_PAGE)
+    assert " ".join(text.split()) == CDATA_TEXT[name]
+
+def test_auto_picks_fastest_available_backend():
+    assert create_text_extractor("auto").name == AVAILABLE[0]
+
+def test_unknown_backend_falls_back_to_html_parser():
+    assert isinstance(create_text_extractor("no-such-parser"), HtmlParserExtractor)
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import select, update
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisWord, UrlAnalysis, User
+from app.services.url_analyzer import AnalysisResult
+from app.services.word_counter import AnalysisOptions
+from import_corpus import DocumentResult, Importer
+
+pytestmark = pytest.mark.anyio
+
+def page(text: str) -> bytes:
+    return f"<html><body><p>{text}</p></body></html>".encode()
+
+async def stored_words():
+    """``top_words`` of every stored analysis next to its ``analysis_words`` rows."""
+    async with AsyncSessionLocal() as db:
+        analyses = (await db.scalars(select(UrlAnalysis).order_by(UrlAnalysis.id))).all()
+        rows = (await db.execute(select(AnalysisWord.analysis_id, AnalysisWord.word, AnalysisWord.count))).all()
+    expected = {(analysis.id, item["word"], item["count"]) for analysis in analyses for item in analysis.top_words}
+    return expected, set(rows)
+
+@pytest.fixture
+async def seeded(client, login, stub_server):
+    """Three analyses of two users; alice's first one is dated 2026-01-01."""
+    alice = await login("alice")
+    bob = await login("bob")
+    pages = [
+        (alice, "/words/alice/1", "alpha alpha alpha beta beta gamma"),
+        (alice, "/words/alice/2", "alpha beta beta"),
+        (bob, "/words/bob/1", "gamma gamma delta"),
+    ]
+    ids = []
+    for headers, path, text in pages:
+        url = stub_server.add(path, page(text))
+        ids.append((await client.post("/api/v1/urls/analyze", json={"url": url}, headers=headers)).json()["id"])
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(UrlAnalysis).where(UrlAnalysis.id == ids[0]).values(analyzed_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        )
+        await db.commit()
+    client.headers.update(alice)
+    return client
+
+def words(response):
+    assert response.status_code == 200, response.text
+    return [(item["word"], item["count"], item["analyses"]) for item in response.json()["items"]]
+
+async def test_top_words_of_user(seeded):
+    assert words(await seeded.get("/api/v1/urls/words/top")) == [("alpha", 4, 2), ("beta", 4, 2), ("gamma", 1, 1)]
+    assert words(await seeded.get("/api/v1/urls/words/top", params={"limit": 1})) == [("alpha", 4, 2)]
+
+async def test_top_words_of_all_users(seeded):
+    assert words(await seeded.get("/api/v1/urls/words/top/all")) == [
+        ("alpha", 4, 2), ("beta", 4, 2), ("gamma", 3, 2), ("delta", 1, 1)
+    ]
+
+@pytest.mark.parametrize("path", ["/api/v1/urls/words/top", "/api/v1/urls/words/top/all"])
+async def test_top_words_time_range(seeded, path):
+    cutoff = "2026-06-01T00:00:00Z"
+    before = words(await seeded.get(path, params={"until": cutoff}))
+    assert before == [("alpha", 3, 1), ("beta", 2, 1), ("gamma", 1, 1)]
+    after = words(await seeded.get(path, params={"since": cutoff}))
+    if path.endswith("/all"):
+        assert after == [("beta", 2, 1), ("gamma", 2, 1), ("alpha", 1, 1), ("delta", 1, 1)]
+    else:
+        assert after == [("beta", 2, 1), ("alpha", 1, 1)]
+    assert words(await seeded.get(path, params={"since": cutoff, "until": cutoff})) == []
+
+async def test_every_insert_path_writes_word_rows(auth_client, stub_server, analyze_many):
+    # Single analysis, then a batch
+    await auth_client.post("/api/v1/urls/analyze", json={"url": stub_server.add("/words/single")})
+    await analyze_many(auth_client, 3, prefix="/words/batch")
+    # Offline import
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id).where(User.username == "alice"))
+    importer = Importer(user_id, AnalysisOptions(), batch_size=2)
+    for i in range(3):
+        result = AnalysisResult([{"word": "imported", "count": 2 + i}, {"word": f"page{'x' * i}", "count": 1}])
+        await importer.add(DocumentResult(f"https://example.com/imported/{i}", "analyzed", result=result))
+    await importer.flush()
+
+    expected, rows = await stored_words()
+    assert len({analysis_id for analysis_id, _, _ in expected}) == 7
+    assert rows == expected
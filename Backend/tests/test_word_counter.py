@@ -0,0 +1,43 @@
+from app.services.word_counter import AnalysisOptions, WordCounter, iter_text_chunks
+
+STOP_WORDS = {"the", "and", "are"}
+
+def test_stop_words_are_never_counted():
+    counter = WordCounter(STOP_WORDS)
+    counter.update("The cats and the dogs are friends; the cats are loud")
+
+    assert "the" not in counter.counts and "are" not in counter.counts
+    assert counter.tokens == 11
+    assert counter.most_common(2) == [("cats", 2), ("dogs", 1)]
+
+def test_only_stop_words_means_no_words():
+    counter = WordCounter(STOP_WORDS)
+    counter.update("the and are THE")
+    assert not counter.has_words()
+
+def test_short_and_non_ascii_words_are_skipped():
+    counter = WordCounter(set(), min_word_length=4)
+    counter.update("tiny cat café naïve words")
+    assert dict(counter.counts) == {"tiny": 1, "words": 1}
+
+def test_ties_keep_first_seen_order():
+    counter = WordCounter(set())
+    counter.update("zeta alpha zeta alpha beta")
+    assert counter.top_words(3) == [
+        {"word": "zeta", "count": 2}, {"word": "alpha", "count": 2}, {"word": "beta", "count": 1}
+    ]
+
+def test_ngrams_skip_stop_words_and_span_updates():
+    counter = AnalysisOptions(ngram_size=2).create_counter(STOP_WORDS)
+    counter.update("fast parsers are fast")
+    counter.update(" parsers win")
+
+    assert counter.top_ngrams(5) == [
+        {"word": "fast parsers", "count": 2}, {"word": "parsers win", "count": 1}
+    ]
+
+def test_text_chunks_split_only_at_whitespace():
+    text = "alpha beta gamma delta " * 10
+    chunks = list(iter_text_chunks(text, size=7))
+    assert "".join(chunks) == text
+    assert all(chunk[:1].isspace() or chunk is chunks[0] for chunk in chunks)
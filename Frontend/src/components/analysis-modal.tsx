@@ -4,23 +4,106 @@ import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { ChartContainer, ChartTooltip, ChartTooltipContent } from "@/components/ui/chart"
 import { BarChart, Bar, XAxis, YAxis, ResponsiveContainer } from "recharts"
-import { ExternalLink, Download } from "lucide-react"
-import { AnalyzeResponse } from "@/interfaces/api.interface"
+import { ExternalLink, Download, Loader2 } from "lucide-react"
+import { AnalyzeResponse, AnalysisProgress } from "@/interfaces/api.interface"
 
 interface AnalysisModalProps {
   isOpen: boolean
   onClose: () => void
   data: AnalyzeResponse | null
+  progress?: AnalysisProgress | null
 }
 
-export function AnalysisModal({ isOpen, onClose, data }: AnalysisModalProps) {
-  if (!data) return null
+const chartConfig = {
+  count: {
+    label: "Word Count",
+    color: "hsl(var(--chart-1))",
+  },
+}
+
+const STAGE_LABELS: Record<AnalysisProgress["stage"], string> = {
+  downloading: "Downloading page",
+  parsing: "Extracting text",
+  counting: "Counting words",
+  done: "Saving results",
+}
+
+function formatBytes(bytes: number): string {
+  if (bytes < 1024) return `${bytes} B`
+  if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`
+  return `${(bytes / (1024 * 1024)).toFixed(1)} MB`
+}
+
+function AnalysisProgressView({ progress }: { progress: AnalysisProgress }) {
+  const percent = progress.total_bytes
+    ? Math.min(100, Math.round((progress.bytes / progress.total_bytes) * 100))
+    : null
+
+  return (
+    <div className="space-y-6">
+      <div className="space-y-2">
+        <div className="flex items-center justify-between text-sm">
+          <span className="flex items-center gap-2 font-medium">
+            <Loader2 className="w-4 h-4 animate-spin" />
+            {STAGE_LABELS[progress.stage]}
+          </span>
+          <span className="text-gray-500">
+            {formatBytes(progress.bytes)}
+            {progress.total_bytes ? ` of ${formatBytes(progress.total_bytes)}` : ""}
+          </span>
+        </div>
+        <div className="h-2 w-full bg-gray-100 rounded-full overflow-hidden">
+          <div
+            className={`h-full bg-blue-600 transition-all ${percent === null ? "animate-pulse" : ""}`}
+            style={{ width: `${progress.stage === "downloading" ? percent ?? 100 : 100}%` }}
+          />
+        </div>
+        {progress.tokens > 0 && (
+          <p className="text-sm text-gray-500">{progress.tokens.toLocaleString()} words counted so far</p>
+        )}
+      </div>
+
+      {progress.top_words.length > 0 && (
+        <Card>
+          <CardHeader>
+            <CardTitle>Top Words So Far</CardTitle>
+            <CardDescription>Interim counts, updated while the page is analyzed</CardDescription>
+          </CardHeader>
+          <CardContent>
+            <ChartContainer config={chartConfig} className="h-[300px]">
+              <ResponsiveContainer width="100%" height="100%">
+                <BarChart data={progress.top_words} margin={{ top: 20, right: 30, left: 20, bottom: 5 }}>
+                  <XAxis dataKey="word" angle={-45} textAnchor="end" height={80} fontSize={12} />
+                  <YAxis />
+                  <Bar dataKey="count" fill="var(--color-count)" radius={[4, 4, 0, 0]} isAnimationActive={false} />
+                </BarChart>
+              </ResponsiveContainer>
+            </ChartContainer>
+          </CardContent>
+        </Card>
+      )}
+    </div>
+  )
+}
+
+export function AnalysisModal({ isOpen, onClose, data, progress }: AnalysisModalProps) {
+  if (!data) {
+    if (!progress) return null
 
-  const chartConfig = {
-    count: {
-      label: "Word Count",
-      color: "hsl(var(--chart-1))",
-    },
+    return (
+      <Dialog open={isOpen} onOpenChange={onClose}>
+        <DialogContent className="max-w-4xl max-h-[90vh] overflow-y-auto">
+          <DialogHeader>
+            <DialogTitle className="flex items-center gap-2">
+              <ExternalLink className="w-5 h-5" />
+              Analyzing
+            </DialogTitle>
+            <DialogDescription>Results will appear here as soon as the analysis is done</DialogDescription>
+          </DialogHeader>
+          <AnalysisProgressView progress={progress} />
+        </DialogContent>
+      </Dialog>
+    )
   }
 
   const handleExport = () => {
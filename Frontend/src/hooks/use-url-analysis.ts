@@ -1,5 +1,5 @@
 import { useState, useCallback } from 'react'
-import { AnalyzeResponse, HistoryResponse, AnalyzeRequest, ApiError } from '@/interfaces/api.interface'
+import { AnalyzeResponse, HistoryResponse, AnalyzeRequest, AnalysisProgress, ApiError } from '@/interfaces/api.interface'
 import { urlService } from '@/services'
 
 
@@ -7,6 +7,7 @@ interface UseUrlAnalysisReturn {
   analyzeUrl: (url: string) => Promise<AnalyzeResponse>
   getHistory: (page?: number, size?: number) => Promise<HistoryResponse>
   isAnalyzing: boolean
+  progress: AnalysisProgress | null
   isLoadingHistory: boolean
   error: string | null
   clearError: () => void
@@ -14,6 +15,7 @@ interface UseUrlAnalysisReturn {
 
 export function useUrlAnalysis(): UseUrlAnalysisReturn {
   const [isAnalyzing, setIsAnalyzing] = useState(false)
+  const [progress, setProgress] = useState<AnalysisProgress | null>(null)
   const [isLoadingHistory, setIsLoadingHistory] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
@@ -24,7 +26,8 @@ export function useUrlAnalysis(): UseUrlAnalysisReturn {
       setIsAnalyzing(true)
       setError(null)
       const data: AnalyzeRequest = { url }
-      const result = await urlService.analyze(data)
+      // Streamed so progress can be shown while large pages are processed
+      const result = await urlService.analyzeWithProgress(data, setProgress)
       return result
     } catch (error) {
       const errorMessage = error instanceof ApiError 
@@ -34,6 +37,7 @@ export function useUrlAnalysis(): UseUrlAnalysisReturn {
       throw error
     } finally {
       setIsAnalyzing(false)
+      setProgress(null)
     }
   }, [])
 
@@ -58,6 +62,7 @@ export function useUrlAnalysis(): UseUrlAnalysisReturn {
     analyzeUrl,
     getHistory,
     isAnalyzing,
+    progress,
     isLoadingHistory,
     error,
     clearError,
@@ -28,6 +28,9 @@ interface LoginRequest {
 
 interface AnalyzeRequest {
     url: string
+    top_n?: number
+    ngram_size?: number
+    min_word_length?: number
 }
 
 interface AnalyzeResponse {
@@ -37,15 +40,38 @@ interface AnalyzeResponse {
         word: string
         count: number
     }>
+    top_ngrams?: Array<{
+        word: string
+        count: number
+    }> | null
     analyzed_at: string
 }
 
+interface WordCount {
+    word: string
+    count: number
+}
+
+/**
+ * Progress of a streamed analysis, built from the server-sent events
+ * of POST /urls/analyze/stream
+ */
+interface AnalysisProgress {
+    stage: 'downloading' | 'parsing' | 'counting' | 'done'
+    bytes: number
+    total_bytes: number | null
+    characters: number | null
+    tokens: number
+    top_words: WordCount[]
+}
+
 interface HistoryResponse {
     items: AnalyzeResponse[]
     total: number
     page: number
     size: number
     pages: number
+    next_cursor?: string | null
 }
 
 class ApiError extends Error {
@@ -67,5 +93,7 @@ export type {
     LoginRequest,
     AnalyzeRequest,
     AnalyzeResponse,
+    WordCount,
+    AnalysisProgress,
     HistoryResponse
 }
@@ -18,7 +18,7 @@ interface HistoryItem extends AnalyzeResponse {
 
 export default function Dashboard() {
   const { user, logout } = useAuth()
-  const { analyzeUrl, getHistory, isAnalyzing, isLoadingHistory, error, clearError } = useUrlAnalysis()
+  const { analyzeUrl, getHistory, isAnalyzing, progress, isLoadingHistory, error, clearError } = useUrlAnalysis()
   const { showError, showSuccess } = useToast()
   const [url, setUrl] = useState("")
   const [showResults, setShowResults] = useState(false)
@@ -54,6 +54,9 @@ export default function Dashboard() {
     if (!url) return
 
     clearError()
+    // Open the modal right away so it can show progress
+    setCurrentResults(null)
+    setShowResults(true)
     try {
       const result = await analyzeUrl(url)
       setCurrentResults(result)
@@ -63,6 +66,7 @@ export default function Dashboard() {
       // Reload history to show the new analysis
       loadHistory()
     } catch (error) {
+      setShowResults(false)
       console.error("Analysis failed:", error)
       showError("Failed to analyze the web page. Please check the URL and try again.")
     }
@@ -214,11 +218,12 @@ export default function Dashboard() {
       </main>
 
       {/* Results Modal */}
-      {showResults && currentResults && (
+      {showResults && (currentResults || progress) && (
         <AnalysisModal
           isOpen={showResults}
           onClose={() => setShowResults(false)}
           data={currentResults}
+          progress={progress}
         />
       )}
     </div>
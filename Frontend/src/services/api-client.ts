@@ -115,6 +115,69 @@ class ApiClient {
     }
   }
 
+  /**
+   * POST a JSON payload and read the response as a server-sent event stream,
+   * calling onEvent for every event as it arrives.
+   */
+  private async streamEvents(
+    endpoint: string,
+    payload: any,
+    onEvent: (event: string, data: any) => void,
+    config?: RequestConfig
+  ): Promise<void> {
+    const url = this.buildUrl(endpoint, config?.params)
+    const headers = {
+      ...this.buildHeaders(config),
+      'Accept': 'text/event-stream'
+    }
+
+    let response: Response
+    try {
+      response = await fetch(url, { method: 'POST', headers, body: JSON.stringify(payload) })
+    } catch (error) {
+      throw new ApiError('Network error occurred', 0, error)
+    }
+
+    if (!response.ok || !response.body) {
+      const errorData = await response.json().catch(() => ({}))
+      throw new ApiError(
+        errorData.message || `HTTP ${response.status}`,
+        response.status,
+        errorData
+      )
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+
+      // Events are separated by a blank line
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        let event = 'message'
+        const data: string[] = []
+        block.split('\n').forEach((line) => {
+          if (line.startsWith('event:')) {
+            event = line.slice(6).trim()
+          } else if (line.startsWith('data:')) {
+            data.push(line.slice(5).trim())
+          }
+        })
+        if (data.length) {
+          onEvent(event, JSON.parse(data.join('\n')))
+        }
+        boundary = buffer.indexOf('\n\n')
+      }
+    }
+  }
+
   private createFormData(payload: Record<string, any>): FormData {
     const formData = new FormData()
     Object.entries(payload).forEach(([key, value]) => {
@@ -157,6 +220,15 @@ class ApiClient {
   async delete<TResponse>(endpoint: string, config?: RequestConfig): Promise<TResponse> {
     return this.makeRequest<TResponse>('DELETE', endpoint, undefined, config)
   }
+
+  async postStream<TPayload>(
+    endpoint: string,
+    payload: TPayload,
+    onEvent: (event: string, data: any) => void,
+    config?: RequestConfig
+  ): Promise<void> {
+    return this.streamEvents(endpoint, payload, onEvent, config)
+  }
 }
 
 // Create and export a singleton instance
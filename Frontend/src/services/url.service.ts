@@ -1,13 +1,16 @@
 import { 
   AnalyzeRequest, 
   AnalyzeResponse, 
-  HistoryResponse 
+  AnalysisProgress,
+  HistoryResponse,
+  ApiError
 } from "@/interfaces/api.interface"
 import { apiClient } from "./api-client"
 
 class UrlService {
   private readonly URL_ENDPOINTS = {
     ANALYZE: '/urls/analyze',
+    ANALYZE_STREAM: '/urls/analyze/stream',
     HISTORY: '/urls/history',
   } as const
 
@@ -24,6 +27,61 @@ class UrlService {
     )
   }
 
+  /**
+   * Analyze a URL, reporting progress while the page is downloaded and counted
+   */
+  async analyzeWithProgress(
+    data: AnalyzeRequest,
+    onProgress: (progress: AnalysisProgress) => void
+  ): Promise<AnalyzeResponse> {
+    let progress: AnalysisProgress = {
+      stage: 'downloading',
+      bytes: 0,
+      total_bytes: null,
+      characters: null,
+      tokens: 0,
+      top_words: []
+    }
+    // Assigned from the event callback, so keep TypeScript from narrowing them to null
+    let result = null as AnalyzeResponse | null
+    let failure = null as string | null
+
+    onProgress(progress)
+    await apiClient.postStream<AnalyzeRequest>(this.URL_ENDPOINTS.ANALYZE_STREAM, data, (event, payload) => {
+      switch (event) {
+        case 'download':
+          progress = {
+            ...progress,
+            stage: payload.complete ? 'parsing' : 'downloading',
+            bytes: payload.bytes,
+            total_bytes: payload.total
+          }
+          break
+        case 'parsed':
+          progress = { ...progress, stage: 'counting', characters: payload.characters }
+          break
+        case 'snapshot':
+          progress = { ...progress, stage: 'counting', tokens: payload.tokens, top_words: payload.top_words }
+          break
+        case 'result':
+          result = payload
+          progress = { ...progress, stage: 'done', top_words: payload.top_words }
+          break
+        case 'error':
+          failure = payload.detail
+          return
+        default:
+          return
+      }
+      onProgress(progress)
+    })
+
+    if (failure || !result) {
+      throw new ApiError(failure || 'Analysis stream ended without a result', 400)
+    }
+    return result
+  }
+
   /**
    * Get analysis history with pagination
    */